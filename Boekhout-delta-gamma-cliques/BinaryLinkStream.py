@@ -0,0 +1,95 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+import json
+import os
+import struct
+
+
+# Columnar binary file format for link streams, which is memory mapped when read such that multiple processes on
+# one machine share the same page-cache pages. All numbers are little-endian. The file consists of:
+#   header:   magic, version, flags (bit 0: weighted), #nodes, #links, #instances, metadata offset and length
+#   offsets:  int64[#links + 1], the instances of link l are found at positions offsets[l] up to offsets[l+1]
+#   links:    int64[#links] u followed by int64[#links] v, the dense node ids of each link (u < v)
+#   columns:  int64[#instances] time, int64[#instances] u, int64[#instances] v, float64[#instances] weight,
+#             sorted by link and then time
+#   metadata: utf-8 encoded JSON object holding the original node identifiers and any additional metadata
+class BinaryLinkStream:
+
+  MAGIC = b"DGLINKS\x00"
+  VERSION = 1
+  HEADER = struct.Struct("<8sIIqqqqq")
+
+  def isBinaryLinkStream(self, infile):
+    with open(infile, 'rb') as inf:
+      return inf.read(len(self.MAGIC)) == self.MAGIC
+
+  def write(self, outfile, links, weighted=True, metadata=None):
+    num_nodes = links.numNodes()
+    num_links = links.numLinks()
+    num_instances = links.numInstances()
+    offsets = np.asarray(links._offsets, dtype=np.int64)
+    link_u = np.asarray(links._link_u, dtype=np.int64)
+    link_v = np.asarray(links._link_v, dtype=np.int64)
+    instance_links = np.repeat(np.arange(num_links, dtype=np.int64), np.diff(offsets))
+
+    meta = dict(metadata) if metadata else dict()
+    meta["node_names"] = links._node_names
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    meta_offset = self.HEADER.size + 8 * ((num_links + 1) + 2 * num_links + 4 * num_instances)
+
+    # Write to a temporary file first, such that an interrupted write never leaves a valid looking file
+    tempfile = outfile + ".tmp"
+    with open(tempfile, 'wb') as out:
+      out.write(self.HEADER.pack(self.MAGIC, self.VERSION, 1 if weighted else 0, num_nodes, num_links, num_instances,
+                                 meta_offset, len(meta_bytes)))
+      for values in [offsets, link_u, link_v, np.asarray(links._times, dtype=np.int64),
+                     link_u[instance_links], link_v[instance_links]]:
+        out.write(values.astype("<i8", copy=False).tobytes())
+      out.write(np.asarray(links._weights, dtype=np.float64).astype("<f8", copy=False).tobytes())
+      out.write(meta_bytes)
+    os.replace(tempfile, outfile)
+
+  def readHeader(self, infile):
+    with open(infile, 'rb') as inf:
+      header = self.HEADER.unpack(inf.read(self.HEADER.size))
+    (magic, version, flags, num_nodes, num_links, num_instances, meta_offset, meta_length) = header
+    assert magic == self.MAGIC, "Error (5): '{}' is not a binary link stream file".format(infile)
+    assert version == self.VERSION, "Error (6): Unsupported binary link stream version {}".format(version)
+    return {"weighted": bool(flags & 1), "nodes": num_nodes, "links": num_links, "instances": num_instances,
+            "meta_offset": meta_offset, "meta_length": meta_length}
+
+  def readMetadata(self, infile):
+    header = self.readHeader(infile)
+    with open(infile, 'rb') as inf:
+      inf.seek(header["meta_offset"])
+      return json.loads(inf.read(header["meta_length"]).decode("utf-8"))
+
+  def read(self, infile, links):
+    header = self.readHeader(infile)
+    meta = self.readMetadata(infile)
+    num_links = header["links"]
+    num_instances = header["instances"]
+
+    data = np.memmap(infile, dtype=np.uint8, mode='r')
+    position = self.HEADER.size
+    sections = []
+    # Native views are used (assuming a little-endian machine) as memoryviews only support native formats
+    for (length, dtype) in [(num_links + 1, np.int64), (num_links, np.int64), (num_links, np.int64), (num_instances, np.int64),
+                            (num_instances, np.int64), (num_instances, np.int64), (num_instances, np.float64)]:
+      sections.append(data[position:position + 8 * length].view(dtype))
+      position += 8 * length
+    (offsets, link_u, link_v, times, _, _, weights) = sections
+    links.setArrays(meta["node_names"], link_u, link_v, offsets, times, weights)
+    return header, meta
@@ -0,0 +1,72 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+import json
+import os
+
+
+# Checkpoint files of the bulk phase. The stretch phase results are written once (to checkpointfile.npz), after which
+# every checkpoint appends a single JSON line to checkpointfile holding only what changed since the previous one (the
+# roots processed, the roots pruned and the cliques found), such that each checkpoint remains cheap to write. The
+# first line holds the run parameters. A partially written last line (e.g., due to a reboot) is ignored when read.
+class BulkCheckpoint:
+
+  def __init__(self, checkpointfile, interval=300):
+    self._checkpointfile = checkpointfile
+    self._stretchedfile = checkpointfile + ".npz"
+    self._interval = interval # Minimum number of seconds between checkpoints
+
+  def exists(self):
+    return os.path.isfile(self._checkpointfile) and os.path.isfile(self._stretchedfile)
+
+  def getInterval(self):
+    return self._interval
+
+  #############################################################################################
+  # Writing functions
+  #############################################################################################
+
+  def create(self, parameters, counts, borders):
+    tempfile = self._stretchedfile + ".tmp.npz"
+    np.savez(tempfile, counts=counts, borders=borders)
+    os.replace(tempfile, self._stretchedfile)
+    with open(self._checkpointfile, 'w') as out:
+      out.write(json.dumps(parameters) + "\n")
+
+  def append(self, record):
+    with open(self._checkpointfile, 'a') as out:
+      out.write(json.dumps(record) + "\n")
+      out.flush()
+      os.fsync(out.fileno())
+
+  #############################################################################################
+  # Reading functions
+  #############################################################################################
+
+  def readStretched(self):
+    stored = np.load(self._stretchedfile)
+    return stored["counts"], stored["borders"]
+
+  def readRecords(self):
+    # Returns the run parameters and the list of complete checkpoint records
+    with open(self._checkpointfile) as inf:
+      lines = inf.read().split("\n")
+    parameters = json.loads(lines[0])
+    records = []
+    for line in lines[1:]:
+      try:
+        records.append(json.loads(line))
+      except ValueError:
+        break
+    return parameters, records
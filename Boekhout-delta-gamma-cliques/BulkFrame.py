@@ -0,0 +1,67 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+from collections import defaultdict
+
+
+# Frame of the explicit stack of the bulk phase search (see CliqueMaster.bulkSearch), holding the state of one clique
+# whose expansions are being processed. Frames are kept per depth and reused for every clique at that depth, such
+# that no containers are allocated per search step: the expansions of a clique, and the scratch used to determine
+# which expansions of its parent these dominate, are determined into the containers of its frame (see clear).
+class BulkFrame:
+
+  __slots__ = ("_c", "_label", "_candidates", "_index", "_expansions", "_pruning_set", "_done_expansions", "_is_max",
+               "_extended_borders", "_extended_neighbors", "_extended_bits", "_extended_neighbor_indices",
+               "_extended_node_expansions")
+
+  def __init__(self):
+    self._candidates = []
+    self._done_expansions = set()
+    self._expansions = defaultdict(list) # Node expansions of c per added node, passed on to the frames of these expansions
+    self._pruning_set = set() # Expansions of the parent frame that are dominated by those of c
+    # Expansions of c with a larger label than the latest node of c, and their borders (see findCliqueExpansions)
+    self._extended_borders = {"tbMin": [], "teMax": [], "tbMax": [], "teMin": [], "cov_tb": [], "cov_te": []}
+    self._extended_neighbors = []
+    self._extended_bits = 0 # Bitset of the extended neighbors
+    self._extended_neighbor_indices = []
+    self._extended_node_expansions = defaultdict(list)
+
+  def clear(self):
+    # Empties the containers of the frame before the expansions of its next clique are determined
+    self._expansions.clear()
+    self._pruning_set.clear()
+    self._extended_bits = 0
+    if self._extended_neighbors: # Otherwise, none of the extended containers were filled
+      for borders in self._extended_borders.values():
+        borders.clear()
+      self._extended_neighbors.clear()
+      self._extended_neighbor_indices.clear()
+      self._extended_node_expansions.clear()
+
+  def reset(self, c, label, nodeLabelling):
+    # Starts processing the expansions of c, which are already determined into this frame
+    self._c = c
+    self._label = label # Label of the latest node of c
+    # Expansions are processed in order of the label of the added node and, for each node, from last to first found
+    self._candidates.clear()
+    for maxX in nodeLabelling.getSortedNodesByLabel(self._expansions.keys()):
+      self._candidates.extend(reversed(self._expansions[maxX]))
+    self._index = 0
+    self._done_expansions.clear() # Expansions which are dominated by already processed expansions
+    self._is_max = True
+
+  def nextCandidate(self):
+    # Returns the next expansion to process, or None once all are processed
+    if self._index == len(self._candidates):
+      return None
+    self._index += 1
+    return self._candidates[self._index - 1]
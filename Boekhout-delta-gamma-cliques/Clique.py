@@ -10,16 +10,20 @@ The above copyright notice and this permission notice shall be included in all c
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
 """
 
-import bisect
 import itertools as it
 
+# Cliques are created in large numbers during the bulk phase, hence slots are used (rather than a per-instance dict)
+# and the hash is computed once. Cliques should not be modified after creation, other than their shared neighbors.
 class Clique:
 
+  __slots__ = ("_X", "_tb", "_te", "_latestX", "_tbMin", "_tbMax", "_teMin", "_teMax", "_shared_neighbors", "_hash")
+
   def __init__(self, c, borders=None, shared_neighbors=None, latest=None):
     (X, (tb, te)) = c
     self._X = X
     self._tb = tb
     self._te = te
+    self._hash = hash((X, tb, te))
 
     if latest is None:
       self._latestX = max(self._X)
@@ -37,7 +41,7 @@ class Clique:
     if shared_neighbors:
       self._shared_neighbors = shared_neighbors
     else:
-      self._shared_neighbors = set()
+      self._shared_neighbors = 0
 
 
   def __eq__(self, other):
@@ -47,26 +51,32 @@ class Clique:
       return False
 
   def __hash__(self):
-    return hash((self._X, self._tb, self._te))
+    return self._hash
 
   def __str__(self):
     return ','.join(map(str, list(self._X))) + " " + \
       str(self._tb) + "," + str(self._te)  + " | "  +str(self._tbMin)+","+str(self._tbMax)+","+str(self._teMin)+","+ str(self._teMax)
 
 
-  def setSharedNeighbors(self, nodes):
-    members = list(self._X)
-    self._shared_neighbors = nodes[members[0]]
-    for member in members[1:]:
-      self._shared_neighbors = self._shared_neighbors.intersection(nodes[member])
-
   def isTemporallyDominated(self, tb, te):
     if tb <= self._tb and te >= self._te:
       return True
     return False
 
-  def isSpatialGrowthDominated(self, covered_list, nodeLabelling):
-    if len([x for x in (self._shared_neighbors - set(covered_list)) if nodeLabelling.get(x) > nodeLabelling.get(self._latestX)]) == 0:
+  def isSpatialGrowthDominated(self, covered_bits, nodeLabelling):
+    # Whether all shared neighbors with a label larger than that of the latest node are covered (both as bitsets
+    # relative to the shared neighbors of the root, see CustomNodeLabelling)
+    if self._shared_neighbors & ~covered_bits & nodeLabelling.getHigherLabelMask(self._latestX) == 0:
+      return True
+    return False
+
+  def isLinkSpatialGrowthDominated(self, covered_bits, neighbor, num_higher_shared, nodeLabelling):
+    # As isSpatialGrowthDominated, for a 2-node clique of a node of the root and a shared neighbor of the root, whose
+    # shared neighbors are not stored. As the covered nodes are neighbors of both nodes of the root, the covered shared
+    # neighbors of this clique are those which are neighbors of neighbor, which must then be all num_higher_shared of
+    # its shared neighbors labelled above both its nodes.
+    covered_bits &= nodeLabelling.getNeighborBitset(neighbor) & nodeLabelling.getHigherLabelMask(self._latestX)
+    if covered_bits.bit_count() == num_higher_shared:
       return True
     return False
 
@@ -76,75 +86,39 @@ class Clique:
     return False
 
 
-  def getMinimumTbFromBorderFull(self, times, left_border, right_border):
+  def getMinimumTbFromBorderFull(self, links, left_border, right_border):
     if left_border == right_border:
       return left_border
-    link_tbs = [right_border]
-    node_combs = [frozenset([u, v]) for (u,v) in it.combinations(self._X, 2)]
-    for link in node_combs:
-      link_tb = times[link][bisect.bisect_left(times[link], left_border):][0]
-      if link_tb == left_border:
-        return link_tb
-      link_tbs.append(link_tb)
-    return min(link_tbs)
-
-  def getMaximumTeToBorderFull(self, times, left_border, right_border):
+    node_combs = [links.linkId(u, v) for (u,v) in it.combinations(self._X, 2)]
+    return links.minNextAtOrAfter(node_combs, left_border, right_border)
+
+  def getMaximumTeToBorderFull(self, links, left_border, right_border):
     if left_border == right_border:
       return left_border
-    link_tes = [left_border]
-    node_combs = [frozenset([u, v]) for (u,v) in it.combinations(self._X, 2)]
-    for link in node_combs:
-      link_te = times[link][:bisect.bisect_right(times[link], right_border)][-1]
-      if link_te == right_border:
-        return link_te
-      link_tes.append(link_te)
-    return max(link_tes)
-
-  def getMinimumTbFromBorderPart(self, times, left_border, right_border):
+    node_combs = [links.linkId(u, v) for (u,v) in it.combinations(self._X, 2)]
+    return links.maxPrevAtOrBefore(node_combs, right_border, left_border)
+
+  def getMinimumTbFromBorderPart(self, links, left_border, right_border):
     if left_border == right_border:
       return left_border
-    link_tbs = [right_border]
-    node_combs = [frozenset([u, self._latestX]) for u in list(self._X - {self._latestX})]
-    for link in node_combs:
-      link_tb = times[link][bisect.bisect_left(times[link], left_border):][0]
-      if link_tb == left_border:
-        return link_tb
-      link_tbs.append(link_tb)
-    return min(link_tbs)
-
-  def getMaximumTeToBorderPart(self, times, left_border, right_border):
+    node_combs = [links.linkId(u, self._latestX) for u in list(self._X - {self._latestX})]
+    return links.minNextAtOrAfter(node_combs, left_border, right_border)
+
+  def getMaximumTeToBorderPart(self, links, left_border, right_border):
     if left_border == right_border:
       return left_border
-    link_tes = [left_border]
-    node_combs = [frozenset([u, self._latestX]) for u in list(self._X - {self._latestX})]
-    for link in node_combs:
-      link_te = times[link][:bisect.bisect_right(times[link], right_border)][-1]
-      if link_te == right_border:
-        return link_te
-      link_tes.append(link_te)
-    return max(link_tes)
+    node_combs = [links.linkId(u, self._latestX) for u in list(self._X - {self._latestX})]
+    return links.maxPrevAtOrBefore(node_combs, right_border, left_border)
 
 
-  def getMinimumTbFromBorderComb(self, times, left_border, right_border, other):
+  def getMinimumTbFromBorderComb(self, links, left_border, right_border, other):
     if left_border == right_border:
       return left_border
-    link_tbs = [right_border]
-    node_combs = [frozenset([u, v]) for (u,v) in it.combinations(self._X, 2)] + [frozenset([u, other._latestX]) for u in list(self._X - {self._latestX})]
-    for link in node_combs:
-      link_tb = times[link][bisect.bisect_left(times[link], left_border):][0]
-      if link_tb == left_border:
-        return link_tb
-      link_tbs.append(link_tb)
-    return min(link_tbs)
-
-  def getMaximumTeToBorderComb(self, times, left_border, right_border, other):
+    node_combs = [links.linkId(u, v) for (u,v) in it.combinations(self._X, 2)] + [links.linkId(u, other._latestX) for u in list(self._X - {self._latestX})]
+    return links.minNextAtOrAfter(node_combs, left_border, right_border)
+
+  def getMaximumTeToBorderComb(self, links, left_border, right_border, other):
     if left_border == right_border:
       return left_border
-    link_tes = [left_border]
-    node_combs = [frozenset([u, v]) for (u,v) in it.combinations(self._X, 2)] + [frozenset([u, other._latestX]) for u in list(self._X - {self._latestX})]
-    for link in node_combs:
-      link_te = times[link][:bisect.bisect_right(times[link], right_border)][-1]
-      if link_te == right_border:
-        return link_te
-      link_tes.append(link_te)
-    return max(link_tes)
\ No newline at end of file
+    node_combs = [links.linkId(u, v) for (u,v) in it.combinations(self._X, 2)] + [links.linkId(u, other._latestX) for u in list(self._X - {self._latestX})]
+    return links.maxPrevAtOrBefore(node_combs, right_border, left_border)
\ No newline at end of file
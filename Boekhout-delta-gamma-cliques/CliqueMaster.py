@@ -12,48 +12,113 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 
 from Clique import Clique
 from CustomNodeLabelling import CustomNodeLabelling
+from LinkStore import LinkStore
+from LinkStreamReader import LinkStreamReader
+from BinaryLinkStream import BinaryLinkStream
+from StretchEngine import StretchEngine
+from CliqueWriter import CliqueWriter
+from BulkCheckpoint import BulkCheckpoint
+from BulkFrame import BulkFrame
+from RunMetrics import RunMetrics
 
 from collections import deque, defaultdict
+from functools import partial, lru_cache
+from array import array
 import bisect
 import itertools as it
+import numpy as np
 
+import multiprocessing
 import sys
 import os
 import timeit
 
 
+# The CliqueMaster whose (read-only) link stream and stretch phase results are inherited by forked worker processes
+_parallel_master = None
+
+def bulkPhaseWorker(task):
+  (delta, begin, end) = task
+  return _parallel_master.bulkPhaseRange(delta, begin, end)
+
+def stretchPhaseWorker(task):
+  (begin, end) = task
+  return _parallel_master.stretchLinkRange(begin, end)
+
+def segmentWorker(task):
+  (delta, gamma, begin, end) = task
+  return _parallel_master.enumerateSegmentRange(delta, gamma, begin, end)
+
+def chunkWorker(task):
+  (infile, delta, gamma, begin, end, delimiter, weighted) = task
+  chunk = CliqueMaster(False)
+  chunk._nodeLabelling = CustomNodeLabelling(_parallel_master._nodeLabelling.getStrategy(), _parallel_master._nodeLabelling.getSeed())
+  chunk.setProfiling(_parallel_master._profile)
+  chunk.enumerateChunk(infile, delta, gamma, begin, end, delimiter, weighted)
+  return list(chunk._R), chunk.getCounters(), chunk._metrics.getValues()
+
 
 class CliqueMaster:
 
-  def __init__(self, verbose):
-    self._times = defaultdict(list)
-    self._weights = defaultdict(list)
-    self._nodes = defaultdict(set)
+  def __init__(self, verbose, n_jobs=1):
+    self._links = LinkStore() # Stores all link instances using dense integer node and link ids
+    self._nodes = self._links._nodes
 
     self._nodeLabelling = CustomNodeLabelling()
 
-    self._time_stretched = defaultdict(list)
-    self._tbMins = defaultdict(list)
-    self._teMaxs = defaultdict(list)
+    self._time_stretched = defaultdict(list) # Keyed by link id
+    self._tbMins = defaultdict(partial(array, 'q')) # Borders of the stretched cliques per link id, as compact arrays
+    self._teMaxs = defaultdict(partial(array, 'q'))
+    self._higher_shared = array('i') # Per link id, see numHigherSharedNeighbors
 
     self._S = defaultdict(deque) # Stores all size 2 duration-wise maximal (delta,gamma)-cliques
+    self._frames = [BulkFrame()] # Frames of the bulk phase search per depth
     self._D = set()
+    self._roots = [] # Label ordered roots of the bulk phase, only used when it is run in parallel
+    self._stretch_engine = None # Only set while the stretch phase is run in parallel, or when stretch data is reused
+    self._reuse_stretch_data = False # If True, the StretchEngine and weights are kept for subsequent enumerations
+    self._state = None # (delta, gamma, horizon) of a loaded state, to which appended link instances may be added
+    self._stored_stretched = None # Borders of the stretched cliques per link id of a loaded state
+    self._checkpoint = None # Optional BulkCheckpoint to which the progress of the bulk phase is periodically written
+    self._resume = False # Whether to continue from the records of the checkpoint
+    self._checkpoint_records = [] # Records of the checkpoint continued from
+    self._checkpoint_pruned = [] # Roots pruned since the previous checkpoint
+    self._checkpoint_cliques = [] # Maximal cliques found since the previous checkpoint
+    self._segmented = False # Whether the link stream is split at gaps of over delta into independently enumerated segments
+    self._segments = [] # Time ranges of the segments, only used while the segments are enumerated
+    self._segment_columns = None # Link instances ordered by time (see enumerateSegments)
 
     self._R = set()   # Storage of the final result set of (delta,gamma)-maximal cliques
+    self._output_sink = None # Optional CliqueWriter to which each maximal clique is written as soon as it is found
+    self._retain_cliques = True # Whether the maximal cliques are (also) stored in self._R
+    self._emitted = None # Maximal cliques found for the current root, to be yielded by iterBulkPhase
 
     # Counters and timers to collect statistics on runtime, pruning, and iterations processed.
     self._cut_sub_branches_counter = 0
     self._cut_main_branches_counter = 0
     self._cut_duplicate_branches_counter = 0
     self._iternum = 0
+    self._emitted_counter = 0 # Number of maximal cliques written to the output sink or yielded, when not retained
 
+    # Profiling timers and counters, which are only updated when profiling is enabled (see setProfiling)
+    self._profile = False
     self._profiling_expansions = 0
     self._profiling_drop = 0
     self._profiling_drop_nl = 0
     self._profiling_drop_nl_counter_yes = 0
     self._profiling_drop_nl_counter_no = 0
+    self._window_cache_hits = 0
+    self._window_cache_misses = 0
+    self._window_cache_seen = (0, 0) # Hits and misses of the current cache, which are already added to the above
+    self.getStretchedWindow = self.findStretchedWindow
+    self.setWindowCacheSize(0) # Optional LRU cache of the stretched clique index ranges, keyed by (link, tbMax, teMin)
+
+    self._metrics = RunMetrics() # Phase timings and resource use, for the (optional) machine readable metrics file
+    self._metricsfile = None
+    self._infile = None
 
     self._verbose = verbose
+    self._n_jobs = n_jobs
 
 
 
@@ -62,24 +127,98 @@ class CliqueMaster:
   # Bulk phase functions
   #############################################################################################
 
+  def nextAtOrAfter(self, link, t):
+    # First instance of the link at or after t, or None (see LinkStore, which avoids copying the timestamps)
+    return self._links.nextAtOrAfter(link, t)
+
+  def prevAtOrBefore(self, link, t):
+    # Last instance of the link at or before t, or None
+    return self._links.prevAtOrBefore(link, t)
+
+  def cliqueNextAtOrAfter(self, X, t):
+    # First instance at or after t of every link of the node set X, ordered as it.combinations(sorted(X), 2)
+    return [self._links.nextAtOrAfter(self._links.linkId(u, v), t) for (u, v) in it.combinations(sorted(X), 2)]
+
+  def cliquePrevAtOrBefore(self, X, t):
+    return [self._links.prevAtOrBefore(self._links.linkId(u, v), t) for (u, v) in it.combinations(sorted(X), 2)]
+
+  def setWindowCacheSize(self, size):
+    # The same index ranges of stretched cliques are queried by sibling branches and at different depths of the bulk
+    # phase, hence at most size of these are cached (evicting the least recently used first), where 0 disables the cache.
+    # The cache is disabled by default, as most lookups are unique (e.g., 378 hits out of 1.6M lookups for 308k link
+    # instances of 30k nodes), such that its overhead exceeds the two binary searches it saves.
+    self.clearWindowCache()
+    if size == 0:
+      self.getStretchedWindow = self.findStretchedWindow
+    else:
+      self.getStretchedWindow = lru_cache(maxsize=size)(self.findStretchedWindow)
+
+  def setProfiling(self, profile):
+    # Swaps the hot functions of the bulk phase for instrumented versions which time (and count) their calls, such that
+    # no timers are called when profiling is disabled
+    self._profile = profile
+    for name in ["findCliqueExpansions", "findPrunedExpansions", "findRootExpansions", "pruneDominatedRoots",
+                 "isNeighborGrowthDominated"]:
+      self.__dict__.pop(name, None)
+    if profile:
+      self.findCliqueExpansions = self.profiled(self.findCliqueExpansions, "_profiling_expansions")
+      self.findRootExpansions = self.profiled(self.findRootExpansions, "_profiling_expansions")
+      self.findPrunedExpansions = self.profiled(self.findPrunedExpansions, "_profiling_drop")
+      self.pruneDominatedRoots = self.profiled(self.pruneDominatedRoots, "_profiling_drop")
+      self.isNeighborGrowthDominated = self.profiledNeighborGrowthDominated
+
+  def profiled(self, function, timer):
+    def profiled_function(*args):
+      start_time = timeit.default_timer()
+      result = function(*args)
+      setattr(self, timer, getattr(self, timer) + timeit.default_timer() - start_time)
+      return result
+    return profiled_function
+
+  def profiledNeighborGrowthDominated(self, *args):
+    start_time = timeit.default_timer()
+    dominated = CliqueMaster.isNeighborGrowthDominated(self, *args)
+    self._profiling_drop_nl += timeit.default_timer() - start_time
+    if dominated:
+      self._profiling_drop_nl_counter_yes += 1
+    else:
+      self._profiling_drop_nl_counter_no += 1
+    return dominated
+
+  def findStretchedWindow(self, link, tbMax, teMin):
+    # Index range of the stretched cliques of the link whose end is late enough (teMax >= tbMax) and whose beginning
+    # is early enough (tbMin <= teMin) to sufficiently overlap
+    return bisect.bisect_left(self._teMaxs[link], tbMax), bisect.bisect_right(self._tbMins[link], teMin)
+
+  def updateWindowCacheCounters(self):
+    if hasattr(self.getStretchedWindow, "cache_info"):
+      info = self.getStretchedWindow.cache_info()
+      self._window_cache_hits += info.hits - self._window_cache_seen[0]
+      self._window_cache_misses += info.misses - self._window_cache_seen[1]
+      self._window_cache_seen = (info.hits, info.misses)
+
+  def clearWindowCache(self):
+    # Cached index ranges are no longer valid once stretched cliques are added
+    if hasattr(self.getStretchedWindow, "cache_clear"):
+      self.updateWindowCacheCounters()
+      self.getStretchedWindow.cache_clear()
+      self._window_cache_seen = (0, 0)
+
   def isRecursiveOverlapClique(self, c, c_other, delta):
     # First we check if the c and c_other timespans have a valid overlap
     if c._teMax >= c_other._tbMax and c._tbMin <= c_other._teMin:
-      new_tbMin = max(c._tbMin, c_other._tbMin)
-      new_teMax = min(c._teMax, c_other._teMax)
-
-      overlap = {"tbMin": new_tbMin, "tbMax": new_tbMin + delta - 1,
-                 "teMin": new_teMax - delta + 1, "teMax": new_teMax}
+      overlap_tbMin = max(c._tbMin, c_other._tbMin)
+      overlap_teMax = min(c._teMax, c_other._teMax)
     else:
       return []
 
     # Second we check if the only 'new' link has a valid overlap with the above determined timespan overlap
-    link = frozenset([c._latestX, c_other._latestX])
+    link = self._links.linkId(c._latestX, c_other._latestX)
+    if link is None:
+      return []
 
-    # Determine first index of stretched times where it's end is late enough to sufficiently overlap with c and c_other
-    ind_begin = bisect.bisect_left(self._teMaxs[link], overlap["tbMax"])
-    # Determine last index of stretched times where it's beginning is early enough to sufficiently overlap with c and c_other
-    ind_end = bisect.bisect_right(self._tbMins[link], overlap["teMin"])
+    # Determine the range of stretched cliques sufficiently overlapping with c and c_other
+    (ind_begin, ind_end) = self.getStretchedWindow(link, overlap_tbMin + delta - 1, overlap_teMax - delta + 1)
     # Check that there exists at least one clique for this link with some overlap
     if ind_begin >= ind_end:
       return []
@@ -87,44 +226,44 @@ class CliqueMaster:
     overlaps = []
     # For each clique with an overlap determine the timespan and borders
     for cn in self._time_stretched[link][ind_begin:ind_end]:
-      new_tbMin = max(overlap["tbMin"], cn._tbMin)
-      new_teMax = min(overlap["teMax"], cn._teMax)
+      new_tbMin = max(overlap_tbMin, cn._tbMin)
+      new_teMax = min(overlap_teMax, cn._teMax)
 
       if c._tb < new_tbMin:
         if c_other._tb < new_tbMin:
-          new_tb = c.getMinimumTbFromBorderComb(self._times, new_tbMin, cn._tb, c_other)
+          new_tb = c.getMinimumTbFromBorderComb(self._links, new_tbMin, cn._tb, c_other)
         elif cn._tb < new_tbMin:
-          new_tb = self._times[link][bisect.bisect_left(self._times[link], new_tbMin):][0]
-          new_tb = c.getMinimumTbFromBorderFull(self._times, new_tbMin, min(c_other._tb, new_tb))
+          new_tb = self._links.nextAtOrAfter(link, new_tbMin)
+          new_tb = c.getMinimumTbFromBorderFull(self._links, new_tbMin, min(c_other._tb, new_tb))
         else:
-          new_tb = c.getMinimumTbFromBorderFull(self._times, new_tbMin, min(c_other._tb, cn._tb))
+          new_tb = c.getMinimumTbFromBorderFull(self._links, new_tbMin, min(c_other._tb, cn._tb))
       elif c_other._tb < new_tbMin:
         if cn._tb < new_tbMin:
-          new_tb = self._times[link][bisect.bisect_left(self._times[link], new_tbMin):][0]
-          new_tb = c_other.getMinimumTbFromBorderPart(self._times, new_tbMin, min(c._tb, new_tb))
+          new_tb = self._links.nextAtOrAfter(link, new_tbMin)
+          new_tb = c_other.getMinimumTbFromBorderPart(self._links, new_tbMin, min(c._tb, new_tb))
         else:
-          new_tb = c_other.getMinimumTbFromBorderPart(self._times, new_tbMin, min(c._tb, cn._tb))
+          new_tb = c_other.getMinimumTbFromBorderPart(self._links, new_tbMin, min(c._tb, cn._tb))
       elif cn._tb < new_tbMin:
-        new_tb = min(c._tb, c_other._tb, self._times[link][bisect.bisect_left(self._times[link], new_tbMin):][0])
+        new_tb = min(c._tb, c_other._tb, self._links.nextAtOrAfter(link, new_tbMin))
       else:
         new_tb = min(c._tb, c_other._tb, cn._tb)
 
       if c._te > new_teMax:
         if c_other._te > new_teMax:
-          new_te = c.getMaximumTeToBorderComb(self._times, cn._te, new_teMax, c_other)
+          new_te = c.getMaximumTeToBorderComb(self._links, cn._te, new_teMax, c_other)
         elif cn._te > new_teMax:
-          new_te = self._times[link][:bisect.bisect_right(self._times[link], new_teMax)][-1]
-          new_te = c.getMaximumTeToBorderFull(self._times, max(c_other._te, new_te), new_teMax)
+          new_te = self._links.prevAtOrBefore(link, new_teMax)
+          new_te = c.getMaximumTeToBorderFull(self._links, max(c_other._te, new_te), new_teMax)
         else:
-          new_te = c.getMaximumTeToBorderFull(self._times, max(c_other._te, cn._te), new_teMax)
+          new_te = c.getMaximumTeToBorderFull(self._links, max(c_other._te, cn._te), new_teMax)
       elif c_other._te > new_teMax:
         if cn._te > new_teMax:
-          new_te = self._times[link][:bisect.bisect_right(self._times[link], new_teMax)][-1]
-          new_te = c_other.getMaximumTeToBorderPart(self._times, max(c._te, new_te), new_teMax)
+          new_te = self._links.prevAtOrBefore(link, new_teMax)
+          new_te = c_other.getMaximumTeToBorderPart(self._links, max(c._te, new_te), new_teMax)
         else:
-          new_te = c_other.getMaximumTeToBorderPart(self._times, max(c._te, cn._te), new_teMax)
+          new_te = c_other.getMaximumTeToBorderPart(self._links, max(c._te, cn._te), new_teMax)
       elif cn._te > new_teMax:
-        new_te = max(c._te, c_other._te, self._times[link][:bisect.bisect_right(self._times[link], new_teMax)][-1])
+        new_te = max(c._te, c_other._te, self._links.prevAtOrBefore(link, new_teMax))
       else:
         new_te = max(c._te, c_other._te, cn._te)
 
@@ -132,19 +271,23 @@ class CliqueMaster:
     return overlaps
 
 
-  def bulkRecursive(self, delta, c, other_expansions):
+  def expandClique(self, delta, c, other_expansions, frame):
+    # Determines the node expansions of c (using the node expansions of its parent) into frame, and which expansions of
+    # its parent are dominated by these
     self._iternum += 1
+    frame.clear()
+    self.findCliqueExpansions(delta, c, other_expansions, frame)
+    self.findPrunedExpansions(frame)
 
+  def findCliqueExpansions(self, delta, c, other_expansions, frame):
     # Determine further node overlaps
-    all_node_expansions = defaultdict(deque)
-    all_node_expansions_lists = defaultdict(list)
+    all_node_expansions_lists = frame._expansions
 
-    start_time = timeit.default_timer()
-
-    extended_borders = {"tbMin": [], "teMax": [], "tbMax": [], "teMin": [], "cov_tb": [], "cov_te": []}
-    extended_neighbors = []
-    extended_neighbor_indices = []
-    extended_node_expansions = defaultdict(list)
+    extended_borders = frame._extended_borders
+    extended_neighbors = frame._extended_neighbors
+    extended_bits = 0 # Bitset of the extended neighbors
+    extended_neighbor_indices = frame._extended_neighbor_indices
+    extended_node_expansions = frame._extended_node_expansions
     for new_neighbor in self._nodeLabelling.getSortedNodesByLabel(other_expansions.keys()):
       extended = False
       neighbor_E_index = len(extended_borders["tbMin"])
@@ -156,8 +299,7 @@ class CliqueMaster:
         for timespan, borders, cn in expansions:
           # Store node expansions we have found already as Clique objects
           c_new = Clique((frozenset(set(c._X).union([new_neighbor])), timespan), borders,
-                          c._shared_neighbors.intersection(self._nodes[new_neighbor]), new_neighbor)
-          all_node_expansions[new_neighbor].append(c_new)
+                          c._shared_neighbors & self._nodeLabelling.getNeighborBitset(new_neighbor), new_neighbor)
           all_node_expansions_lists[new_neighbor].append(c_new)
 
           if self._nodeLabelling.get(new_neighbor) > self._nodeLabelling.get(c._latestX): # No need to check if we can prune towards branches that must already have already been processed
@@ -173,26 +315,27 @@ class CliqueMaster:
         min_tbMax = min(extended_borders["tbMax"])
         max_teMin = max(extended_borders["teMin"])
         extended_neighbors.append(new_neighbor)
+        extended_bits |= self._nodeLabelling.getNodeBit(new_neighbor)
         extended_neighbor_indices.append((neighbor_E_index, len(extended_borders["cov_tb"]), min_tbMax, max_teMin))
         # Check not only the cliques which led to extensions but also temporally adjacent ones for potential growth coverage
         for c_other in other_expansions[new_neighbor]:
           if c_other._teMax >= min(extended_borders["tbMax"]) and c_other._tbMin <= max(extended_borders["teMin"]):
             extended_borders["cov_tb"].append(c_other._tb)
             extended_borders["cov_te"].append(c_other._te)
+    frame._extended_bits = extended_bits
 
-    stop_time = timeit.default_timer()
-    self._profiling_expansions += stop_time - start_time
-    start_time = timeit.default_timer()
-
+  def findPrunedExpansions(self, frame):
     # Determine which 'other_expansions' are fully dominated by current expansions and can be skipped in the future
-    pruning_set = set()
+    (extended_borders, extended_neighbors, extended_bits, extended_neighbor_indices, extended_node_expansions) = \
+      (frame._extended_borders, frame._extended_neighbors, frame._extended_bits, frame._extended_neighbor_indices, frame._extended_node_expansions)
+    pruning_set = frame._pruning_set
     for n_ind in range(len(extended_neighbors)):
       for (c_new, c_other, cn) in extended_node_expansions[extended_neighbors[n_ind]]:
         if c_other.isTemporallyDominated(c_new._tb, c_new._te):
           (E_key, cov_key, min_tbMax, max_teMin) = extended_neighbor_indices[n_ind]
           E_max_tbMin = max(extended_borders["tbMin"][E_key:])
           E_min_teMax = min(extended_borders["teMax"][E_key:])
-          if c_other.isSpatialGrowthDominated(extended_neighbors, self._nodeLabelling) and \
+          if c_other.isSpatialGrowthDominated(extended_bits, self._nodeLabelling) and \
              c_new.isSpatialGrowthReachable(E_max_tbMin, E_min_teMax):
             if n_ind == len(extended_neighbors)-1 or self.isTemporalGrowthDominated(c_other, E_max_tbMin, E_min_teMax, \
                                                                                          min(extended_borders["cov_tb"][cov_key:]), \
@@ -200,108 +343,58 @@ class CliqueMaster:
                                                                                          extended_neighbors[n_ind:], min_tbMax, max_teMin):
               pruning_set.add(c_other)
 
-    stop_time = timeit.default_timer()
-    self._profiling_drop += stop_time - start_time
-
-    # Determine based on available expansions if current clique is maximal and recursively try to extend our expansions
-    is_max = True
-    done_expansions = set()
-    for maxX in self._nodeLabelling.getSortedNodesByLabel(all_node_expansions.keys()):
-      node_expansions = all_node_expansions[maxX]
-
-      while len(node_expansions) > 0:
-        c_new = node_expansions.pop()
-        # If an extension exists that maintains or even extends temporal borders, this clique is not maximal
-        if is_max and c_new._tb <= c._tb and c._te <= c_new._te:
-          is_max = False
-        # If this expansion is a duplicate of an earlier processed clique, skip this branch
-        if self._nodeLabelling.get(c_new._latestX) <= self._nodeLabelling.get(c._latestX):
-          self._cut_duplicate_branches_counter += 1
-          continue
-        # Check whether this expansion has been pruned
-        if c_new in done_expansions:
-          self._cut_sub_branches_counter += 1
-          continue
-        # Continue along this branch of expansion
-        valid_expansions = self.bulkRecursive(delta, c_new, all_node_expansions_lists)#_set)
-        # Check for all branches to which the recursive call was able to further expand if we can prune them at this level
-        for c_valid in valid_expansions:
-          done_expansions.add(c_valid)
-
-    # This clique was maximal
-    if is_max:
-      self._R.add(c)
-
-    return pruning_set
-
-
 
-  def isInitialOverlapClique(self, c, u, v, neighbor, delta):
-    orig_link = frozenset([u, v])
 
-    # First process adding link (u, neighbor)
-    overlaps_u = []
-
-    link_u = frozenset([u, neighbor])
-    # Determine first index of stretched times where it's end is late enough to sufficiently overlap with clique
-    ind_begin = bisect.bisect_left(self._teMaxs[link_u], c._tbMax)
-    # Determine last index of stretched times where it's beginning is early enough to sufficiently overlap with clique
-    ind_end = bisect.bisect_right(self._tbMins[link_u], c._teMin)
+  def isInitialOverlapClique(self, c, orig_link, link_u, v, neighbor, delta):
+    # First process adding link (u, neighbor), where the root c is link orig_link {u, v} and link_u is (u, neighbor)
+    # Determine the range of stretched cliques sufficiently overlapping with clique
+    (ind_begin, ind_end) = self.getStretchedWindow(link_u, c._tbMax, c._teMin)
     # Check that there exists at least one clique for this link with some overlap
     if ind_begin >= ind_end:
       return []
 
-    # For each clique with an overlap determine the timespan and borders
-    for cn in self._time_stretched[link_u][ind_begin:ind_end]:
-      new_tbMin = max(c._tbMin, cn._tbMin)
-      new_teMax = min(c._teMax, cn._teMax)
-
-      overlaps_u.append({"tbMin": new_tbMin, "tbMax": new_tbMin + delta - 1,
-                         "teMin": new_teMax - delta + 1, "teMax": new_teMax,
-                         "cn_u": cn})
-
-    # Second process adding link (v, neighbor)
+    # Second process adding link (v, neighbor) for each clique of link (u, neighbor) with an overlap
     overlaps_uv = []
 
-    link_v = frozenset([v, neighbor])
-    for overlap in overlaps_u:
-      # Determine first index of stretched times where it's end is late enough to sufficiently overlap with clique
-      ind_begin = bisect.bisect_left(self._teMaxs[link_v], overlap["tbMax"])
-      # Determine last index of stretched times where it's beginning is early enough to sufficiently overlap with clique
-      ind_end = bisect.bisect_right(self._tbMins[link_v], overlap["teMin"])
+    link_v = self._links.linkId(v, neighbor)
+    for cn_u in self._time_stretched[link_u][ind_begin:ind_end]:
+      u_tbMin = max(c._tbMin, cn_u._tbMin)
+      u_teMax = min(c._teMax, cn_u._teMax)
+
+      # Determine the range of stretched cliques sufficiently overlapping with clique
+      (ind_begin_v, ind_end_v) = self.getStretchedWindow(link_v, u_tbMin + delta - 1, u_teMax - delta + 1)
       # Check that there exists at least one clique for this link with some overlap
-      if ind_begin >= ind_end:
+      if ind_begin_v >= ind_end_v:
         continue
 
       # For each clique with an overlap determine the timespan and borders
-      for cn in self._time_stretched[link_v][ind_begin:ind_end]:
-        new_tbMin = max(overlap["tbMin"], cn._tbMin)
-        new_teMax = min(overlap["teMax"], cn._teMax)
+      for cn in self._time_stretched[link_v][ind_begin_v:ind_end_v]:
+        new_tbMin = max(u_tbMin, cn._tbMin)
+        new_teMax = min(u_teMax, cn._teMax)
 
         orig_tb = c._tb
         if c._tb < new_tbMin:
-          orig_tb = self._times[orig_link][bisect.bisect_left(self._times[orig_link], new_tbMin):][0]
-        u_tb = overlap["cn_u"]._tb
-        if overlap["cn_u"]._tb < new_tbMin:
-          u_tb = self._times[link_u][bisect.bisect_left(self._times[link_u], new_tbMin):][0]
+          orig_tb = self._links.nextAtOrAfter(orig_link, new_tbMin)
+        u_tb = cn_u._tb
+        if cn_u._tb < new_tbMin:
+          u_tb = self._links.nextAtOrAfter(link_u, new_tbMin)
         v_tb = cn._tb
         if cn._tb < new_tbMin:
-          v_tb = self._times[link_v][bisect.bisect_left(self._times[link_v], new_tbMin):][0]
+          v_tb = self._links.nextAtOrAfter(link_v, new_tbMin)
         new_tb = min(orig_tb, u_tb, v_tb)
 
         orig_te = c._te
         if c._te > new_teMax:
-          orig_te = self._times[orig_link][:bisect.bisect_right(self._times[orig_link], new_teMax)][-1]
-        u_te = overlap["cn_u"]._te
-        if overlap["cn_u"]._te > new_teMax:
-          u_te = self._times[link_u][:bisect.bisect_right(self._times[link_u], new_teMax)][-1]
+          orig_te = self._links.prevAtOrBefore(orig_link, new_teMax)
+        u_te = cn_u._te
+        if cn_u._te > new_teMax:
+          u_te = self._links.prevAtOrBefore(link_u, new_teMax)
         v_te = cn._te
         if cn._te > new_teMax:
-          v_te = self._times[link_v][:bisect.bisect_right(self._times[link_v], new_teMax)][-1]
+          v_te = self._links.prevAtOrBefore(link_v, new_teMax)
         new_te = max(orig_te, u_te, v_te)
 
-        overlaps_uv.append(((new_tb, new_te), (new_tbMin, new_tbMin + delta - 1, new_teMax - delta + 1, new_teMax),
-                            {"cn_u": overlap["cn_u"], "cn_v": cn}))
+        overlaps_uv.append(((new_tb, new_te), (new_tbMin, new_tbMin + delta - 1, new_teMax - delta + 1, new_teMax), cn_u, cn))
 
     return overlaps_uv
 
@@ -316,150 +409,194 @@ class CliqueMaster:
     if min_cov_tb < E_max_tbMin or E_min_teMax < max_cov_te:
       return False
 
-    start_time = timeit.default_timer()
+    return self.isNeighborGrowthDominated(E_max_tbMin, E_min_teMax, extended_neighbors, min_tbMax, max_teMin)
 
+  def isNeighborGrowthDominated(self, E_max_tbMin, E_min_teMax, extended_neighbors, min_tbMax, max_teMin):
     # Next we check the actual possible growth through edges between the potential further extension nodes, i.e., the shared edges not covered by the extended cliques
-    node_combs = [frozenset([u, v]) for (u,v) in it.combinations(extended_neighbors, 2)]
+    node_combs = [self._links.linkId(u, v) for (u,v) in it.combinations(extended_neighbors, 2)]
     for link in node_combs:
+      if link is None:
+        continue
       for cn in self._time_stretched[link]:
         # First we check that on the left side, if there is sufficient overlap with the potential growth of c_other AND there is a link earlier than the potential growth of the combined extensions
         if cn._teMax >= min_tbMax and cn._tb < E_max_tbMin:
-          stop_time = timeit.default_timer()
-          self._profiling_drop_nl += stop_time - start_time
-          self._profiling_drop_nl_counter_no += 1
           return False
         # Second we check that on the right side, if there is sufficient overlap with the potential growth of c_other AND there is a link later than the potential growth of the combined extensions
         if cn._tbMin <= max_teMin and cn._te > E_min_teMax:
-          stop_time = timeit.default_timer()
-          self._profiling_drop_nl += stop_time - start_time
-          self._profiling_drop_nl_counter_no += 1
           return False
-    self._profiling_drop_nl_counter_yes += 1
-    stop_time = timeit.default_timer()
-    self._profiling_drop_nl += stop_time - start_time
     return True
 
-  def bulkRecursiveWrapper(self, delta, c, iternum_outer):
+  def expandRoot(self, delta, c, frame):
+    # Determines the node expansions of root c into frame and prunes the roots which are dominated by these
     self._iternum += 1
-    # Find initial node expansions
-    all_node_expansions = defaultdict(deque)
-    all_node_expansions_lists = defaultdict(list)
+    frame.clear()
+    self.findRootExpansions(delta, c, frame)
+    self.pruneDominatedRoots(frame)
 
-    start_time = timeit.default_timer()
+  def findRootExpansions(self, delta, c, frame):
+    # Find initial node expansions
+    all_node_expansions_lists = frame._expansions
 
-    extended_borders = {"tbMin": [], "teMax": [], "tbMax": [], "teMin": [], "cov_tb": [], "cov_te": []}
-    extended_neighbors = []
-    extended_neighbor_indices = []
-    extended_node_expansions = defaultdict(list)
+    extended_borders = frame._extended_borders
+    extended_neighbors = frame._extended_neighbors
+    extended_bits = 0 # Bitset of the extended neighbors
+    extended_neighbor_indices = frame._extended_neighbor_indices
+    extended_node_expansions = frame._extended_node_expansions
     [u, v] = list(c._X)
-    for neighbor in self._nodeLabelling.getSortedNodesByLabel(list(c._shared_neighbors)):
+    # The shared neighbors of all cliques expanding this root are bitsets relative to those of the root
+    neighbors = self._nodeLabelling.setRootNeighbors(self._nodes[u] & self._nodes[v])
+    shared_neighbors = (1 << len(neighbors)) - 1
+    orig_link = self._links.linkId(u, v)
+    for (neighbor, link_u) in zip(neighbors, self._links.linkIds(u, neighbors)):
       extended = False
       neighbor_E_index = len(extended_borders["tbMin"])
       # Compute the node expansions for this neighbor
-      expansions = self.isInitialOverlapClique(c, u, v, neighbor, delta)
-      for timespan, borders, expansion in expansions:
+      expansions = self.isInitialOverlapClique(c, orig_link, link_u, v, neighbor, delta)
+      for timespan, borders, cn_u, cn_v in expansions:
         # Store node expansions we have found already as Clique objects
         c_new = Clique((frozenset(set(c._X).union([neighbor])), timespan), borders,
-                        c._shared_neighbors.intersection(self._nodes[neighbor]), neighbor)
-        all_node_expansions[neighbor].append(c_new)
+                        shared_neighbors & self._nodeLabelling.getNeighborBitset(neighbor), neighbor)
         all_node_expansions_lists[neighbor].append(c_new)
 
         if self._nodeLabelling.get(neighbor) > self._nodeLabelling.get(c._latestX): # No need to check if we can prune towards branches that must already have already been processed
-          extended_node_expansions[neighbor].append((c_new, expansion["cn_u"], expansion["cn_v"]))
+          extended_node_expansions[neighbor].append((c_new, cn_u, cn_v))
 
           extended_borders["tbMin"].append(c_new._tbMin)
           extended_borders["teMax"].append(c_new._teMax)
 
-          extended_borders["tbMax"].append(expansion["cn_u"]._tbMax)
-          extended_borders["tbMax"].append(expansion["cn_v"]._tbMax)
-          extended_borders["teMin"].append(expansion["cn_u"]._teMin)
-          extended_borders["teMin"].append(expansion["cn_v"]._teMin)
+          extended_borders["tbMax"].append(cn_u._tbMax)
+          extended_borders["tbMax"].append(cn_v._tbMax)
+          extended_borders["teMin"].append(cn_u._teMin)
+          extended_borders["teMin"].append(cn_v._teMin)
 
           extended = True
       if extended:
         min_tbMax = min(extended_borders["tbMax"])
         max_teMin = max(extended_borders["teMin"])
         extended_neighbors.append(neighbor)
+        extended_bits |= self._nodeLabelling.getNodeBit(neighbor)
         extended_neighbor_indices.append((neighbor_E_index, len(extended_borders["cov_tb"]), min_tbMax, max_teMin))
 
         # Check not only the cliques which led to extensions but also temporally adjacent ones for potential growth coverage
-        link_u = frozenset([u, neighbor])
-        for cn in self._time_stretched[link_u][bisect.bisect_left(self._teMaxs[link_u], min_tbMax):bisect.bisect_right(self._tbMins[link_u], max_teMin)]:
+        (ind_begin, ind_end) = self.getStretchedWindow(link_u, min_tbMax, max_teMin)
+        for cn in self._time_stretched[link_u][ind_begin:ind_end]:
           extended_borders["cov_tb"].append(cn._tb)
           extended_borders["cov_te"].append(cn._te)
-        link_v = frozenset([v, neighbor])
-        for cn in self._time_stretched[link_v][bisect.bisect_left(self._teMaxs[link_v], min_tbMax):bisect.bisect_right(self._tbMins[link_v], max_teMin)]:
+        link_v = self._links.linkId(v, neighbor)
+        (ind_begin, ind_end) = self.getStretchedWindow(link_v, min_tbMax, max_teMin)
+        for cn in self._time_stretched[link_v][ind_begin:ind_end]:
           extended_borders["cov_tb"].append(cn._tb)
           extended_borders["cov_te"].append(cn._te)
+    frame._extended_bits = extended_bits
 
-    stop_time = timeit.default_timer()
-    self._profiling_expansions += stop_time - start_time
-    start_time = timeit.default_timer()
-
+  def pruneDominatedRoots(self, frame):
+    (extended_borders, extended_neighbors, extended_bits, extended_neighbor_indices, extended_node_expansions) = \
+      (frame._extended_borders, frame._extended_neighbors, frame._extended_bits, frame._extended_neighbor_indices, frame._extended_node_expansions)
     # Determine which neighboring links are fully dominated by current expansions and can be skipped in the future
     for n_ind in range(len(extended_neighbors)):
-      for (c_new, c_u, c_v) in extended_node_expansions[extended_neighbors[n_ind]]:
+      neighbor = extended_neighbors[n_ind]
+      for (c_new, c_u, c_v) in extended_node_expansions[neighbor]:
         if c_u not in self._D: # Prevent rechecking an already pruned 2-node clique
           if c_u.isTemporallyDominated(c_new._tb, c_new._te):
             (E_key, cov_key, min_tbMax, max_teMin) = extended_neighbor_indices[n_ind]
             E_max_tbMin = max(extended_borders["tbMin"][E_key:])
             E_min_teMax = min(extended_borders["teMax"][E_key:])
-            if c_u.isSpatialGrowthDominated(extended_neighbors, self._nodeLabelling) and \
+            if c_u.isLinkSpatialGrowthDominated(extended_bits, neighbor, self.numHigherSharedNeighbors(c_u), self._nodeLabelling) and \
                c_new.isSpatialGrowthReachable(E_max_tbMin, E_min_teMax):
               if n_ind == len(extended_neighbors)-1 or self.isTemporalGrowthDominated(c_u, E_max_tbMin, E_min_teMax, \
                                                                                            min(extended_borders["cov_tb"][cov_key:]), \
                                                                                            max(extended_borders["cov_te"][cov_key:]), \
                                                                                            extended_neighbors[n_ind:], min_tbMax, max_teMin):
-                self._D.add(c_u)
+                self.addPrunedRoot(c_u)
         if c_v not in self._D: # Prevent rechecking an already pruned 2-node clique
           if c_v.isTemporallyDominated(c_new._tb, c_new._te):
             (E_key, cov_key, min_tbMax, max_teMin) = extended_neighbor_indices[n_ind]
             E_max_tbMin = max(extended_borders["tbMin"][E_key:])
             E_min_teMax = min(extended_borders["teMax"][E_key:])
-            if c_v.isSpatialGrowthDominated(extended_neighbors, self._nodeLabelling) and \
+            if c_v.isLinkSpatialGrowthDominated(extended_bits, neighbor, self.numHigherSharedNeighbors(c_v), self._nodeLabelling) and \
                c_new.isSpatialGrowthReachable(E_max_tbMin, E_min_teMax):
               if n_ind == len(extended_neighbors)-1 or self.isTemporalGrowthDominated(c_v, E_max_tbMin, E_min_teMax, \
                                                                                            min(extended_borders["cov_tb"][cov_key:]), \
                                                                                            max(extended_borders["cov_te"][cov_key:]), \
                                                                                            extended_neighbors[n_ind:], min_tbMax, max_teMin):
-                self._D.add(c_v)
-
-    stop_time = timeit.default_timer()
-    self._profiling_drop += stop_time - start_time
-
-    # Determine based on available expansions if current clique is maximal and recursively try to extend our expansions
-    is_max = True
-    done_expansions = set()
-    for maxX in self._nodeLabelling.getSortedNodesByLabel(all_node_expansions.keys()):
-      node_expansions = all_node_expansions[maxX]
-
-      while len(node_expansions) > 0:
-        c_new = node_expansions.pop()
-        # If an extension exist that maintains or even extends temporal borders, this clique is not maximal
-        if is_max and c_new._tb <= c._tb and c._te <= c_new._te:
-          is_max = False
-        # If this expansion is a duplicate of an earlier processed clique, skip this branch
-        if self._nodeLabelling.get(c_new._latestX) <= self._nodeLabelling.get(c._latestX):
-          self._cut_duplicate_branches_counter += 1
-          continue
-        # Check whether this expansion has been pruned
-        if c_new in done_expansions:
-          self._cut_sub_branches_counter += 1
-          continue
+                self.addPrunedRoot(c_v)
+
+  def numHigherSharedNeighbors(self, c):
+    # Number of shared neighbors of the nodes of 2-node clique c labelled above both, which is counted once per link
+    # (rather than storing the shared neighbors of every link) and stored by link id, -1 if not yet counted
+    if len(self._higher_shared) == 0:
+      self._higher_shared = array('i', [-1]) * self._links.numLinks()
+    link = self._links.linkId(*c._X)
+    count = self._higher_shared[link]
+    if count < 0:
+      count = self._nodeLabelling.countHigherSharedNeighbors(c._X)
+      self._higher_shared[link] = count
+    return count
+
+  def bulkSearch(self, delta, c):
+    # Depth first search for the maximal cliques expanding root c, using an explicit stack of frames rather than
+    # recursion (such that the depth is not limited by the recursion limit). Expansions are processed in the same order
+    # as a recursive search would.
+    frames = self._frames
+    depth = 0
+    self.expandRoot(delta, c, frames[0])
+    frames[0].reset(c, self._nodeLabelling.get(c._latestX), self._nodeLabelling)
+    while depth >= 0:
+      frame = frames[depth]
+      c_new = frame.nextCandidate()
+      if c_new is None:
+        # All expansions are processed, hence the clique of this frame is maximal if none maintained its timespan
+        if frame._is_max:
+          self.addResultClique(frame._c)
+        depth -= 1
+        # The expansions of the parent which are dominated by those of this frame can be skipped by the parent
+        if depth >= 0:
+          frames[depth]._done_expansions.update(frame._pruning_set)
+        continue
 
-        # Continue along this branch of expansion
-        valid_expansions = self.bulkRecursive(delta, c_new, all_node_expansions_lists)#_set)
-        # Check for all branches to which the recursive call was able to further expand if we can prune them at this level
-        for c_valid in valid_expansions:
-          done_expansions.add(c_valid)
+      # If an extension exists that maintains or even extends temporal borders, this clique is not maximal
+      if frame._is_max and c_new._tb <= frame._c._tb and frame._c._te <= c_new._te:
+        frame._is_max = False
+      # If this expansion is a duplicate of an earlier processed clique, skip this branch
+      label = self._nodeLabelling.get(c_new._latestX)
+      if label <= frame._label:
+        self._cut_duplicate_branches_counter += 1
+        continue
+      # Check whether this expansion has been pruned
+      if c_new in frame._done_expansions:
+        self._cut_sub_branches_counter += 1
+        continue
+
+      # Continue along this branch of expansion, of which the frame (no longer in use) is reused
+      depth += 1
+      if depth == len(frames):
+        frames.append(BulkFrame())
+      self.expandClique(delta, c_new, frame._expansions, frames[depth])
+      frames[depth].reset(c_new, label, self._nodeLabelling)
 
-    # This clique was maximal
-    if is_max:
-      self._R.add(c)
 
+  def addPrunedRoot(self, c):
+    self._D.add(c)
+    if self._checkpoint is not None:
+      self._checkpoint_pruned.append(c)
 
   def bulkPhase(self, delta):
+    for c in self.iterBulkPhase(delta):
+      pass
+
+  def iterBulkPhase(self, delta):
+    # Yields the maximal cliques (in terms of the original node identifiers) as they are found, root by root, such
+    # that the bulk phase only progresses as far as the cliques are consumed
+    if self._n_jobs > 1:
+      yield from self.iterParallelBulkPhase(delta)
+      return
+
     iternum_outer = 0
+    # Roots processed before the checkpoint continued from are skipped
+    resumed = [record["position"] for record in self._checkpoint_records]
+    yield from self.resumeCheckpoint()
+    resume_position = max(resumed, default=0)
+    last_checkpoint = timeit.default_timer()
 
     for maxX in self._nodeLabelling.getSortedNodesByLabel(self._S.keys()):
       S = self._S[maxX]
@@ -467,18 +604,119 @@ class CliqueMaster:
       while len(S) > 0:
         iternum_outer += 1
         c = S.pop()
+        if iternum_outer <= resume_position:
+          continue
 
         # Check whether clique c has been pruned
         if c in self._D:
           self._cut_main_branches_counter += 1
           continue
 
-        self.bulkRecursiveWrapper(delta, c, iternum_outer)
+        self._emitted = []
+        self.bulkSearch(delta, c)
+        emitted = self._emitted
+        self._emitted = None
+
+        if self._checkpoint is not None and timeit.default_timer() - last_checkpoint >= self._checkpoint.getInterval():
+          self.writeCheckpoint({"position": iternum_outer})
+          last_checkpoint = timeit.default_timer()
+        yield from emitted
 
         if self._verbose:
-          sys.stderr.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\r".format(len(self._R), iternum_outer, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+          sys.stderr.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\r".format(self.numResultCliques(), iternum_outer, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+
+    if self._checkpoint is not None:
+      self.writeCheckpoint({"position": iternum_outer})
+    sys.stdout.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\n".format(self.numResultCliques(), iternum_outer, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+
+  #############################################################################################
+  # Parallel bulk phase functions
+  #############################################################################################
+
+  def getCounters(self):
+    self.updateWindowCacheCounters()
+    return {name: getattr(self, name) for name in ["_iternum", "_cut_sub_branches_counter", "_cut_main_branches_counter",
+                                                   "_cut_duplicate_branches_counter", "_profiling_expansions", "_profiling_drop",
+                                                   "_profiling_drop_nl", "_profiling_drop_nl_counter_yes", "_profiling_drop_nl_counter_no",
+                                                   "_window_cache_hits", "_window_cache_misses"]}
+
+  def bulkPhaseRange(self, delta, begin, end):
+    # Runs within a worker process, where the pruned roots in self._D are kept across the ranges processed by that worker.
+    # The cliques found are returned to the parent process, which alone writes to the output sink.
+    self._R = set()
+    self._output_sink = None
+    self._retain_cliques = True
+    self._checkpoint = None
+    for name in self.getCounters():
+      setattr(self, name, 0)
+
+    for c in self._roots[begin:end]:
+      # Check whether clique c has been pruned
+      if c in self._D:
+        self._cut_main_branches_counter += 1
+        continue
+      self.bulkSearch(delta, c)
+    return begin, self._R, self.getCounters()
 
-    sys.stdout.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\n".format(len(self._R), iternum_outer, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+  def orderRoots(self):
+    # Process the roots in the same order as the serial bulk phase, such that ranges of roots keep most of their pruning
+    self._roots = []
+    for maxX in self._nodeLabelling.getSortedNodesByLabel(self._S.keys()):
+      self._roots.extend(reversed(self._S[maxX]))
+      self._S[maxX].clear()
+
+  def parallelBulkPhase(self, delta):
+    for c in self.iterParallelBulkPhase(delta):
+      pass
+
+  def iterParallelBulkPhase(self, delta):
+    # Closing this generator early leaves the with statement below, which terminates the worker processes
+    global _parallel_master
+
+    self.orderRoots()
+    range_size = max(1, len(self._roots) // (self._n_jobs * 64))
+    tasks = [(delta, begin, min(begin + range_size, len(self._roots))) for begin in range(0, len(self._roots), range_size)]
+    # Ranges of roots processed before the checkpoint continued from are skipped
+    resumed = set(begin for record in self._checkpoint_records for begin in record["ranges"])
+    yield from self.resumeCheckpoint()
+    tasks = [task for task in tasks if task[1] not in resumed]
+    last_checkpoint = timeit.default_timer()
+    completed = []
+
+    iternum_outer = 0
+    _parallel_master = self
+    try:
+      with multiprocessing.get_context("fork").Pool(self._n_jobs) as pool:
+        for (begin, R, counters) in pool.imap_unordered(bulkPhaseWorker, tasks):
+          if self._output_sink is not None:
+            for c in R:
+              self._output_sink.write(c)
+          if self._retain_cliques:
+            self._R.update(R)
+          self._emitted_counter += len(R)
+          if self._checkpoint is not None:
+            # The begin of a range identifies the ranges completed, whose cliques are stored in the checkpoint
+            self._checkpoint_cliques.extend(R)
+            completed.append(begin)
+            if timeit.default_timer() - last_checkpoint >= self._checkpoint.getInterval():
+              self.writeCheckpoint({"ranges": completed})
+              completed = []
+              last_checkpoint = timeit.default_timer()
+          for (name, value) in counters.items():
+            setattr(self, name, getattr(self, name) + value)
+          iternum_outer += 1
+
+          if self._verbose:
+            sys.stderr.write("Found {} unique maximal, {}/{} ranges processed, {} iter, {} main cut, {} sub cut, {} sub dupl\r".format(self.numResultCliques(), iternum_outer, len(tasks), self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+          yield from R
+    finally:
+      _parallel_master = None
+    if self._checkpoint is not None:
+      self.writeCheckpoint({"ranges": completed})
+    num_roots = len(self._roots)
+    self._roots = []
+
+    sys.stdout.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\n".format(self.numResultCliques(), num_roots, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
 
   #############################################################################################
   # Link stream reading in functions
@@ -489,37 +727,100 @@ class CliqueMaster:
       for line in inf:
         contents = line.split(delimiter)
         t = int(contents[0])
-        u = int(contents[1])
-        v = int(contents[2])
+        u = self._links.parseNodeName(contents[1])
+        v = self._links.parseNodeName(contents[2])
 
-        link = frozenset([u, v])
-        self._times[link].append(t)
-        self._weights[link].append(1)
-        self._nodes[u].add(v)
-        self._nodes[v].add(u)
+        self._links.addLinkInstance(t, u, v)
+    self._links.finalize()
 
   def readWeightedLinkStream(self, infile, delimiter):
     with open(infile) as inf:
       for line in inf:
         contents = line.split(delimiter)
         t = int(contents[0])
-        u = int(contents[1])
-        v = int(contents[2])
+        u = self._links.parseNodeName(contents[1])
+        v = self._links.parseNodeName(contents[2])
         w = float(contents[3])
 
-        link = frozenset([u, v])
-        self._times[link].append(t)
-        self._weights[link].append(w)
-        self._nodes[u].add(v)
-        self._nodes[v].add(u)
+        self._links.addLinkInstance(t, u, v, w)
+    self._links.finalize()
 
-  def readLinkStream(self, infile, delimiter=" ", weighted=False):
+  def readCachedLinkStream(self, infile, delimiter, weighted):
+    # Parse the link stream in bulk and store it in a sidecar cache, or memory map the cache of an earlier run
+    reader = LinkStreamReader(infile, delimiter, weighted)
+    if reader.hasValidCache():
+      reader.readCache(self._links)
+    else:
+      reader.read(self._links)
+      reader.writeCache(self._links)
+
+  def loadLinks(self, times, us, vs, weights=None):
+    # Alternative to readLinkStream for a link stream held in memory as columns of timestamps, node identifiers and
+    # (optionally) weights, such as NumPy arrays or pandas/Arrow columns. Columns are used as is where their dtype
+    # allows (np.asarray does not copy NumPy arrays, nor most pandas and Arrow columns), and are only copied once when
+    # grouped per link into the CSR layout. Unlike for files, the link instances need not be ordered by time.
+    times = np.asarray(times)
+    us = np.asarray(us)
+    vs = np.asarray(vs)
+    assert len(us) == len(times) and len(vs) == len(times) and (weights is None or len(weights) == len(times)), \
+      "Error (15): The columns of the link stream must have equal lengths"
+    assert len(times) == 0 or times.dtype.kind in "iu", "Error (16): Timestamps must be integers, not {}".format(times.dtype)
+    if "O" in (us.dtype.kind, vs.dtype.kind) or (us.dtype.kind in "SU") != (vs.dtype.kind in "SU"):
+      # Identifiers of mixed types are compared as the tokens of a link stream file would be
+      us = us.astype(str)
+      vs = vs.astype(str)
+    self._links.clear()
+    self._nodes = self._links._nodes
+    self._infile = None
+    self._metrics.startPhase("read")
+    self._links.buildFromArrays(times, us, vs, None if weights is None else np.asarray(weights, dtype=np.float64))
+    self._metrics.stopPhase("read")
+
+  def loadLinkIterable(self, link_stream, weighted=False):
+    # Alternative to readLinkStream for link instances (t, u, v) or (t, u, v, w) produced by an iterable, e.g., a
+    # generator, which (as in a link stream file) must be ordered by time. Weights are ignored unless weighted is True.
+    self._links.clear()
+    self._nodes = self._links._nodes
+    self._infile = None
+    self._metrics.startPhase("read")
+    for link in link_stream:
+      u = self._links.parseNodeName(link[1])
+      v = self._links.parseNodeName(link[2])
+      if weighted:
+        self._links.addLinkInstance(int(link[0]), u, v, float(link[3]))
+      else:
+        self._links.addLinkInstance(int(link[0]), u, v)
+    self._links.finalize()
+    self._metrics.stopPhase("read")
+
+  def readLinkStreamRange(self, infile, begin, end, delimiter=" ", weighted=False):
+    # Reads only the link instances with timestamps in [begin, end] of a link stream text file ordered by time
+    assert os.path.isfile(infile), "Error (1): Invalid inputfile specified"
+    times, us, vs, weights = LinkStreamReader(infile, delimiter, weighted).parseRange(begin, end)
+    self.loadLinks(times, us, vs, weights)
+    self._infile = infile
+
+  def readBinaryLinkStream(self, infile, weighted):
+    header, _ = BinaryLinkStream().read(infile, self._links)
+    if weighted:
+      assert header["weighted"], "Error (7): Binary link stream file '{}' contains no weights".format(infile)
+    elif header["weighted"]:
+      self._links.setUnitWeights()
+
+  def readLinkStream(self, infile, delimiter=" ", weighted=False, cache=False):
     # Check if input file actually exists
     assert os.path.isfile(infile), "Error (1): Invalid inputfile specified"
     # Reset the various storage data structures
-    self._times.clear()
-    self._weights.clear()
-    self._nodes.clear()
+    self._links.clear()
+    self._nodes = self._links._nodes
+    self._infile = infile
+    self._metrics.startPhase("read")
+
+    # Binary link stream files are memory mapped directly
+    if BinaryLinkStream().isBinaryLinkStream(infile):
+      self.readBinaryLinkStream(infile, weighted)
+      self._metrics.stopPhase("read")
+      return
 
     # Open file to check valid format (based on first line) and whether weighted or not to call the appropriate function
     with open(infile) as inf:
@@ -532,29 +833,32 @@ class CliqueMaster:
         assert len(contents) >= 3, "Error (2): Too few columns. Expected format is '<timestamp> <node_identifier> <node_identifier> <optional weight>'"
         assert len(contents) < 5, "Error (3): Too many columns. Expected format is '<timestamp> <node_identifier> <node_identifier> <optional weight>'"
 
-    if weighted:
+    if cache:
+      self.readCachedLinkStream(infile, delimiter, weighted)
+    elif weighted:
       self.readWeightedLinkStream(infile, delimiter)
     else:
       self.readUnweightedLinkStream(infile, delimiter)
+    self._metrics.stopPhase("read")
 
   #############################################################################################
   # Stretch phase functions, with an O(m) guaranteed implementation
   #############################################################################################
 
-  def addStretchedClique(self, c):
+  def addStretchedClique(self, link, c):
     # Store the clique in the appropriate data structures
-    self._time_stretched[c._X].append(c)
-    self._tbMins[c._X].append(c._tbMin)
-    self._teMaxs[c._X].append(c._teMax)
-    # Determine shared neighbors and add clique to the relevant deque
-    c.setSharedNeighbors(self._nodes)
+    self._time_stretched[link].append(c)
+    self._tbMins[link].append(c._tbMin)
+    self._teMaxs[link].append(c._teMax)
+    # Add clique to the relevant deque, its shared neighbors are only determined once it is expanded (see findRootExpansions)
     self._S[c._latestX].append(c)
 
 
   def stretchRight(self, link, delta, gamma):
-    times = self._times[link]
-    weights = self._weights[link]
+    times = self._links.getTimes(link)
+    weights = self._links.getWeights(link)
     elems = len(times)
+    X = self._links.getLinkNodes(link)
 
     begin_index = 0
     end_index = 0
@@ -588,9 +892,9 @@ class CliqueMaster:
           begin_index += 1
         # If we have stretched as far as the final link instance, save Clique and return
         if end_index + 1 == elems:
-          c_new = Clique((link, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
-                         latest=self._nodeLabelling.maxLabelledNode(link))
-          self.addStretchedClique(c_new)
+          c_new = Clique((X, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
+                         latest=self._nodeLabelling.maxLabelledNode(X))
+          self.addStretchedClique(link, c_new)
           return
 
         # If indices did not move, check if from times[begin_index] + 1, we can still obtain a gamma weight again within delta time
@@ -603,15 +907,15 @@ class CliqueMaster:
             temp_end_index += 1
             # If not found while we have arrived at the final instance, store current Clique and finish search
             if temp_end_index == elems:
-              c_new = Clique((link, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
-                             latest=self._nodeLabelling.maxLabelledNode(link))
-              self.addStretchedClique(c_new)
+              c_new = Clique((X, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
+                             latest=self._nodeLabelling.maxLabelledNode(X))
+              self.addStretchedClique(link, c_new)
               return
             # If we exceed delta before achieving gamma weight, we store the current Clique and continue new search from begin_index + 1 (which may or may not be larger than times[begin_index] + 1, and set end_index to previous value for which we still checked that we were under gamma weight and within delta time)
             if times[temp_end_index] - temp_begin >= delta:
-              c_new = Clique((link, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
-                             latest=self._nodeLabelling.maxLabelledNode(link))
-              self.addStretchedClique(c_new)
+              c_new = Clique((X, (tb, times[end_index])), (tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1),
+                             latest=self._nodeLabelling.maxLabelledNode(X))
+              self.addStretchedClique(link, c_new)
               temp_end_index -= 1
               done = True
               break
@@ -622,60 +926,663 @@ class CliqueMaster:
           end_index = temp_end_index # Continue search for expansion beyond where was already searched
 
 
+  def addStretchedCliques(self, link, stretched):
+    # Create the cliques for the (tb, te, tbMin, tbMax, teMin, teMax) tuples determined by the StretchEngine
+    X = self._links.getLinkNodes(link)
+    latest = self._nodeLabelling.maxLabelledNode(X)
+    for (tb, te, tbMin, tbMax, teMin, teMax) in stretched:
+      self.addStretchedClique(link, Clique((X, (tb, te)), (tbMin, tbMax, teMin, teMax), latest=latest))
+
+  def stretchLinkRange(self, begin, end):
+    # Runs within a worker process, returning the borders of the stretched cliques of the links in [begin, end) as arrays
+    engine = self._stretch_engine
+    links = []
+    counts = []
+    borders = []
+    for link in range(begin, end):
+      if engine.hasNegativeWeights(link) or engine.totalWeight(link) < engine._gamma:
+        continue
+      stretched = engine.stretchLink(link)
+      links.append(link)
+      counts.append(len(stretched))
+      borders.extend(stretched)
+    return np.array(links, dtype=np.int64), np.array(counts, dtype=np.int64), np.array(borders, dtype=np.int64).reshape(-1, 6)
+
+  def parallelStretchPhase(self, delta, gamma):
+    global _parallel_master
+    engine = self._stretch_engine
+
+    # Divide the links over ranges holding a similar number of link instances
+    offsets = np.asarray(self._links._offsets)
+    num_links = self._links.numLinks()
+    bounds = np.searchsorted(offsets, np.linspace(0, offsets[-1], self._n_jobs * 16 + 1), side="right") - 1
+    bounds = sorted(set(np.clip(bounds, 0, num_links).tolist()) | {0, num_links})
+    tasks = list(zip(bounds[:-1], bounds[1:]))
+
+    _parallel_master = self
+    with multiprocessing.get_context("fork").Pool(self._n_jobs) as pool:
+      # Results are inserted in link order, such that all data structures are identical to those of the serial stretch phase
+      for ((begin, end), (links, counts, borders)) in zip(tasks, pool.imap(stretchPhaseWorker, tasks)):
+        index = 0
+        position = 0
+        for link in range(begin, end):
+          if engine.hasNegativeWeights(link):
+            if sum(self._links.getWeights(link)) >= gamma:
+              self.stretchRight(link, delta, gamma)
+          elif index < len(links) and links[index] == link:
+            self.addStretchedCliques(link, borders[position:position + counts[index]].tolist())
+            position += counts[index]
+            index += 1
+    _parallel_master = None
+
+  def getStretchEngine(self, delta, gamma):
+    if self._stretch_engine is None:
+      self._stretch_engine = StretchEngine(self._links, delta, gamma)
+    else:
+      self._stretch_engine.setParameters(delta, gamma)
+    return self._stretch_engine
+
   def stretchPhase(self, delta, gamma):
+    self.clearWindowCache()
     # If delta is 0 we are looking for static cliques only, so no growth in time spans possible
-    if delta > 0:
-      for link in self._times.keys():
+    if delta > 0 and self._n_jobs > 1:
+      self.getStretchEngine(delta, gamma)
+      self.parallelStretchPhase(delta, gamma)
+    elif delta > 0:
+      engine = self.getStretchEngine(delta, gamma)
+      for link in range(self._links.numLinks()):
+        # Links with negative weights are stretched one link instance at a time
+        if engine.hasNegativeWeights(link):
+          if sum(self._links.getWeights(link)) >= gamma:
+            self.stretchRight(link, delta, gamma)
+          continue
         # Skip any links whose total weight is smaller than gamma
-        if sum(self._weights[link]) < gamma:
+        if engine.totalWeight(link) < gamma:
           continue
-        # Continuously Stretch to the right as far as possible to form all delta-maximal size 2 cliques for this link
-        self.stretchRight(link, delta, gamma)
-    self._weights.clear() # Free up this memory as we no longer need to consider it for the bulk phase
+        # Stretch to the right as far as possible to form all delta-maximal size 2 cliques for this link
+        self.addStretchedCliques(link, engine.stretchLink(link))
+    if not self._reuse_stretch_data:
+      self._stretch_engine = None
+      self._links.releaseWeights() # Free up this memory as we no longer need to consider it for the bulk phase
+
+  #############################################################################################
+  # Node ordering functions
+  #############################################################################################
+
+  def setNodeOrdering(self, strategy, seed=None):
+    # Strategy used to label the nodes (see CustomNodeLabelling)
+    self._nodeLabelling = CustomNodeLabelling(strategy, seed)
+
+  def getNodeActivity(self):
+    # Number of link instances per (dense) node id
+    counts = np.diff(np.asarray(self._links._offsets))
+    activity = np.bincount(np.asarray(self._links._link_u, dtype=np.int64), weights=counts, minlength=self._links.numNodes()) + \
+               np.bincount(np.asarray(self._links._link_v, dtype=np.int64), weights=counts, minlength=self._links.numNodes())
+    return activity.astype(np.int64).tolist()
+
+  def createNodeLabelling(self):
+    self._higher_shared = array('i') # The counts depend on the labels
+    if self._nodeLabelling.getStrategy() == "activity":
+      self._nodeLabelling.createNodeLabelling(self._nodes, self.getNodeActivity())
+    else:
+      self._nodeLabelling.createNodeLabelling(self._nodes)
+
+  def compareNodeOrderings(self, delta, gamma, strategies, seed=None):
+    # Enumerates the (delta,gamma)-maximal cliques once for every node ordering strategy, returning the runtime, the
+    # number of cliques and the counters of the bulk phase (iterations and cut branches) of each, such that the
+    # ordering requiring the least work for a link stream can be chosen. The cliques found are not retained.
+    summary = []
+    labelling = self._nodeLabelling
+    retain_cliques = self._retain_cliques
+    self._reuse_stretch_data = True
+    self._retain_cliques = False
+    try:
+      for strategy in strategies:
+        self.resetEnumeration()
+        self.setNodeOrdering(strategy, seed)
+        start_time = timeit.default_timer()
+        self.enumerateDeltaGammaCliques(delta, gamma)
+        stop_time = timeit.default_timer()
+        summary.append((strategy, stop_time - start_time, self.numResultCliques(), self.getCounters()))
+    finally:
+      self.resetEnumeration()
+      self._nodeLabelling = labelling
+      self._retain_cliques = retain_cliques
+      self._reuse_stretch_data = False
+      self._stretch_engine = None
+    return summary
 
   #############################################################################################
   # Delta gamma enumeration functions
   #############################################################################################
 
-  def enumerateDeltaGammaCliques(self, delta, gamma):
-    print("Create node labelling...", end='\r')
-    start_time = timeit.default_timer()
-    self._nodeLabelling.createNodeLabelling(self._nodes)
-    stop_time = timeit.default_timer()
-    print("Create node labelling... completed in {} seconds".format(stop_time - start_time))
+  def enumerateDeltaGammaCliques(self, delta, gamma, create_labelling=True):
+    # Links with negative weights are stretched by stretchRight, whose stretched cliques may depend on the link
+    # instances before a gap, hence such link streams are not segmented
+    if self._segmented and self._checkpoint is None and not np.any(np.asarray(self._links._weights) < 0):
+      segments = self.findSegments(delta)
+      if len(segments) > 1:
+        self.enumerateSegments(delta, gamma, segments)
+        self.writeMetrics("enumerate", delta, gamma)
+        return
+
+    if create_labelling:
+      print("Create node labelling...", end='\r')
+      self._metrics.startPhase("labelling")
+      self.createNodeLabelling()
+      print("Create node labelling... completed in {} seconds".format(self._metrics.stopPhase("labelling")))
 
     print("Stretch phase...", end='\r')
-    start_time = timeit.default_timer()
-    self.stretchPhase(delta, gamma)
-    stop_time = timeit.default_timer()
-    print("Stretch phase... completed in {} seconds".format(stop_time - start_time))
+    self._metrics.startPhase("stretch")
+    self.checkpointedStretchPhase(delta, gamma)
+    print("Stretch phase... completed in {} seconds".format(self._metrics.stopPhase("stretch")))
+    self.setStretchMetrics()
 
     if self._verbose:
-      total_stretched_cliques = 0
-      for key, values in self._S.items():
-        total_stretched_cliques += len(values)
-      print("Total duration-wise maximal 2-node (delta,gamma)-cliques found: {}".format(total_stretched_cliques))
+      print("Total duration-wise maximal 2-node (delta,gamma)-cliques found: {}".format(self._metrics.getValues()["stretched_cliques"]))
 
     print("Bulk phase...")
-    start_time = timeit.default_timer()
+    self._metrics.startPhase("bulk")
     self.bulkPhase(delta)
-    stop_time = timeit.default_timer()
-    print("Bulk phase... completed in {} seconds".format(stop_time - start_time))
-    print("Time spent on expansion computation: {} seconds".format(self._profiling_expansions))
-    print("Time spent on drop evaluation: {} seconds".format(self._profiling_drop))
-    print("Time spent on drop new neigbhor link evaluation: {} seconds".format(self._profiling_drop_nl))
-    print("Number of times cuts applied/not applied due to new neigbhor link evaluation: {}/{}".format(self._profiling_drop_nl_counter_yes, self._profiling_drop_nl_counter_no))
+    print("Bulk phase... completed in {} seconds".format(self._metrics.stopPhase("bulk")))
+    if self._profile:
+      print("Time spent on expansion computation: {} seconds".format(self._profiling_expansions))
+      print("Time spent on drop evaluation: {} seconds".format(self._profiling_drop))
+      print("Time spent on drop new neigbhor link evaluation: {} seconds".format(self._profiling_drop_nl))
+      print("Number of times cuts applied/not applied due to new neigbhor link evaluation: {}/{}".format(self._profiling_drop_nl_counter_yes, self._profiling_drop_nl_counter_no))
+    self.updateWindowCacheCounters()
+    print("Stretched clique window cache hits/misses: {}/{}".format(self._window_cache_hits, self._window_cache_misses))
+    self.writeMetrics("enumerate", delta, gamma)
 
     #return self._R
 
+  #############################################################################################
+  # Segmented enumeration functions
+  #############################################################################################
+
+  def setSegmentation(self, segmented):
+    # If True, enumerateDeltaGammaCliques splits the link stream at every gap of over delta (see findSegments) and
+    # enumerates the segments independently (divided over the worker processes if n_jobs > 1). Segmentation is not
+    # used when checkpointing, for link streams with negative weights, nor by iterDeltaGammaCliques and
+    # updateDeltaGammaCliques.
+    self._segmented = segmented
+
+  def findSegments(self, delta):
+    # Time ranges (begin, end) of the segments of the link stream, split wherever consecutive timestamps are more than
+    # delta apart, i.e., wherever no link instance occurs for at least delta time units. The link instances of a
+    # (delta,gamma)-clique cannot be separated by such a gap, nor can any of its timespan borders reach across it, hence
+    # the (delta,gamma)-maximal cliques of the link stream are exactly those of its segments.
+    times = np.unique(np.asarray(self._links._times, dtype=np.int64))
+    if len(times) == 0:
+      return []
+    gaps = np.nonzero(np.diff(times) > delta)[0]
+    begins = np.concatenate([times[:1], times[gaps + 1]])
+    ends = np.concatenate([times[gaps], times[-1:]])
+    return list(zip(begins.tolist(), ends.tolist()))
+
+  def enumerateSegments(self, delta, gamma, segments):
+    global _parallel_master
+    assert len(self._links._weights) == len(self._links._times), "Error (17): Cannot segment a link stream whose weights were released"
+    print("Segmented enumeration ({} segments)...".format(len(segments)), end='\r')
+    self._metrics.startPhase("segments")
+
+    # Order the link instances (in terms of the dense node ids) by time, such that each segment is a slice of these
+    times = np.asarray(self._links._times, dtype=np.int64)
+    offsets = np.asarray(self._links._offsets, dtype=np.int64)
+    link_of = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+    order = np.argsort(times, kind="stable")
+    self._segment_columns = (times[order], np.asarray(self._links._link_u, dtype=np.int64)[link_of[order]],
+                             np.asarray(self._links._link_v, dtype=np.int64)[link_of[order]],
+                             np.asarray(self._links._weights, dtype=np.float64)[order])
+    self._segments = segments
+
+    # Divide the segments over ranges holding a similar number of link instances
+    bounds = np.searchsorted(np.searchsorted(self._segment_columns[0], [end for (begin, end) in segments], side="right"),
+                             np.linspace(0, len(times), self._n_jobs * 16 + 1), side="left")
+    bounds = sorted(set(np.clip(bounds, 0, len(segments)).tolist()) | {0, len(segments)})
+    tasks = [(delta, gamma, begin, end) for (begin, end) in zip(bounds[:-1], bounds[1:])]
+
+    stretched_cliques = 0
+    roots = 0
+    _parallel_master = self
+    try:
+      if self._n_jobs > 1:
+        with multiprocessing.get_context("fork").Pool(self._n_jobs) as pool:
+          results = list(pool.imap(segmentWorker, tasks))
+      else:
+        results = [segmentWorker(task) for task in tasks]
+    finally:
+      _parallel_master = None
+      self._segments = []
+      self._segment_columns = None
+
+    # The results are concatenated in time order
+    for (R, counters, values) in results:
+      for c in R:
+        self.storeResultClique(c)
+      for (name, value) in counters.items():
+        setattr(self, name, getattr(self, name) + value)
+      stretched_cliques += values[0]
+      roots += values[1]
+    self._metrics.setValue("segments", len(segments))
+    self._metrics.setValue("stretched_cliques", stretched_cliques)
+    self._metrics.setValue("roots", roots)
+    print("Segmented enumeration ({} segments)... completed in {} seconds".format(len(segments), self._metrics.stopPhase("segments")))
+    sys.stdout.write("Found {} unique maximal, {} processed, {} iter, {} main cut, {} sub cut, {} sub dupl\n".format(self.numResultCliques(), roots, self._iternum, self._cut_main_branches_counter, self._cut_sub_branches_counter, self._cut_duplicate_branches_counter))
+
+  def enumerateSegmentRange(self, delta, gamma, begin, end):
+    # Enumerates the segments in [begin, end) by a CliqueMaster of their own, which is given the dense node ids of this
+    # link stream and yields the cliques in terms of the original node identifiers. Returns the cliques found, the
+    # counters, and the number of stretched cliques and roots.
+    (times, us, vs, weights) = self._segment_columns
+    first = np.searchsorted(times, self._segments[begin][0], side="left")
+    last = np.searchsorted(times, self._segments[end - 1][1], side="right")
+    segment = CliqueMaster(False)
+    segment._nodeLabelling = CustomNodeLabelling(self._nodeLabelling.getStrategy(), self._nodeLabelling.getSeed())
+    segment.setProfiling(self._profile)
+    segment.loadLinks(times[first:last], us[first:last], vs[first:last], weights[first:last])
+    names = [segment._links.getNodeName(node) for node in range(segment._links.numNodes())]
+    segment._links.setNodeNames([None if name is None else self._links.getNodeName(name) for name in names])
+    segment.createNodeLabelling()
+    segment.stretchPhase(delta, gamma)
+    values = (sum(len(cliques) for cliques in segment._time_stretched.values()), sum(len(S) for S in segment._S.values()))
+    segment.orderRoots()
+    (_, R, counters) = segment.bulkPhaseRange(delta, 0, len(segment._roots))
+    return R, counters, values
+
+  #############################################################################################
+  # Chunked enumeration functions
+  #############################################################################################
+
+  def findChunks(self, infile, chunk_length, delimiter=" "):
+    # Consecutive time ranges [begin, end) of chunk_length covering the link stream text file (ordered by time)
+    assert chunk_length > 0, "Error (18): The chunk length must be positive"
+    (first, last) = LinkStreamReader(infile, delimiter).timeRange()
+    return [(begin, min(begin + chunk_length, last + 1)) for begin in range(first, last + 1, chunk_length)]
+
+  def enumerateChunk(self, infile, delta, gamma, begin, end, delimiter=" ", weighted=False):
+    # Enumerates the (delta,gamma)-maximal cliques starting (tb) in [begin, end) of a link stream text file ordered by
+    # time, for which only the link instances within a window around [begin, end) are read. A clique only depends on
+    # the link instances within delta of its timespan, hence the window starts 2 * delta before begin, and ends at
+    # least 2 * delta after the end of every stretched 2-node clique starting before end (which bounds the timespans of
+    # the cliques kept). Whenever a stretched clique reaches too close to the end of the window, as it may continue
+    # beyond it, the window is doubled. The cliques of consecutive chunks thus partition those of a full run.
+    margin = 2 * delta
+    last = LinkStreamReader(infile, delimiter, weighted).timeRange()[1]
+    window_end = end + margin
+    while True:
+      self.resetEnumeration()
+      self.readLinkStreamRange(infile, begin - margin, window_end, delimiter, weighted)
+      # Links with negative weights are stretched by stretchRight, whose stretched cliques may depend on the link
+      # instances before the window
+      assert not np.any(np.asarray(self._links._weights) < 0), "Error (19): Chunked enumeration requires non-negative weights"
+      self.createNodeLabelling()
+      self.stretchPhase(delta, gamma)
+      reach = max((c._te for cliques in self._time_stretched.values() for c in cliques if c._tb < end), default=begin)
+      if reach + margin <= window_end or window_end >= last:
+        break
+      window_end = max(reach + margin, end + 2 * (window_end - end))
+    self._metrics.setValue("window", (begin - margin, window_end))
+    self.setStretchMetrics()
+
+    retain_cliques = self._retain_cliques
+    output_sink = self._output_sink
+    self.setOutputSink(None)
+    try:
+      self.bulkPhase(delta)
+    finally:
+      self.setOutputSink(output_sink, retain_cliques)
+    # Keep only the cliques starting in this chunk, as the others are found (with their full timespan) by other chunks
+    self._R = set(c for c in self._R if begin <= c._tb < end)
+
+  def enumerateChunks(self, infile, delta, gamma, chunk_length, delimiter=" ", weighted=False):
+    # Enumerates the (delta,gamma)-maximal cliques of a link stream text file ordered by time, in consecutive chunks of
+    # chunk_length time units (see enumerateChunk), such that the link stream is never held in memory as a whole. Every
+    # chunk is enumerated in a worker process of its own (n_jobs at a time), after which their cliques are merged.
+    global _parallel_master
+    self._infile = infile
+    chunks = self.findChunks(infile, chunk_length, delimiter)
+    print("Chunked enumeration ({} chunks)...".format(len(chunks)), end='\r')
+    self._metrics.startPhase("chunks")
+    tasks = [(infile, delta, gamma, begin, end, delimiter, weighted) for (begin, end) in chunks]
+    stretched_cliques = 0
+    roots = 0
+    _parallel_master = self
+    try:
+      with multiprocessing.get_context("fork").Pool(self._n_jobs, maxtasksperchild=1) as pool:
+        for (R, counters, values) in pool.imap(chunkWorker, tasks):
+          for c in R:
+            self.storeResultClique(c)
+          for (name, value) in counters.items():
+            setattr(self, name, getattr(self, name) + value)
+          stretched_cliques += values["stretched_cliques"]
+          roots += values["roots"]
+    finally:
+      _parallel_master = None
+    self._metrics.setValue("chunks", len(chunks))
+    self._metrics.setValue("stretched_cliques", stretched_cliques)
+    self._metrics.setValue("roots", roots)
+    print("Chunked enumeration ({} chunks)... completed in {} seconds".format(len(chunks), self._metrics.stopPhase("chunks")))
+    self.writeMetrics("enumerate", delta, gamma)
+
+  def setStretchMetrics(self):
+    self._metrics.setValue("stretched_cliques", sum(len(cliques) for cliques in self._time_stretched.values()))
+    self._metrics.setValue("roots", sum(len(S) for S in self._S.values()))
+
+  def setMetricsFile(self, metricsfile):
+    # Append the metrics of every enumeration (or update) as a JSON line to metricsfile
+    self._metricsfile = metricsfile
+
+  def getMetrics(self, mode, delta, gamma):
+    metrics = {"mode": mode, "delta": delta, "gamma": gamma, "n_jobs": self._n_jobs, "ordering": self._nodeLabelling.getStrategy(),
+               "input": {"file": self._infile, "nodes": len(self._nodes), "links": self._links.numLinks(), "instances": self._links.numInstances()},
+               "phases": self._metrics.getPhases(), "counters": self.getCounters(), "cliques": self.numResultCliques()}
+    metrics.update(self._metrics.getValues())
+    return metrics
+
+  def writeMetrics(self, mode, delta, gamma):
+    if self._metricsfile is not None:
+      self._metrics.write(self._metricsfile, self.getMetrics(mode, delta, gamma))
+
+  def resetEnumeration(self):
+    # Clears the results of a previous enumeration, while keeping the link stream and node labelling
+    self._time_stretched.clear()
+    self._tbMins.clear()
+    self._teMaxs.clear()
+    self._higher_shared = array('i')
+    self.clearWindowCache()
+    self._S.clear()
+    self._D = set()
+    self._roots = []
+    self._R = set()
+    for name in self.getCounters():
+      setattr(self, name, 0)
+    self._emitted_counter = 0
+
+  def sweepDeltaGammaCliques(self, deltas, gammas, outputfile_format, compression=None, stream=False):
+    # Enumerates the (delta,gamma)-maximal cliques for every combination of deltas and gammas, for which the link
+    # stream is read and the node labelling is created only once. The prefix sums of the stretch phase are shared by
+    # all combinations, and the delta windows by all gammas of the same delta. The cliques of each combination are
+    # written to outputfile_format.format(delta, gamma), and the runtime and number of cliques of each are returned.
+    summary = []
+    self._metrics.startPhase("labelling")
+    self.createNodeLabelling()
+    self._metrics.stopPhase("labelling")
+    self._reuse_stretch_data = True
+    try:
+      for delta in deltas:
+        for gamma in gammas:
+          start_time = timeit.default_timer()
+          outputfile = outputfile_format.format(delta, gamma)
+          self.resetEnumeration()
+          if stream:
+            writer = CliqueWriter(outputfile, compression)
+            self.setOutputSink(writer, retain=False)
+          self.enumerateDeltaGammaCliques(delta, gamma, create_labelling=False)
+          stop_time = timeit.default_timer()
+          num_cliques = self.numResultCliques()
+          if stream:
+            writer.close()
+            self.setOutputSink(None)
+          else:
+            self.printCliques(outputfile, compression)
+          summary.append((delta, gamma, stop_time - start_time, num_cliques))
+    finally:
+      self._reuse_stretch_data = False
+      self._stretch_engine = None
+    return summary
+
+  def iterDeltaGammaCliques(self, delta, gamma):
+    # Lazily enumerates the (delta,gamma)-maximal cliques, which are not stored in self._R. The node labelling and
+    # stretch phase are completed upon retrieving the first clique, after which the bulk phase only progresses as far
+    # as needed to yield the next clique, such that stopping the iteration early also stops the enumeration.
+    self.createNodeLabelling()
+    self.checkpointedStretchPhase(delta, gamma)
+    retain_cliques = self._retain_cliques
+    self._retain_cliques = False
+    try:
+      yield from self.iterBulkPhase(delta)
+    finally:
+      self._retain_cliques = retain_cliques
+
+  #############################################################################################
+  # Checkpoint functions
+  #############################################################################################
+
+  def setCheckpoint(self, checkpointfile, interval=300, resume=False):
+    # Periodically (at most every interval seconds, in between roots) write the progress of the bulk phase to
+    # checkpointfile. If resume is True and the checkpoint exists, the enumeration continues from its last record.
+    self._checkpoint = BulkCheckpoint(checkpointfile, interval)
+    self._resume = resume and self._checkpoint.exists()
+
+  def getCheckpointParameters(self, delta, gamma):
+    return {"delta": delta, "gamma": gamma, "n_jobs": self._n_jobs, "links": self._links.numLinks(), "instances": self._links.numInstances(),
+            "ordering": self._nodeLabelling.getStrategy(), "seed": self._nodeLabelling.getSeed()}
+
+  def createCheckpoint(self, delta, gamma):
+    (counts, borders) = self.getStretchedArrays()
+    self._checkpoint.create(self.getCheckpointParameters(delta, gamma), counts, borders)
+    self._checkpoint_pruned = []
+    self._checkpoint_cliques = []
+
+  def writeCheckpoint(self, record):
+    record["pruned"] = [sorted(c._X) + [c._tb, c._te] for c in self._checkpoint_pruned]
+    record["cliques"] = [self.cliqueToList(c) for c in self._checkpoint_cliques]
+    record["counters"] = self.getCounters()
+    self._checkpoint.append(record)
+    self._checkpoint_pruned = []
+    self._checkpoint_cliques = []
+
+  def checkpointedStretchPhase(self, delta, gamma):
+    if self._resume:
+      self.resumeStretchPhase(delta, gamma)
+    else:
+      self.stretchPhase(delta, gamma)
+      if self._checkpoint is not None:
+        self.createCheckpoint(delta, gamma)
+
+  def resumeStretchPhase(self, delta, gamma):
+    # Restores the stretch phase results of the checkpoint, in the same order as they were found
+    (parameters, self._checkpoint_records) = self._checkpoint.readRecords()
+    assert parameters == self.getCheckpointParameters(delta, gamma), "Error (12): Checkpoint was created for a different link stream or parameters ({})".format(parameters)
+    stretched = self.stretchedBordersFromArrays(*self._checkpoint.readStretched())
+    self.clearWindowCache()
+    for link in range(self._links.numLinks()):
+      if link in stretched:
+        self.addStretchedCliques(link, stretched[link])
+    if not self._reuse_stretch_data:
+      self._links.releaseWeights()
+
+  def resumeCheckpoint(self):
+    # Restores the pruned roots, counters and cliques of the checkpoint records, yielding these cliques
+    for record in self._checkpoint_records:
+      for (u, v, tb, te) in record["pruned"]:
+        self._D.add(Clique((frozenset([u, v]), (tb, te))))
+      for (name, value) in record["counters"].items():
+        setattr(self, name, value)
+      for values in record["cliques"]:
+        c = self.cliqueFromList(values)
+        self._emitted_counter += 1
+        if self._output_sink is not None:
+          self._output_sink.write(c)
+        if self._retain_cliques:
+          self._R.add(c)
+        yield c
+    self._checkpoint_records = []
+
+  #############################################################################################
+  # Incremental enumeration functions
+  #############################################################################################
+
+  def setReuseStretchData(self, reuse):
+    # Keep the weights after the stretch phase, as is required to save the state for incremental enumeration
+    self._reuse_stretch_data = reuse
+
+  def getStretchedBorders(self):
+    if self._stored_stretched is not None:
+      return self._stored_stretched
+    return {link: [(c._tb, c._te, c._tbMin, c._tbMax, c._teMin, c._teMax) for c in cliques] for (link, cliques) in self._time_stretched.items()}
+
+  def getStretchedArrays(self):
+    # Returns the number of stretched cliques per link and their (tb, te, tbMin, tbMax, teMin, teMax) as arrays
+    stretched = self.getStretchedBorders()
+    counts = np.array([len(stretched.get(link, [])) for link in range(self._links.numLinks())], dtype=np.int64)
+    borders = np.array([b for link in range(self._links.numLinks()) for b in stretched.get(link, [])], dtype=np.int64).reshape(-1, 6)
+    return counts, borders
+
+  def stretchedBordersFromArrays(self, counts, borders):
+    stretched = dict()
+    borders = borders.tolist()
+    position = 0
+    for (link, count) in enumerate(counts.tolist()):
+      if count > 0:
+        stretched[link] = [tuple(b) for b in borders[position:position + count]]
+      position += count
+    return stretched
+
+  def cliqueToList(self, c):
+    # JSON serializable form of a maximal clique (in terms of the original node identifiers)
+    return [sorted(c._X, key=str), c._tb, c._te, c._tbMin, c._tbMax, c._teMin, c._teMax]
+
+  def cliqueFromList(self, values):
+    (X, tb, te, tbMin, tbMax, teMin, teMax) = values
+    return Clique((frozenset(X), (tb, te)), (tbMin, tbMax, teMin, teMax))
+
+  def saveState(self, statefile, delta, gamma):
+    # Stores the link stream (in the BinaryLinkStream format), the stretched cliques of all links (in statefile.npz) and
+    # the maximal cliques found, such that appended link instances can be processed by updateDeltaGammaCliques
+    (counts, borders) = self.getStretchedArrays()
+    horizon = int(np.max(self._links._times))
+    cliques = [self.cliqueToList(c) for c in self._R]
+    np.savez(statefile + ".npz", counts=counts, borders=borders)
+    BinaryLinkStream().write(statefile, self._links, True, {"state": {"delta": delta, "gamma": gamma, "horizon": horizon, "cliques": cliques}})
+    self._state = (delta, gamma, horizon)
+
+  def loadState(self, statefile):
+    assert os.path.isfile(statefile), "Error (1): Invalid inputfile specified"
+    self._links.clear()
+    self._nodes = self._links._nodes
+    self._infile = statefile
+    (_, meta) = BinaryLinkStream().read(statefile, self._links)
+    state = meta["state"]
+    self._state = (state["delta"], state["gamma"], state["horizon"])
+
+    stored = np.load(statefile + ".npz")
+    self._stored_stretched = self.stretchedBordersFromArrays(stored["counts"], stored["borders"])
+
+    self.resetEnumeration()
+    for values in state["cliques"]:
+      self._R.add(self.cliqueFromList(values))
+    return state["delta"], state["gamma"]
+
+  def updateDeltaGammaCliques(self, times, u_names, v_names, weights=None):
+    # Appends link instances, with timestamps at or after the horizon (latest timestamp) of the loaded state, and
+    # updates the maximal cliques accordingly. Only the links to which instances are appended are stretched again.
+    # Cliques that ended more than delta before the horizon cannot be extended by (or be part of larger cliques with)
+    # the appended instances and are final. All other cliques are found by rerunning the bulk phase for the roots
+    # which end (at te, or teMax if that is later) at or after the point delta before the horizon, as the cliques found
+    # from a root do not end after it.
+    (delta, gamma, horizon) = self._state
+    times = np.asarray(times, dtype=np.int64)
+    assert len(times) == 0 or times.min() >= horizon, "Error (11): Appended link instances must have timestamps at or after {}".format(horizon)
+    threshold = horizon - delta
+
+    stored = self.getStretchedBorders()
+    final = [c for c in self._R if c._te < threshold]
+    affected = set(self._links.appendInstances(times, u_names, v_names, weights))
+
+    print("Create node labelling...", end='\r')
+    self._metrics.startPhase("labelling")
+    self.createNodeLabelling()
+    print("Create node labelling... completed in {} seconds".format(self._metrics.stopPhase("labelling")))
+
+    print("Stretch phase ({} links)...".format(len(affected)), end='\r')
+    self._metrics.startPhase("stretch")
+    self.resetEnumeration()
+    engine = StretchEngine(self._links, delta, gamma)
+    full_rerun = False
+    for link in range(self._links.numLinks()):
+      if link not in affected:
+        self.addStretchedCliques(link, stored.get(link, []))
+        continue
+      if engine.hasNegativeWeights(link):
+        # Links whose total weight drops below (or rises above) gamma lose (or gain) all of their stretched cliques,
+        # which with negative weights may also change cliques before the threshold, hence no cliques are final then
+        full_rerun = True
+        if sum(self._links.getWeights(link)) >= gamma:
+          self.stretchRight(link, delta, gamma)
+      elif engine.totalWeight(link) >= gamma:
+        self.addStretchedCliques(link, engine.stretchLink(link))
+    self._stored_stretched = None
+    if full_rerun:
+      final = []
+    else:
+      # Only the roots which may reach the appended instances are processed by the bulk phase
+      for maxX in list(self._S.keys()):
+        self._S[maxX] = deque(c for c in self._S[maxX] if max(c._te, c._teMax) >= threshold)
+    print("Stretch phase ({} links)... completed in {} seconds".format(len(affected), self._metrics.stopPhase("stretch")))
+    self.setStretchMetrics()
+
+    print("Bulk phase...")
+    self._metrics.startPhase("bulk")
+    self.bulkPhase(delta)
+    if self._retain_cliques:
+      self._R.update(final)
+    print("Bulk phase... completed in {} seconds".format(self._metrics.stopPhase("bulk")))
+
+    self._state = (delta, gamma, int(np.max(self._links._times)))
+    self.writeMetrics("update", delta, gamma)
+
+  def updateFromLinkStream(self, infile, delimiter=" ", weighted=False):
+    # Reads the appended link instances from a link stream file (in the same format as readLinkStream) and updates the
+    # maximal cliques of the loaded state
+    assert os.path.isfile(infile), "Error (1): Invalid inputfile specified"
+    (times, us, vs, weights) = LinkStreamReader(infile, delimiter, weighted).parseColumns()
+    u_names = [self._links.parseNodeName(u) for u in us.tolist()] if us.dtype.kind == "S" else us.tolist()
+    v_names = [self._links.parseNodeName(v) for v in vs.tolist()] if vs.dtype.kind == "S" else vs.tolist()
+    self.updateDeltaGammaCliques(times, u_names, v_names, weights)
+
   #############################################################################################
   # Clique output/printing related functions
   #############################################################################################
 
-  def printCliques(self, outputfile):
-    with open(outputfile, 'w') as out:
-      for c in list(self._R):
-        out.write(str(c) + "\n")
+  def setOutputSink(self, sink, retain=True):
+    # Write each maximal clique to sink (e.g. a CliqueWriter) as soon as it is found. If retain is False the cliques
+    # are no longer stored in self._R, such that memory use does not grow with the number of cliques found. Note that
+    # self._R also removes duplicates, which may occur when the bulk phase is run in parallel.
+    self._output_sink = sink
+    self._retain_cliques = retain
+
+  def numResultCliques(self):
+    if self._retain_cliques:
+      return len(self._R)
+    return self._emitted_counter
+
+  def addResultClique(self, c):
+    # Store the clique in terms of the original node identifiers, which (for most link streams of integer node
+    # identifiers) are the node ids themselves, in which case the clique is stored as is rather than copied
+    if not self._links.namesAreIds():
+      X = frozenset([self._links.getNodeName(x) for x in c._X])
+      c = Clique((X, (c._tb, c._te)), (c._tbMin, c._tbMax, c._teMin, c._teMax))
+    self.storeResultClique(c)
+
+  def storeResultClique(self, c):
+    # Store a clique which is already in terms of the original node identifiers
+    self._emitted_counter += 1
+    if self._emitted is not None:
+      self._emitted.append(c)
+    if self._checkpoint is not None:
+      self._checkpoint_cliques.append(c)
+    if self._output_sink is not None:
+      self._output_sink.write(c)
+    if self._retain_cliques:
+      self._R.add(c)
+
+  def printCliques(self, outputfile, compression=None):
+    writer = CliqueWriter(outputfile, compression)
+    for c in list(self._R):
+      writer.write(c)
+    writer.close()
 
   def __str__(self):
     msg = ""
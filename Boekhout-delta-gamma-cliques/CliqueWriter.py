@@ -0,0 +1,64 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import gzip
+import io
+import timeit
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None
+
+
+# Buffered writer of cliques (one clique per line, formatted as by Clique.__str__), which flushes its buffer to the
+# output file once it holds buffer_size cliques or flush_interval seconds have passed since the previous flush.
+# The output may optionally be compressed using gzip or zstd (the latter requires the zstandard package).
+class CliqueWriter:
+
+  def __init__(self, outputfile, compression=None, buffer_size=10000, flush_interval=10):
+    self._outputfile = outputfile
+    self._buffer = []
+    self._buffer_size = buffer_size
+    self._flush_interval = flush_interval
+    self._last_flush = timeit.default_timer()
+    self._count = 0
+
+    if compression in [None, "", "none"]:
+      self._out = open(outputfile, 'w')
+    elif compression == "gzip":
+      self._out = gzip.open(outputfile, 'wt')
+    elif compression == "zstd":
+      assert zstandard is not None, "Error (8): zstd compression requires the zstandard package"
+      self._out = io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(outputfile, 'wb')), encoding="utf-8")
+    else:
+      assert False, "Error (9): Unknown compression '{}', expected one of 'none', 'gzip' or 'zstd'".format(compression)
+
+  def write(self, c):
+    self._buffer.append(str(c))
+    self._count += 1
+    if len(self._buffer) >= self._buffer_size or timeit.default_timer() - self._last_flush >= self._flush_interval:
+      self.flush()
+
+  def flush(self):
+    if self._buffer:
+      self._out.write("\n".join(self._buffer) + "\n")
+      self._buffer = []
+    self._out.flush()
+    self._last_flush = timeit.default_timer()
+
+  def close(self):
+    self.flush()
+    self._out.close()
+
+  def getCount(self):
+    return self._count
@@ -10,23 +10,175 @@ The above copyright notice and this permission notice shall be included in all c
 THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
 """
 
+import bisect
+import heapq
+import random
+
+
+# Nodes are labelled in the order given by the strategy, which determines the branching of the bulk phase and how many
+# duplicate branches are cut:
+#   degree:     ascending number of neighbors
+#   degeneracy: order in which nodes of minimum remaining degree are removed (ascending core number)
+#   activity:   ascending number of link instances of the node (requires these activity counts)
+#   random:     random order (using seed)
+#
+# Besides the labels, shared neighbors are stored as bitsets (Python ints), such that these are found by a bitwise AND,
+# and iterating over the set bits yields nodes in the order of their labels. As every clique expanding a root only has
+# shared neighbors among those of the root, the bitsets are relative to the shared neighbors of the root being expanded
+# (see setRootNeighbors): bit i is set if the shared neighbor of the root with the i-th smallest label is included. A
+# bitset thus takes at most one bit per shared neighbor of the root, rather than one bit per node of the link stream,
+# and the bitsets of the neighbors of a node are only determined for the root at hand.
 class CustomNodeLabelling:
 
-  def __init__(self):
+  strategies = ["degree", "degeneracy", "activity", "random"]
+
+  def __init__(self, strategy="degree", seed=None):
+    assert strategy in self.strategies, "Error (13): Unknown node ordering '{}', expected one of {}".format(strategy, ", ".join(self.strategies))
+    self._strategy = strategy
+    self._seed = seed
     self._nodelabels = dict()
+    self._labelled_nodes = [] # Nodes indexed by their label
+    self._nodes = dict() # Neighbors of each node
+    self.setRootNeighbors([])
+
+  def getStrategy(self):
+    return self._strategy
 
-  def createNodeLabelling(self, nodes):
-    sorted_nodes = sorted(nodes, key=lambda key: len(nodes[key]))
+  def getSeed(self):
+    return self._seed
+
+  def createNodeLabelling(self, nodes, activity=None):
+    if self._strategy == "degeneracy":
+      sorted_nodes = self.degeneracyOrder(nodes)
+    elif self._strategy == "activity":
+      assert activity is not None, "Error (14): The activity node ordering requires the number of link instances per node"
+      sorted_nodes = sorted(nodes, key=lambda key: activity[key])
+    elif self._strategy == "random":
+      sorted_nodes = list(nodes)
+      random.Random(self._seed).shuffle(sorted_nodes)
+    else:
+      sorted_nodes = sorted(nodes, key=lambda key: len(nodes[key]))
     current_max_label = 0
     for node in sorted_nodes:
       self._nodelabels[node] = current_max_label
       current_max_label += 1
+    self._labelled_nodes = sorted_nodes
+    self._nodes = nodes
+    self.setRootNeighbors([])
+
+  def degeneracyOrder(self, nodes):
+    # Repeatedly removes a node of minimum degree among the remaining nodes (ties are broken as in the degree order)
+    index = {node: i for (i, node) in enumerate(sorted(nodes, key=lambda key: len(nodes[key])))}
+    degrees = {node: len(neighbors) for (node, neighbors) in nodes.items()}
+    heap = [(degrees[node], index[node], node) for node in nodes]
+    heapq.heapify(heap)
+    removed = set()
+    order = []
+    while heap:
+      (degree, _, node) = heapq.heappop(heap)
+      if node in removed or degree != degrees[node]:
+        continue # Outdated entry of a node whose degree has since decreased
+      removed.add(node)
+      order.append(node)
+      for neighbor in nodes[node]:
+        if neighbor not in removed:
+          degrees[neighbor] -= 1
+          heapq.heappush(heap, (degrees[neighbor], index[neighbor], neighbor))
+    return order
 
   def get(self, node):
     return self._nodelabels[node]
 
   def getSortedNodesByLabel(self, nodelist):
-    return sorted(nodelist, key=lambda x: self._nodelabels[x])
+    return sorted(nodelist, key=self._nodelabels.__getitem__)
 
   def maxLabelledNode(self, nodeset):
-    return max(list(nodeset), key=lambda x: self._nodelabels[x])
\ No newline at end of file
+    return max(list(nodeset), key=lambda x: self._nodelabels[x])
+
+  #############################################################################################
+  # Bitset functions
+  #############################################################################################
+
+  def setRootNeighbors(self, neighbors):
+    # Sets the shared neighbors of the root to be expanded, to which the bitsets are relative, and returns these in
+    # order of label (such that the bitset of all of them is (1 << len(neighbors)) - 1). Most roots have no expansions,
+    # hence the positions of the shared neighbors are only indexed once a bitset is needed.
+    self._root_nodes = self.getSortedNodesByLabel(neighbors)
+    self._root_index = None
+    self._higher_masks = dict()
+    return self._root_nodes
+
+  def indexRootNeighbors(self):
+    # The higher label mask of every shared neighbor of the root is stored, such that the spatial growth checks of the
+    # cliques expanding the root only take a lookup
+    self._root_labels = [self._nodelabels[x] for x in self._root_nodes]
+    self._root_index = {x: i for (i, x) in enumerate(self._root_nodes)}
+    self._root_bitsets = dict()
+    self._higher_masks = {x: -1 << (i + 1) for (i, x) in enumerate(self._root_nodes)}
+
+  def toBitset(self, nodes):
+    # The nodes must be shared neighbors of the root
+    if self._root_index is None:
+      self.indexRootNeighbors()
+    indices = [self._root_index[x] for x in nodes]
+    if len(indices) == 0:
+      return 0
+    # Set the bits in a bytearray first, as setting them one at a time in an int copies the int each time
+    bits = bytearray(max(indices) // 8 + 1)
+    for index in indices:
+      bits[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bits, "little")
+
+  def fromBitset(self, bits):
+    # Nodes of the bitset, sorted by label. For a few set bits, these are cleared one at a time, and otherwise these are
+    # found by scanning the binary representation (as clearing a bit copies the int, which is slow for many bits).
+    nodes = []
+    if bits.bit_count() <= 16:
+      while bits:
+        lowest = bits & -bits
+        nodes.append(self._root_nodes[lowest.bit_length() - 1])
+        bits ^= lowest
+      return nodes
+    binary = bin(bits)[:1:-1] # Least significant bit first
+    index = binary.find("1")
+    while index >= 0:
+      nodes.append(self._root_nodes[index])
+      index = binary.find("1", index + 1)
+    return nodes
+
+  def getNeighborBitset(self, node):
+    # Neighbors of node among the shared neighbors of the root, intersected by iterating over the smaller of the two
+    if self._root_index is None:
+      self.indexRootNeighbors()
+    bits = self._root_bitsets.get(node)
+    if bits is None:
+      neighbors = self._nodes[node]
+      if len(neighbors) < len(self._root_nodes):
+        bits = self.toBitset([x for x in neighbors if x in self._root_index])
+      else:
+        bits = self.toBitset([x for x in self._root_nodes if x in neighbors])
+      self._root_bitsets[node] = bits
+    return bits
+
+  def getNodeBit(self, node):
+    if self._root_index is None:
+      self.indexRootNeighbors()
+    return 1 << self._root_index[node]
+
+  def getHigherLabelMask(self, node):
+    # All bits of shared neighbors of the root with a label larger than that of node. Other than for the shared
+    # neighbors of the root (see indexRootNeighbors), e.g., the nodes of the root, the mask is found by a binary search.
+    mask = self._higher_masks.get(node)
+    if mask is None:
+      if self._root_index is None:
+        self.indexRootNeighbors()
+      mask = -1 << bisect.bisect_right(self._root_labels, self._nodelabels[node])
+      self._higher_masks[node] = mask
+    return mask
+
+  def countHigherSharedNeighbors(self, X):
+    # Number of shared neighbors of the nodes of link X with a label larger than those of both nodes
+    (u, v) = sorted(X, key=lambda x: len(self._nodes[x]))
+    label = max(self._nodelabels[u], self._nodelabels[v])
+    neighbors = self._nodes[v]
+    return sum(1 for x in self._nodes[u] if x in neighbors and self._nodelabels[x] > label)
\ No newline at end of file
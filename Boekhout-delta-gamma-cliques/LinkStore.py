@@ -0,0 +1,346 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+from array import array
+import bisect
+from collections import defaultdict
+
+import numpy as np
+
+
+# Array backed storage of a link stream. Node identifiers are mapped to dense integer ids and every link {u, v}
+# is given an integer link id. Non-negative integer node identifiers which are not much larger than the number of
+# nodes are used as the node ids themselves (see useNamesAsIds), such that cliques need not be translated back. The timestamps (and weights) of all link instances are stored in contiguous
+# int64 (float64) arrays grouped per link, i.e., the instances of link l are found at positions _offsets[l]
+# up to _offsets[l+1] (CSR layout).
+class LinkStore:
+
+  def __init__(self):
+    self.clear()
+
+  def clear(self):
+    self._node_ids = dict()   # Original node identifier -> dense node id
+    self._node_names = []     # Dense node id -> original node identifier (None for unused ids, see useNamesAsIds)
+    self._names_are_ids = True # Whether every node id equals its original node identifier
+    self._nodes = defaultdict(set)
+
+    self._link_ids = dict()   # (u << 32) | v, with dense node ids u < v -> link id
+    self._link_u = array('q')
+    self._link_v = array('q')
+
+    self._offsets = array('q', [0])
+    self._times = array('q')
+    self._weights = array('d')
+    self._times_view = memoryview(self._times)
+    self._weights_view = memoryview(self._weights)
+
+    # Instances in order of reading, compacted into the CSR layout by finalize()
+    self._pending_links = array('q')
+    self._pending_times = array('q')
+    self._pending_weights = array('d')
+
+  #############################################################################################
+  # Construction functions
+  #############################################################################################
+
+  def parseNodeName(self, token):
+    # Node identifiers are kept as integers where possible, but may be arbitrary strings
+    if isinstance(token, bytes):
+      token = token.decode()
+    elif not isinstance(token, str):
+      return token
+    token = token.strip()
+    try:
+      return int(token)
+    except ValueError:
+      return token
+
+  def getOrAddNodeId(self, name):
+    node = self._node_ids.get(name)
+    if node is None:
+      node = len(self._node_names)
+      self._node_ids[name] = node
+      self._node_names.append(name)
+      if name != node:
+        self._names_are_ids = False
+    return node
+
+  def getOrAddLinkId(self, u, v):
+    if u > v:
+      u, v = v, u
+    key = (u << 32) | v
+    link = self._link_ids.get(key)
+    if link is None:
+      link = len(self._link_u)
+      self._link_ids[key] = link
+      self._link_u.append(u)
+      self._link_v.append(v)
+      self._nodes[u].add(v)
+      self._nodes[v].add(u)
+    return link
+
+  def addLinkInstance(self, t, u_name, v_name, w=1):
+    u = self.getOrAddNodeId(u_name)
+    v = self.getOrAddNodeId(v_name)
+    self._pending_links.append(self.getOrAddLinkId(u, v))
+    self._pending_times.append(t)
+    self._pending_weights.append(w)
+
+  def finalize(self):
+    # Counting sort of the pending instances on link id, which retains the reading order per link
+    num_links = len(self._link_u)
+    counts = [0] * num_links
+    for link in self._pending_links:
+      counts[link] += 1
+    self._offsets = array('q', [0])
+    for count in counts:
+      self._offsets.append(self._offsets[-1] + count)
+
+    num_instances = len(self._pending_links)
+    self._times = array('q', bytes(8 * num_instances))
+    self._weights = array('d', bytes(8 * num_instances))
+    positions = self._offsets.tolist()
+    for i, link in enumerate(self._pending_links):
+      p = positions[link]
+      self._times[p] = self._pending_times[i]
+      self._weights[p] = self._pending_weights[i]
+      positions[link] = p + 1
+    self._times_view = memoryview(self._times)
+    self._weights_view = memoryview(self._weights)
+
+    self._pending_links = array('q')
+    self._pending_times = array('q')
+    self._pending_weights = array('d')
+    self.useNamesAsIds()
+
+  def integerIds(self, node_names):
+    # Node id of every dense node id if the node identifiers are non-negative integers below twice the number of nodes,
+    # such that at most half of the ids are unused, and None otherwise
+    if len(node_names) == 0 or not all(type(name) is int for name in node_names):
+      return None
+    ids = np.array(node_names, dtype=np.int64)
+    if ids.min() < 0 or ids.max() >= 2 * len(node_names):
+      return None
+    return ids
+
+  def namesById(self, node_names, ids):
+    names = [None] * (int(ids.max()) + 1)
+    for name in node_names:
+      names[name] = name
+    return names
+
+  def useNamesAsIds(self):
+    # Renumbers the (dense) node ids of the links added by addLinkInstance to the integer node identifiers themselves
+    # where possible (see integerIds), retaining the link ids and the order of the nodes
+    ids = self.integerIds(self._node_names)
+    if ids is None or self._names_are_ids:
+      return
+    link_u = ids[np.asarray(self._link_u, dtype=np.int64)]
+    link_v = ids[np.asarray(self._link_v, dtype=np.int64)]
+    self._link_u = array('q', np.minimum(link_u, link_v).tolist())
+    self._link_v = array('q', np.maximum(link_u, link_v).tolist())
+    self._link_ids = {(u << 32) | v: link for (link, (u, v)) in enumerate(zip(self._link_u, self._link_v))}
+    nodes = [(self._node_names[u], [self._node_names[v] for v in neighbors]) for (u, neighbors) in self._nodes.items()]
+    self._nodes.clear()
+    for (u, neighbors) in nodes:
+      self._nodes[u] = set(neighbors)
+    self.setNodeNames(self.namesById(self._node_names, ids))
+
+  def firstAppearanceIds(self, values):
+    # Map values to dense ids in order of first appearance, as is done when adding instances one at a time
+    uniq, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty(len(uniq), dtype=np.int64)
+    rank[order] = np.arange(len(uniq), dtype=np.int64)
+    return uniq[order], rank[inverse.ravel()]
+
+  def buildFromArrays(self, times, us, vs, weights=None):
+    # Bulk alternative to addLinkInstance() + finalize() for columnar input of original node identifiers
+    num_instances = len(times)
+    endpoints = np.empty(2 * num_instances, dtype=np.result_type(us, vs))
+    endpoints[0::2] = us
+    endpoints[1::2] = vs
+    names, node_ids = self.firstAppearanceIds(endpoints)
+    if names.dtype.kind in "SUO":
+      node_names = [self.parseNodeName(name) for name in names.tolist()]
+      if len(set(node_names)) < len(node_names):
+        # Different tokens may denote the same node identifier, e.g., "7" and "07"
+        first_ids = dict()
+        remap = np.array([first_ids.setdefault(name, node) for (node, name) in enumerate(node_names)], dtype=np.int64)
+        merged, node_ids = self.firstAppearanceIds(remap[node_ids])
+        node_names = [node_names[node] for node in merged.tolist()]
+    else:
+      node_names = names.tolist()
+    ids = self.integerIds(node_names)
+    if ids is not None:
+      node_ids = ids[node_ids]
+      node_names = self.namesById(node_names, ids)
+
+    u = node_ids[0::2]
+    v = node_ids[1::2]
+    link_keys = (np.minimum(u, v) << 32) | np.maximum(u, v)
+    link_key_values, link_per_instance = self.firstAppearanceIds(link_keys)
+
+    if weights is None:
+      weights = np.ones(num_instances, dtype=np.float64)
+    times = np.asarray(times, dtype=np.int64)
+    order = np.lexsort((times, link_per_instance)) # Sort by link and then time
+    counts = np.bincount(link_per_instance, minlength=len(link_key_values))
+    offsets = np.zeros(len(link_key_values) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    self.setArrays(node_names, link_key_values >> 32, link_key_values & 0xFFFFFFFF, offsets,
+                   np.ascontiguousarray(times[order]),
+                   np.ascontiguousarray(np.asarray(weights, dtype=np.float64)[order]))
+
+  def setArrays(self, node_names, link_u, link_v, offsets, times, weights):
+    # Adopt (possibly memory mapped) arrays in the CSR layout as the storage of this link stream
+    self.setNodeNames(node_names)
+    # Memoryviews are used such that lookups return Python integers, as they do for the array module arrays
+    self._link_u = memoryview(np.ascontiguousarray(link_u, dtype=np.int64))
+    self._link_v = memoryview(np.ascontiguousarray(link_v, dtype=np.int64))
+    self._link_ids = dict()
+    for (link, (u, v)) in enumerate(zip(self._link_u.tolist(), self._link_v.tolist())):
+      self._link_ids[(u << 32) | v] = link
+      self._nodes[u].add(v)
+      self._nodes[v].add(u)
+    self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int64))
+    self._times = times
+    self._weights = weights
+    self._times_view = memoryview(times)
+    self._weights_view = memoryview(weights)
+
+  def appendInstances(self, times, u_names, v_names, weights=None):
+    # Appends link instances with timestamps at or after those already stored, while keeping the dense node and link
+    # ids of the stored link stream. Returns the sorted link ids to which instances were appended.
+    assert len(self._weights) == len(self._times), "Error (10): Cannot append to a link stream whose weights were released"
+    if weights is None:
+      weights = np.ones(len(times), dtype=np.float64)
+    self._link_u = array('q', self._link_u.tolist())
+    self._link_v = array('q', self._link_v.tolist())
+    new_links = np.array([self.getOrAddLinkId(self.getOrAddNodeId(u_name), self.getOrAddNodeId(v_name))
+                          for (u_name, v_name) in zip(u_names, v_names)], dtype=np.int64)
+
+    offsets = np.asarray(self._offsets, dtype=np.int64)
+    old_links = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+    all_links = np.concatenate([old_links, new_links])
+    # A stable sort on link id keeps the stored instances of a link ahead of the appended ones
+    order = np.argsort(all_links, kind="stable")
+    counts = np.bincount(all_links, minlength=len(self._link_u))
+    offsets = np.zeros(len(self._link_u) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    times = np.concatenate([np.asarray(self._times, dtype=np.int64), np.asarray(times, dtype=np.int64)])[order]
+    weights = np.concatenate([np.asarray(self._weights, dtype=np.float64), np.asarray(weights, dtype=np.float64)])[order]
+
+    self.setArrays(self._node_names, self._link_u, self._link_v, offsets, np.ascontiguousarray(times), np.ascontiguousarray(weights))
+    return np.unique(new_links).tolist()
+
+  def setUnitWeights(self):
+    self._weights = np.ones(len(self._times), dtype=np.float64)
+    self._weights_view = memoryview(self._weights)
+
+  def releaseWeights(self):
+    self._weights = array('d')
+    self._weights_view = memoryview(self._weights)
+
+  #############################################################################################
+  # Lookup functions
+  #############################################################################################
+
+  def linkId(self, u, v):
+    # Returns None if nodes u and v are never linked
+    if u < v:
+      return self._link_ids.get((u << 32) | v)
+    return self._link_ids.get((v << 32) | u)
+
+  def linkIds(self, u, nodes):
+    # Batched linkId for links of node u to each of the nodes, which must all exist
+    link_ids = self._link_ids
+    return [link_ids[(u << 32) | v] if u < v else link_ids[(v << 32) | u] for v in nodes]
+
+  def numLinks(self):
+    return len(self._link_u)
+
+  def numNodes(self):
+    # Number of node ids, including unused ones (see useNamesAsIds)
+    return len(self._node_names)
+
+  def numInstances(self):
+    return len(self._times)
+
+  def getLinkNodes(self, link):
+    return frozenset([self._link_u[link], self._link_v[link]])
+
+  def getTimes(self, link):
+    # Zero-copy view of the timestamps of this link
+    return self._times_view[self._offsets[link]:self._offsets[link + 1]]
+
+  def nextAtOrAfter(self, link, t):
+    # First timestamp of this link at or after t (None if there is none), bisected within the CSR arrays such that no
+    # slice of the timestamps is created
+    end = self._offsets[link + 1]
+    index = bisect.bisect_left(self._times_view, t, self._offsets[link], end)
+    if index == end:
+      return None
+    return self._times_view[index]
+
+  def prevAtOrBefore(self, link, t):
+    # Last timestamp of this link at or before t (None if there is none)
+    begin = self._offsets[link]
+    index = bisect.bisect_right(self._times_view, t, begin, self._offsets[link + 1])
+    if index == begin:
+      return None
+    return self._times_view[index - 1]
+
+  def minNextAtOrAfter(self, links, t, limit):
+    # Batched nextAtOrAfter: the earliest timestamp at or after t of any of the links, or limit if that is earlier.
+    # As no timestamp can precede t, the search stops at the first link with an instance at t.
+    times = self._times_view
+    offsets = self._offsets
+    result = limit
+    for link in links:
+      end = offsets[link + 1]
+      index = bisect.bisect_left(times, t, offsets[link], end)
+      if index < end:
+        if times[index] == t:
+          return t
+        result = min(result, times[index])
+    return result
+
+  def maxPrevAtOrBefore(self, links, t, limit):
+    # Batched prevAtOrBefore: the latest timestamp at or before t of any of the links, or limit if that is later
+    times = self._times_view
+    offsets = self._offsets
+    result = limit
+    for link in links:
+      begin = offsets[link]
+      index = bisect.bisect_right(times, t, begin, offsets[link + 1])
+      if index > begin:
+        if times[index - 1] == t:
+          return t
+        result = max(result, times[index - 1])
+    return result
+
+  def getWeights(self, link):
+    return self._weights_view[self._offsets[link]:self._offsets[link + 1]]
+
+  def getNodeName(self, node):
+    return self._node_names[node]
+
+  def setNodeNames(self, node_names):
+    # Replaces the original node identifiers (indexed by dense node id), e.g., by those of a link stream this is part of
+    self._node_names = list(node_names)
+    self._node_ids = {name: node for (node, name) in enumerate(self._node_names) if name is not None}
+    self._names_are_ids = all(name is None or name == node for (node, name) in enumerate(self._node_names))
+
+  def namesAreIds(self):
+    return self._names_are_ids
@@ -0,0 +1,180 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+from BinaryLinkStream import BinaryLinkStream
+
+import numpy as np
+
+import os
+import struct
+
+
+# Bulk (NumPy based) parser for link stream text files, which stores the parsed link stream in a sidecar cache
+# file (in the BinaryLinkStream format) next to the input file. The cache is keyed on the size and modification
+# time of the input file and the parsing options, and is memory mapped when read back in.
+class LinkStreamReader:
+
+  def __init__(self, infile, delimiter=" ", weighted=False, block_size=1 << 24):
+    self._infile = infile
+    self._delimiter = delimiter
+    self._weighted = weighted
+    self._block_size = block_size # Number of bytes of lines parsed at once
+    self._cachefile = infile + ".cache"
+
+  #############################################################################################
+  # Text parsing functions
+  #############################################################################################
+
+  def parseBlock(self, lines, num_columns):
+    data = b"".join(lines).strip()
+    if self._delimiter.strip() == "":
+      tokens = data.split()
+    else:
+      delimiter = self._delimiter.encode()
+      tokens = data.replace(b"\r\n", b"\n").replace(b"\n", delimiter).split(delimiter)
+    assert len(tokens) % num_columns == 0, "Error (4): Inconsistent number of columns in '{}'".format(self._infile)
+    columns = np.array(tokens, dtype=bytes).reshape(-1, num_columns)
+
+    t = columns[:, 0].astype(np.int64)
+    try:
+      u = columns[:, 1].astype(np.int64)
+      v = columns[:, 2].astype(np.int64)
+    except ValueError:
+      # Non-integer node identifiers are kept as byte strings
+      u = np.char.strip(columns[:, 1])
+      v = np.char.strip(columns[:, 2])
+    if self._weighted:
+      w = columns[:, 3].astype(np.float64)
+    else:
+      w = None
+    return t, u, v, w
+
+  def countColumns(self, line):
+    if self._delimiter.strip() == "":
+      return len(line.split())
+    return len(line.rstrip(b"\r\n").split(self._delimiter.encode()))
+
+  def parseColumns(self):
+    blocks = []
+    with open(self._infile, 'rb') as inf:
+      first_line = inf.readline()
+      num_columns = self.countColumns(first_line)
+      lines = [first_line]
+      while True:
+        lines += inf.readlines(self._block_size)
+        if len(lines) == 0:
+          break
+        blocks.append(self.parseBlock(lines, num_columns))
+        lines = []
+    return self.concatenateBlocks(blocks)
+
+  def concatenateBlocks(self, blocks):
+    if len(blocks) == 0:
+      return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), \
+             (np.zeros(0, dtype=np.float64) if self._weighted else None)
+    times = np.concatenate([block[0] for block in blocks])
+    if any(block[1].dtype.kind == "S" for block in blocks):
+      us = np.concatenate([block[1].astype(bytes) for block in blocks])
+      vs = np.concatenate([block[2].astype(bytes) for block in blocks])
+    else:
+      us = np.concatenate([block[1] for block in blocks])
+      vs = np.concatenate([block[2] for block in blocks])
+    if self._weighted:
+      weights = np.concatenate([block[3] for block in blocks])
+    else:
+      weights = None
+    return times, us, vs, weights
+
+  def read(self, links):
+    times, us, vs, weights = self.parseColumns()
+    links.buildFromArrays(times, us, vs, weights)
+
+  #############################################################################################
+  # Time range functions, which require the lines of the file to be ordered by time
+  #############################################################################################
+
+  def lineTime(self, line):
+    if self._delimiter.strip() == "":
+      return int(line.split(None, 1)[0])
+    return int(line.split(self._delimiter.encode(), 1)[0])
+
+  def lineAt(self, inf, position):
+    # Offset and contents of the first line starting at or after position (empty at the end of the file)
+    inf.seek(max(0, position - 1))
+    if position > 0:
+      inf.readline()
+    offset = inf.tell()
+    return offset, inf.readline()
+
+  def seekTime(self, inf, t):
+    # Moves to the first line with a timestamp at or after t, bisecting the byte offsets of the file
+    lo = 0
+    hi = os.fstat(inf.fileno()).st_size
+    while lo < hi:
+      mid = (lo + hi) // 2
+      _, line = self.lineAt(inf, mid)
+      if line.strip() == b"" or self.lineTime(line) >= t:
+        hi = mid
+      else:
+        lo = mid + 1
+    inf.seek(self.lineAt(inf, lo)[0])
+
+  def timeRange(self):
+    # First and last timestamp of the file
+    with open(self._infile, 'rb') as inf:
+      first = self.lineTime(inf.readline())
+      size = os.fstat(inf.fileno()).st_size
+      inf.seek(max(0, size - 4096))
+      lines = [line for line in inf.read().split(b"\n") if line.strip() != b""]
+    return first, self.lineTime(lines[-1])
+
+  def parseRange(self, begin, end):
+    # Parses only the link instances with timestamps in [begin, end], such that the rest of the file is not read
+    blocks = []
+    with open(self._infile, 'rb') as inf:
+      num_columns = self.countColumns(inf.readline())
+      self.seekTime(inf, begin)
+      while True:
+        lines = [line for line in inf.readlines(self._block_size) if line.strip() != b""]
+        if len(lines) == 0:
+          break
+        if self.lineTime(lines[-1]) > end:
+          while len(lines) > 0 and self.lineTime(lines[-1]) > end:
+            lines.pop()
+          if len(lines) > 0:
+            blocks.append(self.parseBlock(lines, num_columns))
+          break
+        blocks.append(self.parseBlock(lines, num_columns))
+    return self.concatenateBlocks(blocks)
+
+  #############################################################################################
+  # Cache functions
+  #############################################################################################
+
+  def getCacheKey(self):
+    stat = os.stat(self._infile)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "delimiter": self._delimiter, "weighted": bool(self._weighted)}
+
+  def hasValidCache(self):
+    if not os.path.isfile(self._cachefile):
+      return False
+    try:
+      meta = BinaryLinkStream().readMetadata(self._cachefile)
+    except (AssertionError, ValueError, struct.error):
+      return False
+    return meta.get("source") == self.getCacheKey()
+
+  def writeCache(self, links):
+    BinaryLinkStream().write(self._cachefile, links, self._weighted, {"source": self.getCacheKey()})
+
+  def readCache(self, links):
+    BinaryLinkStream().read(self._cachefile, links)
@@ -0,0 +1,186 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+from CliqueMaster import CliqueMaster
+from Clique import Clique
+
+import contextlib
+import statistics
+import timeit
+import random
+import json
+import io
+
+
+# Microbenchmarks of the hot functions of the stretch and bulk phase. The fixtures are realistic, i.e., the arguments
+# of (a seeded sample of) the calls made to these functions while enumerating the cliques of a link stream are
+# recorded, after which each function is timed in isolation by replaying its recorded calls. The time per call of each
+# function is normalized by the time of a fixed calibration loop, such that it can be compared to a stored baseline
+# (roughly) independent of the speed of the machine.
+class MicroBenchmark:
+
+  engine_functions = ["stretchLink"]
+  master_functions = ["isInitialOverlapClique", "isRecursiveOverlapClique", "isTemporalGrowthDominated"]
+  clique_functions = ["getMinimumTbFromBorderComb", "isSpatialGrowthDominated"]
+
+  def __init__(self, samples=2000, seed=0):
+    self._samples = samples # Maximum number of calls recorded per function
+    self._seed = seed
+    self._calls = {}
+    self._Cm = None
+
+  #############################################################################################
+  # Fixture functions
+  #############################################################################################
+
+  def writeLinkStream(self, outputfile, num_nodes=20, num_instances=20000):
+    # Weighted random link stream in which a few nodes take part in most links, such that cliques of various sizes occur
+    rng = random.Random(self._seed)
+    hubs = list(range(1, max(2, num_nodes // 6) + 1))
+    with open(outputfile, 'w') as out:
+      for i in range(num_instances):
+        u = rng.choice(hubs) if rng.random() < 0.6 else rng.randint(1, num_nodes)
+        v = rng.randint(1, num_nodes)
+        if u != v:
+          out.write("{} {} {} {}\n".format(i // 4, u, v, rng.randint(1, 3)))
+
+  def record(self, infile, delta, gamma, weighted=True):
+    # Enumerates the cliques of the link stream while recording the calls made to the benchmarked functions
+    rng = random.Random(self._seed)
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(infile, weighted=weighted)
+    Cm.setReuseStretchData(True) # The StretchEngine is required to replay stretchLink
+    Cm.setWindowCacheSize(0)
+    self._Cm = Cm
+    self._calls = {name: [] for name in self.engine_functions + self.master_functions + self.clique_functions}
+    seen = {name: 0 for name in self._calls}
+
+    def recorder(name, function, instance=None):
+      def recording_function(*args):
+        # Reservoir sampling of the calls
+        seen[name] += 1
+        call = args if instance is None else (instance,) + args
+        if len(self._calls[name]) < self._samples:
+          self._calls[name].append(call)
+        else:
+          index = rng.randrange(seen[name])
+          if index < self._samples:
+            self._calls[name][index] = call
+        return function(*args)
+      return recording_function
+
+    def clique_recorder(name, function):
+      def recording_function(c, *args):
+        return recorder(name, function.__get__(c), c)(*args)
+      return recording_function
+
+    for name in self.master_functions:
+      setattr(Cm, name, recorder(name, getattr(Cm, name)))
+    originals = {name: getattr(Clique, name) for name in self.clique_functions}
+    try:
+      for name in self.clique_functions:
+        setattr(Clique, name, clique_recorder(name, originals[name]))
+      with contextlib.redirect_stdout(io.StringIO()):
+        Cm.enumerateDeltaGammaCliques(delta, gamma)
+    finally:
+      for name in self.clique_functions:
+        setattr(Clique, name, originals[name])
+      for name in self.master_functions:
+        delattr(Cm, name)
+
+    # The StretchEngine is created within the stretch phase, hence stretchLink is replayed on (a sample of) the links for
+    # which the stretch phase calls it, i.e., those without negative weights whose total weight reaches gamma
+    engine = Cm._stretch_engine
+    links = [link for link in range(Cm._links.numLinks())
+             if not engine.hasNegativeWeights(link) and engine.totalWeight(link) >= gamma] if engine is not None else []
+    self._calls["stretchLink"] = [(link,) for link in rng.sample(links, min(len(links), self._samples))]
+    return {name: len(calls) for (name, calls) in self._calls.items()}
+
+  #############################################################################################
+  # Timing functions
+  #############################################################################################
+
+  def calibrationLoop(self):
+    # Fixed loop of (interpreted) integer arithmetic, of which the time is used to normalize the timings
+    total = 0
+    for i in range(100000):
+      total += i & 7
+    return total
+
+  def replayer(self, name):
+    Cm = self._Cm
+    calls = self._calls[name]
+    if name in self.engine_functions:
+      function = getattr(Cm._stretch_engine, name)
+    elif name in self.master_functions:
+      function = getattr(CliqueMaster, name)
+      calls = [(Cm,) + call for call in calls]
+    else:
+      function = getattr(Clique, name)
+
+    def replay():
+      for call in calls:
+        function(*call)
+    return replay
+
+  def time(self, repeats=5):
+    # Returns the time of the calibration loop and the time per call of every benchmarked function with recorded calls,
+    # and the latter divided by the former. Each replay of the recorded calls is repeated as often as required to take
+    # at least 0.2 seconds (see timeit.Timer.autorange), such that even the fastest functions are timed over many calls.
+    # The calibration loop is timed in every repeat alongside the functions, and each function is normalized by the
+    # calibration time of the same repeat, such that both are affected alike by the speed of the machine at that moment.
+    # The median over the repeats is used, which is not thrown off by a single repeat that is disturbed (or, as for the
+    # minimum of the unpaired timings, by a calibration loop that happens to run fast once).
+    assert repeats > 0, "Error: At least one repeat is required"
+    timers = {"calibration": (timeit.Timer(self.calibrationLoop), 1)}
+    for name in self.engine_functions + self.master_functions + self.clique_functions:
+      if len(self._calls[name]) > 0:
+        timers[name] = (timeit.Timer(self.replayer(name)), len(self._calls[name]))
+    numbers = {name: timer.autorange()[0] for (name, (timer, _)) in timers.items()}
+
+    timings = {name: [] for name in timers}
+    for _ in range(repeats):
+      for (name, (timer, num_calls)) in timers.items():
+        timings[name].append(timer.timeit(numbers[name]) / (numbers[name] * num_calls))
+
+    calibrations = timings.pop("calibration")
+    return {"calibration": statistics.median(calibrations),
+            "timings": {name: statistics.median(times) for (name, times) in timings.items()},
+            "normalized": {name: statistics.median(time / calibration for (time, calibration) in zip(times, calibrations))
+                           for (name, times) in timings.items()}}
+
+  def run(self, infile, delta, gamma, repeats=5, weighted=True):
+    self.record(infile, delta, gamma, weighted)
+    return self.time(repeats)
+
+  #############################################################################################
+  # Baseline functions
+  #############################################################################################
+
+  def compare(self, result, baseline, threshold=0.5):
+    # Returns the (normalized) ratio of the time per call to that of the baseline for every function, and the functions
+    # whose ratio exceeds 1 + threshold
+    ratios = {}
+    for (name, normalized) in result["normalized"].items():
+      if name in baseline["normalized"]:
+        ratios[name] = normalized / baseline["normalized"][name]
+    return ratios, sorted(name for (name, ratio) in ratios.items() if ratio > 1 + threshold)
+
+  def readBaseline(self, baselinefile):
+    with open(baselinefile) as inf:
+      return json.load(inf)
+
+  def writeBaseline(self, baselinefile, result, parameters):
+    with open(baselinefile, 'w') as out:
+      json.dump(dict(result, parameters=parameters), out, indent=2, sort_keys=True)
+      out.write("\n")
@@ -0,0 +1,64 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import json
+import os
+import resource
+import timeit
+
+
+# Machine readable metrics of a run. For every phase the wall time and the CPU time (of this process and of its forked
+# workers) are stored, next to named values such as the number of stretched cliques. As the operating system only
+# reports the peak resident set size of the process as a whole (and of its largest finished worker) so far, which a
+# phase after the largest one does not change, both these peaks at the end of the phase and by how much the phase
+# raised the peak of the process are stored. Records are appended to a metrics file as single JSON lines, such that the metrics of many runs
+# can be collected in one file.
+class RunMetrics:
+
+  def __init__(self):
+    self._started = dict()
+    self._phases = dict()
+    self._values = dict()
+
+  def getResources(self):
+    times = os.times()
+    return timeit.default_timer(), times.user + times.system, times.children_user + times.children_system, \
+           resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+  def startPhase(self, name):
+    self._started[name] = self.getResources()
+
+  def stopPhase(self, name):
+    # Returns the wall time of the phase
+    (start_wall, start_cpu, start_children_cpu, start_peak_rss) = self._started.pop(name)
+    (stop_wall, stop_cpu, stop_children_cpu, stop_peak_rss) = self.getResources()
+    self._phases[name] = {"wall_time": stop_wall - start_wall,
+                          "cpu_time": stop_cpu - start_cpu,
+                          "children_cpu_time": stop_children_cpu - start_children_cpu,
+                          "peak_rss_growth_mb": stop_peak_rss - start_peak_rss,
+                          "process_peak_rss_mb": stop_peak_rss,
+                          "children_process_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024}
+    return stop_wall - start_wall
+
+  def setValue(self, name, value):
+    self._values[name] = value
+
+  def getPhases(self):
+    return dict(self._phases)
+
+  def getValues(self):
+    return dict(self._values)
+
+  def write(self, metricsfile, record):
+    with open(metricsfile, 'a') as out:
+      out.write(json.dumps(record) + "\n")
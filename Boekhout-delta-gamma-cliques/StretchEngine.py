@@ -0,0 +1,178 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+import numpy as np
+
+import bisect
+
+
+# Vectorized stretch phase. For all link instances at once, the delta windows (through searchsorted) and the
+# cumulative weights per link (prefix sums) are computed with NumPy. Per link, the stretching of
+# CliqueMaster.stretchRight is then replayed by jumping between window borders using bisections on these prefix sums,
+# rather than moving one link instance at a time. The window sums are computed from the prefix sums, which are exact
+# for integral weights, instead of being maintained by repeated additions and subtractions.
+#
+# Bisecting the prefix sums requires them to be non-decreasing, hence links with negative weights are not handled
+# here (see hasNegativeWeights) and should be stretched by CliqueMaster.stretchRight instead.
+class StretchEngine:
+
+  def __init__(self, links, delta, gamma):
+    self._delta = None
+    self._gamma = None
+
+    times = np.asarray(links._times, dtype=np.int64)
+    weights = np.asarray(links._weights, dtype=np.float64)
+    offsets = np.asarray(links._offsets, dtype=np.int64)
+    self._offsets = offsets
+    self._times_array = times
+    self._times = memoryview(np.ascontiguousarray(times))
+
+    link_of = np.repeat(np.arange(len(offsets) - 1, dtype=np.int64), np.diff(offsets))
+    self._link_of = link_of
+    self._negative = np.bincount(link_of[weights < 0], minlength=len(offsets) - 1) > 0
+
+    # Inclusive (q_in[i]) and exclusive (q_ex[i]) cumulative weight of the instances of a link up to instance i, such
+    # that the weight of instances b up to and including e equals q_in[e] - q_ex[b]
+    if len(weights) == 0 or (np.all(np.floor(weights) == weights) and np.abs(weights).sum() < 2**53):
+      weights = weights.astype(np.int64)
+      cumulative = np.cumsum(weights)
+    else:
+      weights = weights.astype(np.longdouble)
+      cumulative = np.cumsum(weights)
+    base = (cumulative - weights)[offsets[:-1][np.diff(offsets) > 0]]
+    base = np.repeat(base, np.diff(offsets)[np.diff(offsets) > 0])
+    q_in = cumulative - base
+    q_ex = q_in - weights
+    if q_in.dtype != np.int64:
+      q_in = q_in.astype(np.float64)
+      q_ex = q_ex.astype(np.float64)
+    self._q_in_array = q_in
+    self._q_ex_array = q_ex
+
+    self._q_in = memoryview(np.ascontiguousarray(q_in))
+    self._q_ex = memoryview(np.ascontiguousarray(q_ex))
+    self._totals = memoryview(np.ascontiguousarray(q_in[offsets[1:] - 1] if len(times) > 0 else q_in[:0]))
+
+    self.setParameters(delta, gamma)
+
+  def setParameters(self, delta, gamma):
+    # The cumulative weights above are independent of delta and gamma, and the delta windows below only depend on
+    # delta, such that these are reused when the engine is used for multiple (delta,gamma) combinations
+    times = self._times_array
+    if delta != self._delta:
+      self._delta = delta
+      self._gamma = None
+      # Borders of the delta windows starting or ending at each link instance, using indices into the CSR arrays:
+      #   lo[i]:  first instance j of the same link with times[j] > times[i] - delta
+      #   hi[i]:  last instance j of the same link with times[j] < times[i] + delta
+      #   hi2[i]: last instance j of the same link with times[j] < times[i] + 1 + delta
+      lo = self.segmentedSearch(times, self._link_of, self._offsets, -delta, "right")
+      hi = self.segmentedSearch(times, self._link_of, self._offsets, delta, "left") - 1
+      hi2 = self.segmentedSearch(times, self._link_of, self._offsets, delta + 1, "left") - 1
+      self._window_weights = self._q_in_array - self._q_ex_array[lo]
+      self._lo = memoryview(np.ascontiguousarray(lo))
+      self._hi = memoryview(np.ascontiguousarray(hi))
+      self._hi2 = memoryview(np.ascontiguousarray(hi2))
+
+    if gamma != self._gamma:
+      self._gamma = gamma
+      # Next instance (of any link) at or after i which ends a delta window with a cumulative weight of at least gamma
+      candidates = np.where(self._window_weights >= gamma, np.arange(len(times), dtype=np.int64), len(times))
+      next_ok = np.minimum.accumulate(candidates[::-1])[::-1]
+      self._next_ok = memoryview(np.ascontiguousarray(np.append(next_ok, len(times))))
+
+  def segmentedSearch(self, times, link_of, offsets, shift, side):
+    # Searchsorted of times + shift within the instances of the same link. Timestamps are offset per link by a stride
+    # larger than any window, such that one searchsorted over all links suffices.
+    if len(times) == 0:
+      return np.zeros(0, dtype=np.int64)
+    t_min = int(times.min())
+    stride = int(times.max()) - t_min + 2 * abs(shift) + 2
+    if stride * len(offsets) < 2**62:
+      keys = (times - t_min) + link_of * stride
+      return np.searchsorted(keys, keys + shift, side=side).astype(np.int64)
+    result = np.empty(len(times), dtype=np.int64)
+    for link in range(len(offsets) - 1):
+      segment = times[offsets[link]:offsets[link + 1]]
+      result[offsets[link]:offsets[link + 1]] = np.searchsorted(segment, segment + shift, side=side) + offsets[link]
+    return result
+
+  def hasNegativeWeights(self, link):
+    return bool(self._negative[link])
+
+  def totalWeight(self, link):
+    return self._totals[link]
+
+  def stretchLink(self, link):
+    # Returns the (tb, te, tbMin, tbMax, teMin, teMax) of all duration-wise maximal 2-node cliques of this link
+    delta = self._delta
+    gamma = self._gamma
+    times = self._times
+    q_in = self._q_in
+    q_ex = self._q_ex
+    lo = self._lo
+    hi = self._hi
+    hi2 = self._hi2
+    next_ok = self._next_ok
+
+    cliques = []
+    first = int(self._offsets[link])
+    last = int(self._offsets[link + 1]) - 1
+    begin_index = first
+    end_index = first
+
+    while True:
+      # Find the next stretch (begin_index, end_index) which has a cumulative weight greater or equal to gamma
+      if q_in[end_index] - q_ex[begin_index] < gamma:
+        window_end = hi[begin_index]
+        # First, while the end remains within delta of begin_index, only the end moves
+        found = window_end + 1
+        if end_index < window_end:
+          found = bisect.bisect_left(q_in, gamma + q_ex[begin_index], end_index + 1, window_end + 1)
+        if found <= window_end:
+          end_index = found
+        else:
+          # Beyond that, the begin follows the end such that the first full delta window reaching gamma is found
+          end_index = next_ok[max(end_index, window_end) + 1]
+          if end_index > last:
+            return cliques
+          begin_index = lo[end_index]
+      tb = times[begin_index]  # However long the stretch goes on, this will be the first link
+      tbMax = times[end_index] # We know this is the first time that gamma is exceeded
+
+      while True:
+        temp_b = begin_index
+        temp_e = end_index
+        # Stretch end_index as far as delta allows
+        end_index = max(end_index, hi[begin_index])
+        # Next we move the begin_index to the last time that (begin_index, end_index) still exceeds or is equal to gamma
+        begin_index = bisect.bisect_right(q_in, q_in[end_index] - gamma, begin_index, end_index)
+        # If we have stretched as far as the final link instance, save the clique and return
+        if end_index == last:
+          cliques.append((tb, times[end_index], tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1))
+          return cliques
+
+        # If indices did not move, check if from times[begin_index] + 1, we can still obtain a gamma weight again within delta time
+        if begin_index == temp_b and end_index == temp_e:
+          window_end = hi2[begin_index]
+          found = bisect.bisect_left(q_in, q_in[begin_index] + gamma, end_index, window_end + 1)
+          if found <= window_end:
+            begin_index += 1
+            end_index = found
+            continue
+          # If not found, store the current clique and continue a new search from begin_index + 1
+          cliques.append((tb, times[end_index], tbMax - delta + 1, tbMax, times[begin_index], times[begin_index] + delta - 1))
+          if window_end == last:
+            return cliques
+          begin_index += 1
+          end_index = window_end
+          break
@@ -7,7 +7,19 @@
 import unittest
 from CliqueMaster import CliqueMaster
 from Clique import Clique
-from collections import deque
+from LinkStore import LinkStore
+from LinkStreamReader import LinkStreamReader
+from BinaryLinkStream import BinaryLinkStream
+from StretchEngine import StretchEngine
+from CustomNodeLabelling import CustomNodeLabelling
+from CliqueWriter import CliqueWriter
+from MicroBenchmark import MicroBenchmark
+from collections import deque, defaultdict
+import numpy as np
+import tracemalloc
+import random
+import gzip
+import json
 import sys
 import os
 
@@ -120,6 +132,64 @@ class TestClique(unittest.TestCase):
     # Run test
     self.unweightedTest(link_stream, 3, 2, R_expected)
 
+  def test_string_node_identifiers(self):
+    # Prepare link stream and expected cliques
+    link_stream = [(1, "a", "b"), (2, "a", "b"),
+                   (2, "b", "c"), (3, "b", "c"),
+                   (1, "a", "c"), (2, "a", "c"), (3, "a", "c"), (4, "a", "c")]
+    R_expected = set([
+        Clique((frozenset(["a", "b", "c"]), (1, 3))),
+        Clique((frozenset(["a", "c"]), (1, 4)))
+    ])
+    # Run test
+    self.unweightedTest(link_stream, 3, 2, R_expected)
+
+  def test_cached_link_stream(self):
+    # Prepare link stream and expected cliques
+    link_stream = [(1, "a", "b", 1), (2, "a", "b", 1),
+                   (2, "b", "c", 1), (3, "b", "c", 1),
+                   (1, "a", "c", 1), (2, "a", "c", 1), (3, "a", "c", 1), (4, "a", "c", 1)]
+    R_expected = set([
+        Clique((frozenset(["a", "b", "c"]), (1, 3))),
+        Clique((frozenset(["a", "c"]), (1, 4)))
+    ])
+    with open(self._test_file, 'w') as out:
+      for link in link_stream:
+        out.write("{},{},{},{}\n".format(link[0], link[1], link[2], link[3]))
+    # First run parses the text and writes the cache, second run reads the cache
+    for _ in range(2):
+      self.Cm = CliqueMaster(False)
+      self.Cm.readLinkStream(self._test_file, ",", weighted=True, cache=True)
+      self.assertTrue(os.path.isfile(self._test_file + ".cache"))
+      self.Cm.enumerateDeltaGammaCliques(3, 2)
+      self.assertEqual(self.Cm._R, R_expected)
+    os.remove(self._test_file)
+    os.remove(self._test_file + ".cache")
+
+  def test_binary_link_stream(self):
+    # Prepare link stream and expected cliques
+    link_stream = [(1, 1, 2), (2, 1, 2), (5, 1, 2), (6, 1, 2),
+                   (2, 2, 3), (3, 2, 3), (5, 2, 3), (6, 2, 3),
+                   (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3), (5, 1, 3)]
+    R_expected = set([
+        Clique((frozenset([1, 2, 3]), (1, 3))),
+        Clique((frozenset([1, 2, 3]), (4, 6))),
+        Clique((frozenset([2, 3]), (2, 6))),
+        Clique((frozenset([1, 3]), (1, 5)))
+    ])
+    with open(self._test_file, 'w') as out:
+      for link in link_stream:
+        out.write("{} {} {}\n".format(link[0], link[1], link[2]))
+    # Convert the link stream to the binary format and enumerate directly from its memory map
+    links = LinkStore()
+    LinkStreamReader(self._test_file).read(links)
+    BinaryLinkStream().write(self._test_file + ".bin", links, weighted=False)
+    self.Cm.readLinkStream(self._test_file + ".bin")
+    self.Cm.enumerateDeltaGammaCliques(3, 2)
+    self.assertEqual(self.Cm._R, R_expected)
+    os.remove(self._test_file)
+    os.remove(self._test_file + ".bin")
+
   def test_3_2_unweighted_stretch_full(self):
     # Prepare link stream and expected cliques
     link_stream = [(1, 1, 2), (2, 1, 2),
@@ -185,6 +255,24 @@ class TestClique(unittest.TestCase):
     # Run test
     self.unweightedTest(link_stream, 3, 2, R_expected)
 
+  def test_3_2_unweighted_larger_parallel(self):
+    # Prepare link stream and expected cliques
+    link_stream = [(1, 1, 2), (2, 1, 2),
+                   (2, 2, 3), (3, 2, 3),
+                   (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3),
+                   (2, 1, 4), (3, 1, 4),
+                   (2, 2, 4), (3, 2, 4),
+                   (2, 3, 4), (3, 3, 4),
+                   (2, 4, 5), (3, 4, 5),]
+    R_expected = set([
+        Clique((frozenset([1, 2, 3, 4]), (1, 3))),
+        Clique((frozenset([1, 3, 4]), (1, 4))),
+        Clique((frozenset([4, 5]), (2, 3)))
+    ])
+    # Run test with the root cliques divided over two worker processes
+    self.Cm = CliqueMaster(False, n_jobs=2)
+    self.unweightedTest(link_stream, 3, 2, R_expected)
+
   def test_3_2_weighted_larger(self):
     # Prepare link stream and expected cliques
     link_stream = [(1, 1, 2, 2), (2, 1, 2, 2),
@@ -201,6 +289,98 @@ class TestClique(unittest.TestCase):
     # Run test
     self.weightedTest(link_stream, 3, 2, R_expected)
 
+  def test_load_links(self):
+    # Prepare link stream and expected cliques (as in test_3_2_weighted_larger)
+    link_stream = [(1, 1, 2, 2), (2, 1, 2, 2),
+                   (2, 2, 3, 2), (3, 2, 3, 2),
+                   (1, 1, 3, 2), (2, 1, 3, 2), (3, 1, 3, 2), (4, 1, 3, 2),
+                   (2, 1, 4, 2), (3, 1, 4, 2),
+                   (2, 2, 4, 2), (3, 2, 4, 2),
+                   (2, 3, 4, 2), (3, 3, 4, 2),
+                   (2, 4, 5, 2), (3, 4, 5, 2),]
+    R_expected = set([
+        Clique((frozenset([1, 2, 3, 4]), (1, 4))),
+        Clique((frozenset([4, 5]), (2, 3)))
+    ])
+    # Load the link stream from (unordered) columns, of which the node identifiers are parsed as tokens of a file
+    columns = np.array(link_stream)[::-1]
+    self.Cm.loadLinks(columns[:, 0], columns[:, 1].astype(str), columns[:, 2], columns[:, 3])
+    self.Cm.enumerateDeltaGammaCliques(3, 2)
+    self.assertEqual(self.Cm._R, R_expected)
+    self.assertEqual(self.Cm._links.numInstances(), len(link_stream))
+    # Load the link stream from a generator, with and without weights
+    Cm = CliqueMaster(False)
+    Cm.loadLinkIterable((link for link in link_stream), weighted=True)
+    Cm.enumerateDeltaGammaCliques(3, 2)
+    self.assertEqual(Cm._R, R_expected)
+    Cm = CliqueMaster(False)
+    Cm.loadLinkIterable(iter(link_stream))
+    Cm.enumerateDeltaGammaCliques(3, 2)
+    self.assertEqual(Cm._R, set([Clique((frozenset([1, 2, 3, 4]), (1, 3))), Clique((frozenset([1, 3, 4]), (1, 4))),
+                                 Clique((frozenset([4, 5]), (2, 3)))]))
+    with self.assertRaises(AssertionError):
+      self.Cm.loadLinks([1, 2], [1, 2], [2])
+
+  def test_segmented_enumeration(self):
+    # Prepare a link stream of three copies of the link stream of test_3_2_weighted_larger, of which the first two are
+    # delta apart (and may form cliques together) while the third follows after a gap of over delta
+    link_stream = [(1, 1, 2, 2), (2, 1, 2, 2),
+                   (2, 2, 3, 2), (3, 2, 3, 2),
+                   (1, 1, 3, 2), (2, 1, 3, 2), (3, 1, 3, 2), (4, 1, 3, 2),
+                   (2, 1, 4, 2), (3, 1, 4, 2),
+                   (2, 2, 4, 2), (3, 2, 4, 2),
+                   (2, 3, 4, 2), (3, 3, 4, 2),
+                   (2, 4, 5, 2), (3, 4, 5, 2),]
+    columns = np.array([(t + offset, u, v, w) for offset in [0, 6, 20] for (t, u, v, w) in link_stream])
+    self.Cm.loadLinks(columns[:, 0], columns[:, 1], columns[:, 2], columns[:, 3])
+    self.assertEqual(self.Cm.findSegments(3), [(1, 10), (21, 24)])
+    self.assertEqual(self.Cm.findSegments(2), [(1, 4), (7, 10), (21, 24)])
+    self.Cm.enumerateDeltaGammaCliques(3, 2)
+    R_expected = self.Cm._R
+    self.assertIn(Clique((frozenset([1, 3]), (1, 10))), R_expected)
+    # The segmented enumeration (serial and in parallel) finds the same cliques
+    for n_jobs in [1, 2]:
+      Cm = CliqueMaster(False, n_jobs)
+      Cm.loadLinks(columns[:, 0], columns[:, 1].astype(str), columns[:, 2].astype(str), columns[:, 3])
+      Cm.setSegmentation(True)
+      Cm.enumerateDeltaGammaCliques(3, 2)
+      self.assertEqual(set(str(c) for c in Cm._R), set(str(c) for c in R_expected))
+      self.assertEqual(Cm._metrics.getValues()["segments"], 2)
+
+  def test_chunked_enumeration(self):
+    # Prepare a link stream without gaps, of which the link (1, 2) remains active throughout
+    rng = random.Random(2)
+    link_stream = sorted([(t, 1, 2) for t in range(0, 200, 2)] +
+                         [(rng.randint(0, 199),) + tuple(rng.sample(range(1, 7), 2)) for _ in range(400)])
+    with open(self._test_file, 'w') as out:
+      for link in link_stream:
+        out.write("{} {} {}\n".format(link[0], link[1], link[2]))
+    self.Cm.readLinkStream(self._test_file)
+    self.Cm.enumerateDeltaGammaCliques(5, 2)
+    R_expected = self.Cm._R
+    self.assertIn(Clique((frozenset([1, 2]), (0, 198))), R_expected)
+    # The time ranges read are found by bisecting the file
+    times = LinkStreamReader(self._test_file).parseRange(50, 60)[0]
+    self.assertEqual(times.tolist(), [link[0] for link in link_stream if 50 <= link[0] <= 60])
+    # Each chunk only keeps the cliques starting within it, such that the chunks partition the cliques of a full run
+    Cm = CliqueMaster(False)
+    chunks = Cm.findChunks(self._test_file, 30)
+    self.assertEqual(chunks[0], (link_stream[0][0], link_stream[0][0] + 30))
+    R = set()
+    for (begin, end) in chunks[:2]:
+      Cm = CliqueMaster(False)
+      Cm.enumerateChunk(self._test_file, 5, 2, begin, end)
+      self.assertTrue(all(begin <= c._tb < end for c in Cm._R))
+      self.assertTrue(R.isdisjoint(Cm._R))
+      R.update(Cm._R)
+    # The chunked enumeration (one worker process per chunk) finds the same cliques
+    for n_jobs in [1, 2]:
+      Cm = CliqueMaster(False, n_jobs)
+      Cm.enumerateChunks(self._test_file, 5, 2, 30)
+      self.assertEqual(Cm._R, R_expected)
+      self.assertEqual(Cm._metrics.getValues()["chunks"], len(chunks))
+    os.remove(self._test_file)
+
   def test_5_3_weighted_stretch_no_yesatend(self):
     # Prepare link stream and expected cliques
     link_stream = [(2010, 1, 2, 1), (2014, 1, 2, 1), (2016, 1, 2, 1), (2018, 1, 2, 1)]
@@ -264,6 +444,488 @@ class TestClique(unittest.TestCase):
     # Run test
     self.weightedTest(link_stream, 5, 4, R_expected)
 
+  def test_link_occurrence_index(self):
+    # Prepare a few links with random timestamps
+    rng = random.Random(3)
+    for t in sorted(rng.randint(0, 100) for _ in range(300)):
+      (u, v) = rng.sample(range(1, 5), 2)
+      self.Cm._links.addLinkInstance(t, u, v)
+    self.Cm._links.finalize()
+    # Compare to a linear search of the timestamps of each link
+    for link in range(self.Cm._links.numLinks()):
+      times = list(self.Cm._links.getTimes(link))
+      for t in range(-1, 102):
+        self.assertEqual(self.Cm.nextAtOrAfter(link, t), min([x for x in times if x >= t], default=None))
+        self.assertEqual(self.Cm.prevAtOrBefore(link, t), max([x for x in times if x <= t], default=None))
+    # The batched forms give the same results for all links of a clique
+    X = frozenset([1, 2, 3])
+    links = [self.Cm._links.linkId(1, 2), self.Cm._links.linkId(1, 3), self.Cm._links.linkId(2, 3)]
+    for t in range(-1, 102):
+      self.assertEqual(self.Cm.cliqueNextAtOrAfter(X, t), [self.Cm.nextAtOrAfter(link, t) for link in links])
+      self.assertEqual(self.Cm.cliquePrevAtOrBefore(X, t), [self.Cm.prevAtOrBefore(link, t) for link in links])
+      expected = min([x for x in self.Cm.cliqueNextAtOrAfter(X, t) if x is not None] + [200])
+      self.assertEqual(self.Cm._links.minNextAtOrAfter(links, t, 200), expected)
+      expected = max([x for x in self.Cm.cliquePrevAtOrBefore(X, t) if x is not None] + [-5])
+      self.assertEqual(self.Cm._links.maxPrevAtOrBefore(links, t, -5), expected)
+
+  def test_memory_use(self):
+    # Prepare the tokens of a weighted link stream with many instances per link
+    rng = random.Random(5)
+    pairs = [tuple(rng.sample(range(1, 201), 2)) for _ in range(100)]
+    tokens = ["{} {} {} {}".format(t // 4, *rng.choice(pairs), rng.randint(1, 3)).split(" ") for t in range(10000)]
+    # The link store takes several times less memory than lists of timestamps and weights keyed by frozenset([u, v])
+    tracemalloc.start()
+    links = LinkStore()
+    for (t, u, v, w) in tokens:
+      links.addLinkInstance(int(t), links.parseNodeName(u), links.parseNodeName(v), float(w))
+    links.finalize()
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    (times, weights, nodes) = (defaultdict(list), defaultdict(list), defaultdict(set))
+    for (t, u, v, w) in tokens:
+      (u, v) = (int(u), int(v))
+      times[frozenset([u, v])].append(int(t))
+      weights[frozenset([u, v])].append(float(w))
+      nodes[u].add(v)
+      nodes[v].add(u)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    self.assertLess(3 * store_bytes, dict_bytes)
+    # Integer node identifiers are used as node ids, hence the maximal cliques are not copied to translate them back,
+    # unlike for other node identifiers
+    result_bytes = []
+    for name in [int, "n{}".format]:
+      Cm = CliqueMaster(False)
+      Cm.loadLinkIterable((int(t), name(int(u)), name(int(v))) for (t, u, v, w) in tokens)
+      Cm.createNodeLabelling()
+      Cm.stretchPhase(5, 1)
+      tracemalloc.start()
+      Cm.bulkPhase(5)
+      result_bytes.append(tracemalloc.get_traced_memory()[0] / Cm.numResultCliques())
+      tracemalloc.stop()
+      self.assertEqual(Cm._links.namesAreIds(), name is int)
+    self.assertLess(result_bytes[0], 100)
+    self.assertGreater(result_bytes[1], 3 * result_bytes[0])
+    # Other integer node identifiers are mapped to dense ids
+    links = LinkStore()
+    links.buildFromArrays(np.array([1, 2]), np.array([5, 1000]), np.array([7, 5]))
+    self.assertFalse(links.namesAreIds())
+    self.assertEqual([links.getNodeName(node) for node in range(links.numNodes())], [5, 7, 1000])
+
+  def test_neighbor_bitsets(self):
+    # Prepare random neighbor sets, including a hub connected to every other node
+    rng = random.Random(8)
+    nodes = {x: set() for x in range(200)}
+    for _ in range(2000):
+      (u, v) = rng.sample(range(200), 2)
+      nodes[u].add(v)
+      nodes[v].add(u)
+    for x in range(1, 200):
+      nodes[0].add(x)
+      nodes[x].add(0)
+    labelling = self.Cm._nodeLabelling
+    labelling.createNodeLabelling(nodes)
+    # Bitsets relative to the shared neighbors of a root and label ordered iteration agree with the neighbor sets
+    for _ in range(100):
+      (u, v) = rng.sample(range(200), 2)
+      root_shared = nodes[u] & nodes[v]
+      if len(root_shared) < 2:
+        continue
+      self.assertEqual(labelling.setRootNeighbors(root_shared), labelling.getSortedNodesByLabel(root_shared))
+      self.assertEqual(labelling.fromBitset((1 << len(root_shared)) - 1), labelling.getSortedNodesByLabel(root_shared))
+      w = rng.choice(sorted(root_shared))
+      shared = labelling.getNeighborBitset(w)
+      self.assertEqual(labelling.fromBitset(shared), labelling.getSortedNodesByLabel(root_shared & nodes[w]))
+      X = frozenset([u, v, w])
+      c = Clique((X, (0, 1)), None, shared, labelling.maxLabelledNode(X))
+      # Spatial growth is dominated if all shared neighbors labelled above the latest node are covered
+      covered = rng.sample(sorted(root_shared & nodes[w]), len(root_shared & nodes[w]) // 2)
+      higher = [x for x in root_shared & nodes[w] if labelling.get(x) > labelling.get(c._latestX)]
+      self.assertEqual(c.isSpatialGrowthDominated(labelling.toBitset(covered), labelling), set(higher) <= set(covered))
+      self.assertTrue(c.isSpatialGrowthDominated(labelling.toBitset(higher), labelling))
+      # Likewise for the 2-node clique of u and w, whose shared neighbors are not stored (and need not be shared by v)
+      c = Clique((frozenset([u, w]), (0, 1)), latest=labelling.maxLabelledNode([u, w]))
+      higher = [x for x in nodes[u] & nodes[w] if labelling.get(x) > labelling.get(c._latestX)]
+      covered = rng.sample(sorted(root_shared), len(root_shared) // 2)
+      self.assertEqual(labelling.countHigherSharedNeighbors(c._X), len(higher))
+      self.assertEqual(c.isLinkSpatialGrowthDominated(labelling.toBitset(covered), w, len(higher), labelling), set(higher) <= set(covered))
+      covered = [x for x in higher if x in root_shared]
+      self.assertEqual(c.isLinkSpatialGrowthDominated(labelling.toBitset(covered), w, len(higher), labelling), set(higher) <= root_shared)
+
+  def test_node_orderings(self):
+    # Degeneracy order of a triangle with a path attached (1-2-3 triangle, 3-4-5 path), removing minimum degrees first
+    labelling = CustomNodeLabelling("degeneracy")
+    labelling.createNodeLabelling({1: {2, 3}, 2: {1, 3}, 3: {1, 2, 4}, 4: {3, 5}, 5: {4}})
+    self.assertEqual(labelling.getSortedNodesByLabel([1, 2, 3, 4, 5]), [5, 4, 1, 2, 3])
+    labelling = CustomNodeLabelling("activity")
+    labelling.createNodeLabelling({1: {2}, 2: {1, 3}, 3: {2}}, {1: 5, 2: 1, 3: 2})
+    self.assertEqual(labelling.getSortedNodesByLabel([1, 2, 3]), [2, 3, 1])
+    with self.assertRaises(AssertionError):
+      CustomNodeLabelling("unknown")
+    # Prepare a random link stream
+    rng = random.Random(4)
+    with open(self._test_file, 'w') as out:
+      for t in range(500):
+        (u, v) = rng.sample(range(1, 10), 2)
+        out.write("{} {} {}\n".format(t // 3, u, v))
+    # All orderings result in the same cliques, and report their counters
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(self._test_file)
+    summary = Cm.compareNodeOrderings(10, 2, CustomNodeLabelling.strategies, seed=1)
+    Cm.enumerateDeltaGammaCliques(10, 2)
+    self.assertEqual([row[0] for row in summary], CustomNodeLabelling.strategies)
+    for (strategy, runtime, num_cliques, counters) in summary:
+      self.assertEqual(num_cliques, len(Cm._R))
+      self.assertGreater(counters["_iternum"], 0)
+    for strategy in CustomNodeLabelling.strategies:
+      Cm_ordered = CliqueMaster(False)
+      Cm_ordered.setNodeOrdering(strategy, seed=2)
+      Cm_ordered.readLinkStream(self._test_file)
+      Cm_ordered.enumerateDeltaGammaCliques(10, 2)
+      self.assertEqual(Cm_ordered._R, Cm._R)
+      # The shared neighbor counts per link id are those of the node ordering, and are cleared with the stretched cliques
+      for (link, count) in enumerate(Cm_ordered._higher_shared):
+        X = frozenset([Cm_ordered._links._link_u[link], Cm_ordered._links._link_v[link]])
+        self.assertIn(count, [-1, Cm_ordered._nodeLabelling.countHigherSharedNeighbors(X)])
+      Cm_ordered.resetEnumeration()
+      self.assertEqual(len(Cm_ordered._higher_shared), 0)
+    os.remove(self._test_file)
+
+  def test_deep_clique_search(self):
+    # Prepare a single clique of 60 nodes, whose search is deeper than the recursion limit set below allows
+    for t in range(2):
+      for u in range(60):
+        for v in range(u + 1, 60):
+          self.Cm._links.addLinkInstance(t, u, v)
+    self.Cm._links.finalize()
+    recursion_limit = sys.getrecursionlimit()
+    depth = 0
+    frame = sys._getframe()
+    while frame is not None:
+      depth += 1
+      frame = frame.f_back
+    sys.setrecursionlimit(depth + 40)
+    try:
+      self.Cm.enumerateDeltaGammaCliques(3, 1)
+    finally:
+      sys.setrecursionlimit(recursion_limit)
+    self.assertEqual(self.Cm._R, set([Clique((frozenset(range(60)), (0, 1)))]))
+
+  def test_window_cache(self):
+    # Prepare a random link stream with a few high degree nodes
+    rng = random.Random(11)
+    with open(self._test_file, 'w') as out:
+      for t in range(600):
+        u = rng.choice([1, 1, 2, 2, 3, 4, 5, 6, 7, 8])
+        v = rng.randint(1, 8)
+        if u != v:
+          out.write("{} {} {}\n".format(t // 4, u, v))
+    # The results do not depend on the cache size, including when entries are evicted
+    results = []
+    for size in [0, 1, 100000]:
+      Cm = CliqueMaster(False)
+      Cm.readLinkStream(self._test_file)
+      Cm.setWindowCacheSize(size)
+      Cm.enumerateDeltaGammaCliques(10, 2)
+      counters = Cm.getCounters()
+      results.append((Cm._R, counters["_iternum"], counters["_window_cache_hits"] + counters["_window_cache_misses"]))
+    os.remove(self._test_file)
+    self.assertEqual(results[1][:2], results[0][:2])
+    self.assertEqual(results[2][:2], results[0][:2])
+    self.assertEqual(results[0][2], 0)
+    self.assertGreater(results[2][2], 0)
+    self.assertGreater(Cm._window_cache_hits, 0)
+
+  def test_profiling(self):
+    # Prepare a random link stream with a few high degree nodes
+    rng = random.Random(6)
+    with open(self._test_file, 'w') as out:
+      for t in range(600):
+        u = rng.choice([1, 1, 2, 2, 3, 4, 5, 6])
+        v = rng.randint(1, 6)
+        if u != v:
+          out.write("{} {} {}\n".format(t // 4, u, v))
+    # The profiling timers and counters are only updated when profiling is enabled, without changing the results
+    results = []
+    for profile in [False, True, False]:
+      Cm = CliqueMaster(False)
+      Cm.readLinkStream(self._test_file)
+      Cm.setProfiling(profile)
+      Cm.enumerateDeltaGammaCliques(10, 2)
+      counters = Cm.getCounters()
+      results.append((Cm._R, counters["_iternum"], counters["_profiling_expansions"], counters["_profiling_drop"],
+                      counters["_profiling_drop_nl_counter_yes"] + counters["_profiling_drop_nl_counter_no"]))
+    os.remove(self._test_file)
+    self.assertEqual(results[1][:2], results[0][:2])
+    self.assertEqual(results[0][2:], (0, 0, 0))
+    self.assertEqual(results[2][2:], (0, 0, 0))
+    self.assertGreater(results[1][2], 0)
+    self.assertGreater(results[1][3], 0)
+    self.assertGreater(results[1][4], 0)
+
+  def test_microbenchmark(self):
+    # Calls to every benchmarked function are recorded, up to the number of samples
+    benchmark = MicroBenchmark(samples=50, seed=1)
+    benchmark.writeLinkStream(self._test_file, 12, 4000)
+    counts = benchmark.record(self._test_file, 40, 3)
+    os.remove(self._test_file)
+    self.assertEqual(set(counts), set(MicroBenchmark.engine_functions + MicroBenchmark.master_functions + MicroBenchmark.clique_functions))
+    for name in counts:
+      self.assertGreater(counts[name], 0)
+      self.assertLessEqual(counts[name], 50)
+    # The recording functions are removed again
+    self.assertNotIn("isRecursiveOverlapClique", vars(benchmark._Cm))
+    self.assertNotIn("recording_function", Clique.isSpatialGrowthDominated.__name__)
+    # Regressions are relative to the normalized baseline timings
+    baseline = {"calibration": 1.0, "normalized": {"stretchLink": 2.0, "isRecursiveOverlapClique": 1.0}}
+    result = {"calibration": 0.5, "normalized": {"stretchLink": 2.2, "isRecursiveOverlapClique": 1.6, "isSpatialGrowthDominated": 1.0}}
+    (ratios, regressions) = benchmark.compare(result, baseline, 0.25)
+    self.assertEqual(set(ratios), set(["stretchLink", "isRecursiveOverlapClique"]))
+    self.assertEqual(regressions, ["isRecursiveOverlapClique"])
+
+  def test_stretch_engine_matches_stretchRight(self):
+    # Prepare a long (weighted) link stream for a single link with bursts and gaps
+    rng = random.Random(42)
+    t = 0
+    for _ in range(2000):
+      t += rng.choice([0, 1, 1, 2, 3, 8])
+      self.Cm._links.addLinkInstance(t, 1, 2, rng.choice([0, 0.5, 1, 1, 2]))
+    self.Cm._links.finalize()
+    self.Cm._nodeLabelling.createNodeLabelling(self.Cm._nodes)
+    # Compare the borders of all stretched cliques for several deltas and gammas
+    for (delta, gamma) in [(3, 1), (5, 2), (10, 4.5), (20, 12)]:
+      self.Cm._time_stretched.clear()
+      self.Cm.stretchRight(0, delta, gamma)
+      expected = [(c._tb, c._te, c._tbMin, c._tbMax, c._teMin, c._teMax) for c in self.Cm._time_stretched[0]]
+      self.assertEqual(StretchEngine(self.Cm._links, delta, gamma).stretchLink(0), expected)
+
+  def test_parallel_stretch_phase(self):
+    # Prepare a link stream with many links, including links with negative weights
+    rng = random.Random(7)
+    link_stream = []
+    for t in range(3000):
+      u = rng.randint(1, 12)
+      v = rng.randint(1, 12)
+      if u != v:
+        link_stream.append((t // 3, u, v, rng.choice([-1, 1, 1, 2])))
+    # The stretched cliques and their order must be identical to those of the serial stretch phase
+    stretched = []
+    for n_jobs in [1, 3]:
+      Cm = CliqueMaster(False, n_jobs)
+      for (t, u, v, w) in link_stream:
+        Cm._links.addLinkInstance(t, u, v, w)
+      Cm._links.finalize()
+      Cm._nodeLabelling.createNodeLabelling(Cm._nodes)
+      Cm.stretchPhase(6, 3)
+      stretched.append(({link: [str(c) for c in cliques] for (link, cliques) in Cm._time_stretched.items()},
+                        {node: [str(c) for c in cliques] for (node, cliques) in Cm._S.items()}))
+    self.assertEqual(stretched[0], stretched[1])
+
+  def test_streamed_output(self):
+    # Prepare link stream and expected cliques
+    link_stream = [(1, 1, 2), (2, 1, 2),
+                   (2, 2, 3), (3, 2, 3),
+                   (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3),
+                   (2, 1, 4), (3, 1, 4),
+                   (2, 2, 4), (3, 2, 4),
+                   (2, 3, 4), (3, 3, 4),
+                   (2, 4, 5), (3, 4, 5),]
+    R_expected = set([
+        Clique((frozenset([1, 2, 3, 4]), (1, 3))),
+        Clique((frozenset([1, 3, 4]), (1, 4))),
+        Clique((frozenset([4, 5]), (2, 3)))
+    ])
+    with open(self._test_file, 'w') as out:
+      for link in link_stream:
+        out.write("{} {} {}\n".format(link[0], link[1], link[2]))
+    # Write the cliques to a gzip compressed file while they are found, without keeping them in memory
+    outputfile = self._test_file + ".gz"
+    writer = CliqueWriter(outputfile, "gzip", buffer_size=2)
+    self.Cm.setOutputSink(writer, retain=False)
+    self.Cm.readLinkStream(self._test_file, " ")
+    self.Cm.enumerateDeltaGammaCliques(3, 2)
+    writer.close()
+    with gzip.open(outputfile, 'rt') as inf:
+      lines = inf.read().splitlines()
+    os.remove(outputfile)
+    self.assertEqual(len(self.Cm._R), 0)
+    self.assertEqual(self.Cm.numResultCliques(), len(R_expected))
+    self.assertEqual(sorted(line.split(" | ")[0] for line in lines), sorted(str(c).split(" | ")[0] for c in R_expected))
+
+  def test_iter_delta_gamma_cliques(self):
+    # Prepare a link stream with many maximal cliques
+    rng = random.Random(3)
+    with open(self._test_file, 'w') as out:
+      for t in range(600):
+        u = rng.randint(1, 10)
+        v = rng.randint(1, 10)
+        if u != v:
+          out.write("{} {} {}\n".format(t // 4, u, v))
+    # The lazily enumerated cliques must equal those of enumerateDeltaGammaCliques, without being stored in _R
+    self.Cm.readLinkStream(self._test_file, " ")
+    self.Cm.enumerateDeltaGammaCliques(10, 2)
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(self._test_file, " ")
+    lazy = list(Cm.iterDeltaGammaCliques(10, 2))
+    self.assertEqual(len(Cm._R), 0)
+    self.assertEqual(set(lazy), self.Cm._R)
+    self.assertEqual(len(lazy), len(self.Cm._R))
+    # Stopping after the first clique must also stop the bulk phase
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(self._test_file, " ")
+    next(Cm.iterDeltaGammaCliques(10, 2))
+    self.assertLess(Cm._iternum, self.Cm._iternum)
+
+  def test_sweep_delta_gamma_cliques(self):
+    # Prepare a weighted link stream, including negative weights
+    rng = random.Random(11)
+    with open(self._test_file, 'w') as out:
+      for t in range(800):
+        u = rng.randint(1, 9)
+        v = rng.randint(1, 9)
+        if u != v:
+          out.write("{} {} {} {}\n".format(t // 4, u, v, rng.choice([-1, 0.5, 1, 2])))
+    # Each combination of the sweep must write the same cliques as a separate run would find
+    self.Cm.readLinkStream(self._test_file, " ", True)
+    outputfile_format = self._test_file + "-{}-{}"
+    summary = self.Cm.sweepDeltaGammaCliques([4, 12], [1, 2.5], outputfile_format)
+    self.assertEqual([(delta, gamma) for (delta, gamma, _, _) in summary], [(4, 1), (4, 2.5), (12, 1), (12, 2.5)])
+    for (delta, gamma, _, num_cliques) in summary:
+      Cm = CliqueMaster(False)
+      Cm.readLinkStream(self._test_file, " ", True)
+      Cm.enumerateDeltaGammaCliques(delta, gamma)
+      with open(outputfile_format.format(delta, gamma)) as inf:
+        lines = inf.read().splitlines()
+      os.remove(outputfile_format.format(delta, gamma))
+      self.assertEqual(num_cliques, len(Cm._R))
+      self.assertEqual(sorted(lines), sorted(str(c) for c in Cm._R))
+
+  def test_run_metrics(self):
+    # Prepare link stream
+    link_stream = [(1, 1, 2), (2, 1, 2), (2, 2, 3), (3, 2, 3), (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3)]
+    with open(self._test_file, 'w') as out:
+      for link in link_stream:
+        out.write("{} {} {}\n".format(link[0], link[1], link[2]))
+    # Every enumeration appends a single JSON line to the metrics file
+    metricsfile = self._test_file + ".metrics"
+    self.Cm.setMetricsFile(metricsfile)
+    self.Cm.readLinkStream(self._test_file)
+    self.Cm.enumerateDeltaGammaCliques(3, 2)
+    self.Cm.setMetricsFile(None)
+    with open(metricsfile) as inf:
+      records = [json.loads(line) for line in inf]
+    os.remove(metricsfile)
+    os.remove(self._test_file)
+    self.assertEqual(len(records), 1)
+    metrics = records[0]
+    self.assertEqual((metrics["mode"], metrics["delta"], metrics["gamma"]), ("enumerate", 3, 2))
+    self.assertEqual(metrics["input"], {"file": self._test_file, "nodes": 3, "links": 3, "instances": 8})
+    self.assertEqual(sorted(metrics["phases"].keys()), ["bulk", "labelling", "read", "stretch"])
+    for phase in metrics["phases"].values():
+      self.assertGreaterEqual(phase["wall_time"], 0)
+      self.assertGreater(phase["process_peak_rss_mb"], 0)
+      self.assertGreaterEqual(phase["peak_rss_growth_mb"], 0)
+    self.assertEqual((metrics["stretched_cliques"], metrics["roots"], metrics["cliques"]), (3, 3, len(self.Cm._R)))
+    self.assertEqual(metrics["counters"]["_iternum"], self.Cm._iternum)
+
+  def test_incremental_enumeration(self):
+    # Prepare link streams (one including negative weights) and split them in an old and an appended part
+    rng = random.Random(5)
+    for weights in [[1], [-1, 0.5, 1, 2]]:
+      link_stream = []
+      for t in range(900):
+        u = rng.randint(1, 10)
+        v = rng.randint(1, 10)
+        if u != v:
+          link_stream.append((t // 5, u, v, rng.choice(weights)))
+      old = [link for link in link_stream if link[0] < 120]
+      appended = [link for link in link_stream if link[0] >= 120]
+      # Enumerate the old part and store its state
+      with open(self._test_file, 'w') as out:
+        for link in old:
+          out.write("{} {} {} {}\n".format(link[0], link[1], link[2], link[3]))
+      statefile = self._test_file + ".state"
+      Cm = CliqueMaster(False)
+      Cm.readLinkStream(self._test_file, " ", True)
+      Cm.setReuseStretchData(True)
+      Cm.enumerateDeltaGammaCliques(15, 2)
+      Cm.saveState(statefile, 15, 2)
+      # Update the stored state with the appended link instances, in two steps
+      Cm = CliqueMaster(False)
+      self.assertEqual(Cm.loadState(statefile), (15, 2))
+      for part in [appended[:len(appended) // 2], appended[len(appended) // 2:]]:
+        Cm.updateDeltaGammaCliques([l[0] for l in part], [l[1] for l in part], [l[2] for l in part], [l[3] for l in part])
+      os.remove(statefile)
+      os.remove(statefile + ".npz")
+      # Compare to the cliques of the entire link stream
+      with open(self._test_file, 'w') as out:
+        for link in link_stream:
+          out.write("{} {} {} {}\n".format(link[0], link[1], link[2], link[3]))
+      self.Cm = CliqueMaster(False)
+      self.Cm.readLinkStream(self._test_file, " ", True)
+      self.Cm.enumerateDeltaGammaCliques(15, 2)
+      cliques = [sorted((sorted(c._X), c._tb, c._te, c._tbMin, c._tbMax, c._teMin, c._teMax) for c in R) for R in [Cm._R, self.Cm._R]]
+      self.assertEqual(cliques[0], cliques[1])
+
+  def test_incremental_enumeration_delta_one(self):
+    # Prepare a link stream with a clique ((1, 2), 1, 2) ending after its teMax (1), which at delta 1 is neither final
+    # nor can it be found from roots selected on their teMax when link instances are appended from timestamp 4 onwards
+    link_stream = [(0, 0, 3, 0.5), (0, 2, 1, 1), (1, 0, 1, 1), (1, 0, 3, 0.5), (1, 0, 3, 2), (1, 1, 0, 0.5), (1, 1, 2, 2),
+                   (1, 1, 3, 2), (1, 2, 1, 1), (1, 3, 0, 1), (1, 3, 0, 1), (2, 0, 1, 2), (2, 0, 3, 0.5), (2, 1, 2, 1),
+                   (2, 1, 2, 1), (2, 3, 1, 2), (2, 3, 2, 1), (3, 0, 2, 0.5), (3, 1, 3, 2), (3, 2, 0, 2), (3, 2, 0, 2),
+                   (3, 2, 1, 1), (3, 2, 3, 2), (3, 3, 0, 0.5), (3, 3, 0, 1), (3, 3, 1, 1), (4, 1, 3, 1), (4, 3, 1, 0.5),
+                   (4, 3, 2, 0.5), (5, 0, 1, 2), (5, 0, 2, 1), (5, 1, 0, 1), (5, 1, 3, 1), (5, 3, 0, 2)]
+    old = [link for link in link_stream if link[0] < 4]
+    appended = [link for link in link_stream if link[0] >= 4]
+    statefile = self._test_file + ".state"
+    Cm = CliqueMaster(False)
+    Cm.loadLinks(*zip(*old))
+    Cm.setReuseStretchData(True)
+    Cm.enumerateDeltaGammaCliques(1, 3)
+    Cm.saveState(statefile, 1, 3)
+    Cm = CliqueMaster(False)
+    Cm.loadState(statefile)
+    Cm.updateDeltaGammaCliques(*zip(*appended))
+    os.remove(statefile)
+    os.remove(statefile + ".npz")
+    # Compare to the cliques of the entire link stream
+    self.Cm.loadLinks(*zip(*link_stream))
+    self.Cm.enumerateDeltaGammaCliques(1, 3)
+    self.assertIn(Clique((frozenset([1, 2]), (1, 2))), self.Cm._R)
+    cliques = [sorted((sorted(c._X), c._tb, c._te, c._tbMin, c._tbMax, c._teMin, c._teMax) for c in R) for R in [Cm._R, self.Cm._R]]
+    self.assertEqual(cliques[0], cliques[1])
+
+  def test_checkpoint_resume(self):
+    # Prepare a link stream with many maximal cliques
+    rng = random.Random(9)
+    with open(self._test_file, 'w') as out:
+      for t in range(800):
+        u = rng.randint(1, 10)
+        v = rng.randint(1, 10)
+        if u != v:
+          out.write("{} {} {}\n".format(t // 4, u, v))
+    self.Cm.readLinkStream(self._test_file, " ")
+    self.Cm.enumerateDeltaGammaCliques(12, 2)
+    # Interrupt an enumeration that checkpoints after every root, after half of the cliques are found
+    checkpointfile = self._test_file + ".checkpoint"
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(self._test_file, " ")
+    Cm.setCheckpoint(checkpointfile, 0)
+    generator = Cm.iterDeltaGammaCliques(12, 2)
+    for _ in range(len(self.Cm._R) // 2):
+      next(generator)
+    generator.close()
+    # Resuming must restore the pruned roots and find the remaining cliques
+    Cm = CliqueMaster(False)
+    Cm.readLinkStream(self._test_file, " ")
+    Cm.setCheckpoint(checkpointfile, 0, resume=True)
+    Cm.enumerateDeltaGammaCliques(12, 2)
+    os.remove(checkpointfile)
+    os.remove(checkpointfile + ".npz")
+    self.assertEqual(Cm._R, self.Cm._R)
+    self.assertEqual(Cm._iternum, self.Cm._iternum)
+
 if __name__ == '__main__':
   suite = unittest.TestLoader().loadTestsFromTestCase(TestClique)
   unittest.TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
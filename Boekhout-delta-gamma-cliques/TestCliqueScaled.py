@@ -0,0 +1,177 @@
+"""
+  The test cases included in this file replicate the shapes of the (toy) scenarios of TestClique.py to link streams
+  of thousands of nodes, by placing many node-disjoint copies of a scenario side by side and repeating these far
+  enough apart in time not to interact. Next to checking that the result equals the correspondingly replicated
+  expected cliques, the runtime and peak memory use of reading the link stream and enumerating the cliques must remain
+  within the budgets stored in TestCliqueScaled.json, such that a change making the enumeration scale worse is caught.
+
+  The runtime is normalized by the time of a fixed calibration loop (see MicroBenchmark) to roughly carry over between
+  machines. After an intended change in performance the budgets can be updated by using
+    python TestCliqueScaled.py --update
+"""
+
+import unittest
+from CliqueMaster import CliqueMaster
+from Clique import Clique
+from MicroBenchmark import MicroBenchmark
+import tracemalloc
+import contextlib
+import timeit
+import json
+import sys
+import io
+import os
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "TestCliqueScaled.json")
+UPDATE = False # Whether the budgets are (over)written rather than checked
+
+# Scenarios as (link_stream, delta, gamma, expected cliques as (nodes, tb, te)), named after the tests of TestClique.py
+scenarios = {
+  "3_2_unweighted_stretch_parts": ([(1, 1, 2), (2, 1, 2), (6, 1, 2), (7, 1, 2), (9, 1, 2)], 3, 2,
+                                   [([1, 2], 1, 2), ([1, 2], 6, 9)]),
+  "3_2_unweighted_stretch_failing_delta": ([(1, 1, 2), (2, 1, 2), (4, 1, 2), (6, 1, 2), (7, 1, 2), (9, 1, 2)], 3, 2,
+                                           [([1, 2], 1, 4), ([1, 2], 4, 9)]),
+  "multiple_link_overlaps": ([(1, 1, 2), (2, 1, 2), (5, 1, 2), (6, 1, 2),
+                              (2, 2, 3), (3, 2, 3), (5, 2, 3), (6, 2, 3),
+                              (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3), (5, 1, 3)], 3, 2,
+                             [([1, 2, 3], 1, 3), ([1, 2, 3], 4, 6), ([2, 3], 2, 6), ([1, 3], 1, 5)]),
+  "bulk_init_overlap_output": ([(1, 1, 2), (2, 1, 2), (5, 1, 2), (6, 1, 2), (7, 1, 2),
+                                (6, 2, 3), (7, 2, 3), (8, 2, 3), (10, 2, 3),
+                                (6, 1, 3), (7, 1, 3), (8, 1, 3), (10, 1, 3)], 4, 2,
+                               [([1, 2], 1, 7), ([1, 3], 6, 10), ([2, 3], 6, 10), ([1, 2, 3], 5, 8)]),
+  "3_2_unweighted_larger": ([(1, 1, 2), (2, 1, 2), (2, 2, 3), (3, 2, 3), (1, 1, 3), (2, 1, 3), (3, 1, 3), (4, 1, 3),
+                             (2, 1, 4), (3, 1, 4), (2, 2, 4), (3, 2, 4), (2, 3, 4), (3, 3, 4), (2, 4, 5), (3, 4, 5)], 3, 2,
+                            [([1, 2, 3, 4], 1, 3), ([1, 3, 4], 1, 4), ([4, 5], 2, 3)]),
+  "3_2_weighted_larger": ([(1, 1, 2, 2), (2, 1, 2, 2), (2, 2, 3, 2), (3, 2, 3, 2),
+                           (1, 1, 3, 2), (2, 1, 3, 2), (3, 1, 3, 2), (4, 1, 3, 2),
+                           (2, 1, 4, 2), (3, 1, 4, 2), (2, 2, 4, 2), (3, 2, 4, 2),
+                           (2, 3, 4, 2), (3, 3, 4, 2), (2, 4, 5, 2), (3, 4, 5, 2)], 3, 2,
+                          [([1, 2, 3, 4], 1, 4), ([4, 5], 2, 3)]),
+  "5_4_weighted_stretch_yesatendaftergrowth": ([(2010, 1, 2, 2), (2011, 1, 2, 1), (2014, 1, 2, 2), (2015, 1, 2, 2), (2018, 1, 2, 1)], 5, 4,
+                                               [([1, 2], 2010, 2018)]),
+}
+
+class TestCliqueScaled(unittest.TestCase):
+
+  copies = 1000 # Node-disjoint copies of a scenario
+  repeats = 5   # Repetitions of these copies in time
+  time_tolerance = 3.0   # Factor by which the budgets exceed the runtime and peak memory use when they are updated
+  memory_tolerance = 1.5
+
+  @classmethod
+  def setUpClass(cls):
+    cls._baseline = {}
+    if os.path.isfile(BASELINE_FILE):
+      with open(BASELINE_FILE) as inf:
+        cls._baseline = json.load(inf)
+    cls._calibration = cls.calibrate()
+
+  @classmethod
+  def calibrate(cls):
+    timer = timeit.Timer(MicroBenchmark().calibrationLoop)
+    (number, _) = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+  @classmethod
+  def tearDownClass(cls):
+    if UPDATE:
+      with open(BASELINE_FILE, 'w') as out:
+        json.dump(cls._baseline, out, indent=2, sort_keys=True)
+        out.write("\n")
+
+  def setUp(self):
+    sys.stderr = open(os.devnull, 'w')
+    self._test_file = "temp_scaled.txt"
+
+  def tearDown(self):
+    sys.stderr.close()
+    sys.stderr = sys.__stderr__
+    if os.path.isfile(self._test_file):
+      os.remove(self._test_file)
+
+  def replicate(self, link_stream, delta, expected):
+    # Copy i of a node is numbered i * stride + node, and repetition r is shifted by r * period in time, where a gap
+    # of over 2 * delta prevents the cliques of different repetitions from being joined
+    stride = max(max(link[1], link[2]) for link in link_stream) + 1
+    t_min = min(link[0] for link in link_stream)
+    period = max(link[0] for link in link_stream) - t_min + 2 * delta + 1
+    scaled_stream = []
+    scaled_expected = set()
+    for r in range(self.repeats):
+      shift = r * period - t_min
+      for i in range(self.copies):
+        offset = i * stride
+        for link in link_stream:
+          scaled_stream.append((link[0] + shift, link[1] + offset, link[2] + offset) + tuple(link[3:]))
+        for (X, tb, te) in expected:
+          scaled_expected.add(Clique((frozenset(u + offset for u in X), (tb + shift, te + shift))))
+    scaled_stream.sort(key=lambda link: link[0])
+    return scaled_stream, scaled_expected
+
+  def enumerate(self, delta, gamma, weighted):
+    Cm = CliqueMaster(False)
+    with contextlib.redirect_stdout(io.StringIO()):
+      Cm.readLinkStream(self._test_file, " ", weighted)
+      Cm.enumerateDeltaGammaCliques(delta, gamma)
+    return Cm
+
+  def scaledTest(self, name):
+    (link_stream, delta, gamma, expected) = scenarios[name]
+    weighted = len(link_stream[0]) == 4
+    (scaled_stream, scaled_expected) = self.replicate(link_stream, delta, expected)
+    with open(self._test_file, 'w') as out:
+      for link in scaled_stream:
+        out.write(" ".join(map(str, link)) + "\n")
+
+    # The runtime is measured without tracing memory allocations, which slows down the enumeration
+    start_time = timeit.default_timer()
+    Cm = self.enumerate(delta, gamma, weighted)
+    runtime = (timeit.default_timer() - start_time) / self._calibration
+    self.assertEqual(Cm.numResultCliques(), len(scaled_expected))
+    self.assertEqual(Cm._R, scaled_expected)
+    del Cm
+
+    tracemalloc.start()
+    Cm = self.enumerate(delta, gamma, weighted)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    self.assertEqual(Cm._R, scaled_expected)
+
+    if UPDATE:
+      self._baseline[name] = {"nodes": Cm._links.numNodes(), "instances": len(scaled_stream),
+                              "time_budget": runtime * self.time_tolerance, "memory_budget_mb": peak_mb * self.memory_tolerance}
+      return
+    self.assertIn(name, self._baseline, "No budgets stored for {}, update them using --update".format(name))
+    budget = self._baseline[name]
+    self.assertEqual(budget["instances"], len(scaled_stream))
+    self.assertLessEqual(runtime, budget["time_budget"], "Normalized runtime of {} exceeds its budget".format(name))
+    self.assertLessEqual(peak_mb, budget["memory_budget_mb"], "Peak memory use of {} exceeds its budget".format(name))
+
+  def test_3_2_unweighted_stretch_parts(self):
+    self.scaledTest("3_2_unweighted_stretch_parts")
+
+  def test_3_2_unweighted_stretch_failing_delta(self):
+    self.scaledTest("3_2_unweighted_stretch_failing_delta")
+
+  def test_multiple_link_overlaps(self):
+    self.scaledTest("multiple_link_overlaps")
+
+  def test_bulk_init_overlap_output(self):
+    self.scaledTest("bulk_init_overlap_output")
+
+  def test_3_2_unweighted_larger(self):
+    self.scaledTest("3_2_unweighted_larger")
+
+  def test_3_2_weighted_larger(self):
+    self.scaledTest("3_2_weighted_larger")
+
+  def test_5_4_weighted_stretch_yesatendaftergrowth(self):
+    self.scaledTest("5_4_weighted_stretch_yesatendaftergrowth")
+
+if __name__ == '__main__':
+  if "--update" in sys.argv:
+    sys.argv.remove("--update")
+    UPDATE = True
+  suite = unittest.TestLoader().loadTestsFromTestCase(TestCliqueScaled)
+  result = unittest.TextTestRunner(verbosity=2).run(suite)
+  sys.exit(0 if result.wasSuccessful() else 1)
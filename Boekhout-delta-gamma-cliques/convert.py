@@ -0,0 +1,53 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+from LinkStore import LinkStore
+from LinkStreamReader import LinkStreamReader
+from BinaryLinkStream import BinaryLinkStream
+
+import timeit
+import argparse
+import os
+
+#############################################################################################
+# Input parser class functions
+#############################################################################################
+
+class InputParser(object):
+  def __init__(self):
+    self.parser = argparse.ArgumentParser(description="Convert a link stream text file into the (memory mappable) binary link stream format accepted by main.py")
+    self.setArguments()
+
+  def setArguments(self):
+    self.parser.add_argument('-in', "--infile", required=True, help="Location of link stream input file, requiring format '<timestamp> <node_identifier> <node_identifier> <optional weight>'")
+    self.parser.add_argument('-out', "--outfile", required=True, help="Location of the binary link stream output file")
+    self.parser.add_argument('-l', "--delimiter", default=" ", help="Delimiter used between columns of link stream input file")
+    self.parser.add_argument('-w', "--weighted", default=False, help="Indicate whether the weights should be stored")
+
+  def getInputArgumentsAsDict(self):
+    return vars(self.parser.parse_args())
+
+
+#############################################################################################
+# Main function(s)
+#############################################################################################
+
+if __name__ == "__main__":
+  args = InputParser().getInputArgumentsAsDict()
+  assert os.path.isfile(args["infile"]), "Error: Invalid inputfile specified"
+  start_time = timeit.default_timer()
+
+  links = LinkStore()
+  LinkStreamReader(args["infile"], args["delimiter"], args["weighted"]).read(links)
+  BinaryLinkStream().write(args["outfile"], links, bool(args["weighted"]))
+
+  print("Converted {} link instances of {} links between {} nodes in {:.2f}s".format(links.numInstances(), links.numLinks(), links.numNodes(), timeit.default_timer() - start_time))
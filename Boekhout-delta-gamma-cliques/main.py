@@ -11,6 +11,7 @@ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLI
 """
 
 from CliqueMaster import CliqueMaster
+from CliqueWriter import CliqueWriter
 
 import resource
 import timeit
@@ -20,6 +21,19 @@ import os
 
 main_splitter = "================================="
 
+#############################################################################################
+# Argument type functions
+#############################################################################################
+
+def intList(value):
+  return [int(x) for x in value.split(",")]
+
+def floatList(value):
+  return [float(x) for x in value.split(",")]
+
+def strList(value):
+  return value.split(",")
+
 #############################################################################################
 # Logger functions
 #############################################################################################
@@ -29,10 +43,12 @@ class Logger(object):
     self.terminal = sys.stdout
     #self.log = open("logfile-simple-core-team-identification.log", "w")
     os.makedirs("logfiles-clique-enumeration", exist_ok=True)
+    deltas = ",".join(map(str, args["delta"]))
+    gammas = ",".join(map(str, args["gamma"]))
     if args["weighted"]:
-      base_name = "logfiles-clique-enumeration/logfile-Boekhout-BSF-{}_d{}_g{}_weighted".format(args["infile"].split("/")[-1], args["delta"], args["gamma"])
+      base_name = "logfiles-clique-enumeration/logfile-Boekhout-BSF-{}_d{}_g{}_weighted".format(args["infile"].split("/")[-1], deltas, gammas)
     else:
-      base_name = "logfiles-clique-enumeration/logfile-Boekhout-BSF-{}_d{}_g{}".format(args["infile"].split("/")[-1], args["delta"], args["gamma"])
+      base_name = "logfiles-clique-enumeration/logfile-Boekhout-BSF-{}_d{}_g{}".format(args["infile"].split("/")[-1], deltas, gammas)
     name_addendum = ".log"
     i = 0
     while os.path.isfile(base_name + name_addendum):
@@ -57,13 +73,27 @@ class InputParser(object):
     self.setArguments()
 
   def setArguments(self):
-    self.parser.add_argument('-in', "--infile", required=True, help="Location of link stream input file, requiring format '<timestamp> <node_identifier> <node_identifier> <optional weight>'")
+    self.parser.add_argument('-in', "--infile", required=True, help="Location of link stream input file, requiring format '<timestamp> <node_identifier> <node_identifier> <optional weight>' (or a binary link stream file created by convert.py)")
     self.parser.add_argument('-out', "--outdir", required=True, help="Location of directory in which output files will be stored for the enumerated delta-gamma-maximal cliques")
     self.parser.add_argument('-l', "--delimiter", default=" ", help="Delimiter used between columns of link stream input file")
-    self.parser.add_argument('-d', "--delta", default=1, help="Maximum time period within which there must always be a (weighted) frequency of gamma of each link of a clique to be maximal", type=int)
-    self.parser.add_argument('-g', "--gamma", default=1, help="(Weighted) frequency that each link of a clique must occur for every delta period in the maximal cliques' timespan", type=float)
+    self.parser.add_argument('-d', "--delta", default=[1], help="Maximum time period within which there must always be a (weighted) frequency of gamma of each link of a clique to be maximal (a comma separated list sweeps over multiple values)", type=intList)
+    self.parser.add_argument('-g', "--gamma", default=[1.0], help="(Weighted) frequency that each link of a clique must occur for every delta period in the maximal cliques' timespan (a comma separated list sweeps over multiple values)", type=floatList)
     self.parser.add_argument('-v', "--verbose", default=False, help="If set to True additional (progress) information is displayed during runtime")
     self.parser.add_argument('-w', "--weighted", default=False, help="Indicate whether the weights should be used")
+    self.parser.add_argument('-j', "--n_jobs", default=1, help="Number of (forked) worker processes over which the links of the stretch phase and the root cliques of the bulk phase are divided", type=int)
+    self.parser.add_argument('-s', "--stream", action="store_true", help="If set, the cliques are written to the output file as soon as they are found, instead of being kept in memory until the end")
+    self.parser.add_argument('-z', "--compression", default="none", help="Compression of the output file, one of 'none', 'gzip' or 'zstd' (requires the zstandard package)")
+    self.parser.add_argument('-st', "--state", default=None, help="Location of a state file for incremental enumeration. If it exists, the input file holds link instances appended to the stored link stream, otherwise it is created after a full enumeration")
+    self.parser.add_argument('-ck', "--checkpoint_interval", default=0, help="If positive, the progress of the bulk phase is written to a checkpoint file in the output directory at most every this many seconds", type=int)
+    self.parser.add_argument('-r', "--resume", action="store_true", help="If set, the enumeration continues from the last checkpoint in the output directory (if any), checkpointing every 300 seconds unless specified otherwise")
+    self.parser.add_argument('-o', "--ordering", default=["degree"], help="Node ordering strategy, one of 'degree', 'degeneracy', 'activity' or 'random' (a comma separated list compares the work of the bulk phase for each, without writing cliques)", type=strList)
+    self.parser.add_argument('-sd', "--seed", default=None, help="Seed of the random node ordering", type=int)
+    self.parser.add_argument('-m', "--metrics", default=None, help="Location of a metrics file to which the phase timings, resource use, counters and input and output sizes of every enumeration are appended as a JSON line")
+    self.parser.add_argument('-p', "--profile", action="store_true", help="If set, the time spent on the expansion and pruning steps of the bulk phase is measured and reported (which slows down the bulk phase)")
+    self.parser.add_argument('-sg', "--segments", action="store_true", help="If set, the link stream is split at every gap of over delta time units without link instances, after which the segments are enumerated independently (and divided over the n_jobs worker processes)")
+    self.parser.add_argument('-cl', "--chunk_length", default=0, help="If positive, the link stream (which must be ordered by time) is enumerated in chunks of this many time units, each in a worker process of its own (n_jobs at a time), such that it is never held in memory as a whole", type=int)
+    self.parser.add_argument('-ci', "--chunk", default=None, help="Index of the only chunk to enumerate (given a chunk_length), whose cliques are written to a separate output file", type=int)
+    self.parser.add_argument('-c', "--cache", action="store_true", help="If set, the link stream is parsed in bulk and stored in (or read from) a binary cache next to the input file")
 
   def getInputArgumentsAsDict(self):
     return vars(self.parser.parse_args())
@@ -90,19 +120,115 @@ if __name__ == "__main__":
 
   # Check valid input provided
   assert os.path.isfile(args["infile"]), "Error: Invalid inputfile specified"
-  assert args["delta"] > 0, "Error: delta must be positive"
+  assert min(args["delta"]) > 0, "Error: delta must be positive"
   os.makedirs(args["outdir"], exist_ok=True)
-  outputfile = os.path.join(args["outdir"], "delta-{}-gamma-{}.txt".format(args["delta"], args["gamma"]))
+  outputfile_format = os.path.join(args["outdir"], "delta-{}-gamma-{}.txt")
+  if args["compression"] == "gzip":
+    outputfile_format += ".gz"
+  elif args["compression"] == "zstd":
+    outputfile_format += ".zst"
+
+  Cm = CliqueMaster(args["verbose"], args["n_jobs"])
+  Cm.setNodeOrdering(args["ordering"][0], args["seed"])
+  if args["metrics"] is not None:
+    Cm.setMetricsFile(args["metrics"])
+  if args["profile"]:
+    Cm.setProfiling(True)
+
+  # Incrementally update the cliques of a stored state with the link instances of the input file
+  if args["state"] is not None:
+    assert len(args["delta"]) == 1 and len(args["gamma"]) == 1, "Error: incremental enumeration requires a single delta and gamma"
+    assert not args["stream"], "Error: incremental enumeration requires the cliques to be kept in memory"
+    outputfile = outputfile_format.format(args["delta"][0], args["gamma"][0])
+    if os.path.isfile(args["state"]):
+      (delta, gamma) = Cm.loadState(args["state"])
+      assert (delta, gamma) == (args["delta"][0], args["gamma"][0]), "Error: the state was created for delta {} and gamma {}".format(delta, gamma)
+      Cm.updateFromLinkStream(args["infile"], args["delimiter"], args["weighted"])
+    else:
+      Cm.readLinkStream(args["infile"], args["delimiter"], args["weighted"], args["cache"])
+      Cm.setReuseStretchData(True)
+      Cm.enumerateDeltaGammaCliques(args["delta"][0], args["gamma"][0])
+    experiment_compare_stop_time = timeit.default_timer()
+    Cm.saveState(args["state"], args["delta"][0], args["gamma"][0])
+    Cm.printCliques(outputfile, args["compression"])
+    print("Total runtime: {:.2f}s".format(experiment_compare_stop_time - start_time))
+    print("Resources used: {}MB".format(int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024)))
+    print("Cliques found: {}".format(Cm.numResultCliques()))
+    sys.exit(0)
+
+  # Enumerate the link stream in chunks of time, either all of them or only the given one
+  if args["chunk_length"] > 0:
+    assert len(args["delta"]) == 1 and len(args["gamma"]) == 1, "Error: chunked enumeration requires a single delta and gamma"
+    outputfile = outputfile_format.format(args["delta"][0], args["gamma"][0])
+    if args["chunk"] is not None:
+      (begin, end) = Cm.findChunks(args["infile"], args["chunk_length"], args["delimiter"])[args["chunk"]]
+      Cm.enumerateChunk(args["infile"], args["delta"][0], args["gamma"][0], begin, end, args["delimiter"], args["weighted"])
+      experiment_compare_stop_time = timeit.default_timer()
+      Cm.printCliques(outputfile.replace(".txt", ".chunk-{}.txt".format(args["chunk"])), args["compression"])
+    else:
+      if args["stream"]:
+        writer = CliqueWriter(outputfile, args["compression"])
+        Cm.setOutputSink(writer, retain=False)
+      Cm.enumerateChunks(args["infile"], args["delta"][0], args["gamma"][0], args["chunk_length"], args["delimiter"], args["weighted"])
+      experiment_compare_stop_time = timeit.default_timer()
+      if args["stream"]:
+        writer.close()
+      else:
+        Cm.printCliques(outputfile, args["compression"])
+    print("Total runtime: {:.2f}s".format(experiment_compare_stop_time - start_time))
+    print("Resources used: {}MB".format(int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024)))
+    print("Cliques found: {}".format(Cm.numResultCliques()))
+    sys.exit(0)
+
+  Cm.readLinkStream(args["infile"], args["delimiter"], args["weighted"], args["cache"])
+  if args["segments"]:
+    Cm.setSegmentation(True)
+
+  # Compare the work of the bulk phase for multiple node orderings
+  if len(args["ordering"]) > 1:
+    assert len(args["delta"]) == 1 and len(args["gamma"]) == 1, "Error: comparing node orderings requires a single delta and gamma"
+    summary = Cm.compareNodeOrderings(args["delta"][0], args["gamma"][0], args["ordering"], args["seed"])
+    print(main_splitter)
+    print("{:>12} {:>12} {:>10} {:>12} {:>10} {:>10} {:>10}".format("ordering", "runtime (s)", "cliques", "iterations", "main cut", "sub cut", "sub dupl"))
+    for (ordering, runtime, num_cliques, counters) in summary:
+      print("{:>12} {:>12.2f} {:>10} {:>12} {:>10} {:>10} {:>10}".format(ordering, runtime, num_cliques, counters["_iternum"], counters["_cut_main_branches_counter"],
+                                                                      counters["_cut_sub_branches_counter"], counters["_cut_duplicate_branches_counter"]))
+    print(main_splitter)
+    print("Total runtime: {:.2f}s".format(timeit.default_timer() - start_time))
+    print("Resources used: {}MB".format(int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024)))
+    sys.exit(0)
+
+  # Sweep over all combinations of multiple deltas and/or gammas, sharing the link stream and node labelling
+  if len(args["delta"]) > 1 or len(args["gamma"]) > 1:
+    summary = Cm.sweepDeltaGammaCliques(args["delta"], args["gamma"], outputfile_format, args["compression"], args["stream"])
+    print(main_splitter)
+    print("{:>10} {:>10} {:>12} {:>10}".format("delta", "gamma", "runtime (s)", "cliques"))
+    for (delta, gamma, runtime, num_cliques) in summary:
+      print("{:>10} {:>10} {:>12.2f} {:>10}".format(delta, gamma, runtime, num_cliques))
+    print(main_splitter)
+    print("Total runtime: {:.2f}s".format(timeit.default_timer() - start_time))
+    print("Resources used: {}MB".format(int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024)))
+    sys.exit(0)
 
   # Enumerate delta gamma cliques
-  Cm = CliqueMaster(args["verbose"])
-  Cm.readLinkStream(args["infile"], args["delimiter"], args["weighted"])
+  args["delta"] = args["delta"][0]
+  args["gamma"] = args["gamma"][0]
+  outputfile = outputfile_format.format(args["delta"], args["gamma"])
+  if args["checkpoint_interval"] > 0 or args["resume"]:
+    checkpointfile = os.path.join(args["outdir"], "delta-{}-gamma-{}.checkpoint".format(args["delta"], args["gamma"]))
+    Cm.setCheckpoint(checkpointfile, args["checkpoint_interval"] if args["checkpoint_interval"] > 0 else 300, args["resume"])
+  if args["stream"]:
+    writer = CliqueWriter(outputfile, args["compression"])
+    Cm.setOutputSink(writer, retain=False)
   Cm.enumerateDeltaGammaCliques(args["delta"], args["gamma"])
   experiment_compare_stop_time = timeit.default_timer()  # For experiment comparison, we register end time before writing cliques to file
-  Cm.printCliques(outputfile)
+  if args["stream"]:
+    writer.close()
+  else:
+    Cm.printCliques(outputfile, args["compression"])
 
   #stop_time = timeit.default_timer()
   print("Total runtime: {:.2f}s".format(experiment_compare_stop_time - start_time))
   #print("Total runtime: {:.2f}s".format(stop_time - start_time))
   print("Resources used: {}MB".format(int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss/1024)))
-  print("Cliques found: {}".format(len(Cm._R)))
\ No newline at end of file
+  print("Cliques found: {}".format(Cm.numResultCliques()))
\ No newline at end of file
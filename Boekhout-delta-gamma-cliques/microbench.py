@@ -0,0 +1,81 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+from MicroBenchmark import MicroBenchmark
+
+import tempfile
+import argparse
+import sys
+import os
+
+#############################################################################################
+# Input parser class functions
+#############################################################################################
+
+class InputParser(object):
+  def __init__(self):
+    self.parser = argparse.ArgumentParser(description="Time the hot functions of the clique enumeration in isolation and compare them to a stored baseline")
+    self.setArguments()
+
+  def setArguments(self):
+    self.parser.add_argument('-b', "--baseline", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "microbench_baseline.json"), help="Location of the baseline file")
+    self.parser.add_argument('-t', "--threshold", default=0.5, help="Fraction by which the (normalized) time per call of a function may exceed the baseline before it is considered a regression", type=float)
+    self.parser.add_argument('-u', "--update", action="store_true", help="If set, the baseline file is (over)written with the current timings instead of compared to")
+    self.parser.add_argument('-r', "--repeats", default=5, help="Number of times the recorded calls of each function are timed, of which the median is used", type=int)
+    self.parser.add_argument('-in', "--infile", default=None, help="Location of a (weighted) link stream input file to record the calls for, instead of a generated link stream")
+    self.parser.add_argument('-n', "--nodes", default=20, help="Number of nodes of the generated link stream", type=int)
+    self.parser.add_argument('-ni', "--instances", default=20000, help="Number of link instances of the generated link stream", type=int)
+    self.parser.add_argument('-d', "--delta", default=40, help="Delta of the enumeration of which the calls are recorded", type=int)
+    self.parser.add_argument('-g', "--gamma", default=3.0, help="Gamma of the enumeration of which the calls are recorded", type=float)
+    self.parser.add_argument('-s', "--samples", default=2000, help="Maximum number of calls recorded per function", type=int)
+    self.parser.add_argument('-sd', "--seed", default=0, help="Seed of the generated link stream and the sampling of the calls", type=int)
+
+  def getInputArgumentsAsDict(self):
+    return vars(self.parser.parse_args())
+
+
+#############################################################################################
+# Main function(s)
+#############################################################################################
+
+if __name__ == "__main__":
+  args = InputParser().getInputArgumentsAsDict()
+  parameters = {name: args[name] for name in ["infile", "nodes", "instances", "delta", "gamma", "samples", "seed"]}
+  benchmark = MicroBenchmark(args["samples"], args["seed"])
+
+  with tempfile.TemporaryDirectory() as tempdir:
+    infile = args["infile"]
+    if infile is None:
+      infile = os.path.join(tempdir, "link_stream.txt")
+      benchmark.writeLinkStream(infile, args["nodes"], args["instances"])
+    result = benchmark.run(infile, args["delta"], args["gamma"], args["repeats"])
+
+  if args["update"]:
+    benchmark.writeBaseline(args["baseline"], result, parameters)
+    for (name, timing) in result["timings"].items():
+      print("{:>30} {:>12.2f} us/call".format(name, timing * 1e6))
+    print("Baseline written to: {}".format(args["baseline"]))
+    sys.exit(0)
+
+  assert os.path.isfile(args["baseline"]), "Error: No baseline file found, create one using -u"
+  baseline = benchmark.readBaseline(args["baseline"])
+  assert baseline["parameters"] == parameters, "Error: The baseline was recorded for other parameters: {}".format(baseline["parameters"])
+  (ratios, regressions) = benchmark.compare(result, baseline, args["threshold"])
+  print("{:>30} {:>12} {:>12} {:>8}".format("function", "us/call", "baseline", "ratio"))
+  for (name, ratio) in ratios.items():
+    print("{:>30} {:>12.2f} {:>12.2f} {:>8.2f}{}".format(name, result["timings"][name] * 1e6, baseline["timings"][name] * 1e6, ratio,
+                                                         "  REGRESSION" if name in regressions else ""))
+  if regressions:
+    print("Regressed beyond {:.0%} of the baseline: {}".format(args["threshold"], ", ".join(regressions)))
+    sys.exit(1)
+  print("No regressions beyond {:.0%} of the baseline".format(args["threshold"]))
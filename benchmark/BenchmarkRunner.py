@@ -0,0 +1,182 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import subprocess
+import threading
+import shutil
+import timeit
+import json
+import csv
+import sys
+import os
+import re
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Runs the enumerators of this repository on the same link streams, recording the wall time, peak memory use (RSS) and
+# number of maximal cliques of each run, and whether the cliques found agree with those of the reference enumerator.
+#
+# Deltas and gammas are given as defined by Boekhout & Takes (see Boekhout-delta-gamma-cliques). The delta-cliques of
+# Himmel et al. (after post-processing) equal the (delta,1)-cliques of Boekhout & Takes when run with a delta of one
+# less, which is applied here as well for the (delta,gamma)-cliques of Banerjee & Pal. Viard et al. is run with the
+# same delta, for which link instances at most delta apart belong to the same delta-clique as they do for Boekhout &
+# Takes, but the two are not equivalent: their 2-node cliques agree, whereas the borders (and with these the
+# maximality) of cliques of three or more nodes may differ by up to delta, such that viard is not expected to agree.
+# Those other enumerators only support unweighted link streams, and (apart from Banerjee & Pal) only a gamma of 1,
+# such that only the supported combinations are run.
+class BenchmarkRunner:
+
+  implementations = {
+    "boekhout": {"script": os.path.join("Boekhout-delta-gamma-cliques", "main.py"), "delta_offset": 0,
+                 "weighted": True, "gamma": "float"},
+    "viard": {"script": os.path.join("Viard-et-al-delta-cliques", "main.py"), "delta_offset": 0,
+              "weighted": False, "gamma": "one"},
+    "himmel": {"script": os.path.join("Himmel-et-al-delta-cliques-with-pivots", "temporal-cliques.py"), "delta_offset": -1,
+               "weighted": False, "gamma": "one"},
+    "banerjee": {"script": os.path.join("Banerjee-Pal-delta-gamma-cliques", "main_m.py"), "delta_offset": -1,
+                 "weighted": False, "gamma": "int"},
+  }
+
+  fields = ["stream", "implementation", "delta", "gamma", "status", "wall_time", "peak_rss_mb", "cliques", "agrees",
+            "missing", "extra"]
+
+  def __init__(self, workdir, names=None, timeout=3600, reference="boekhout"):
+    names = list(self.implementations) if names is None else names
+    for name in names:
+      assert name in self.implementations, "Error (6): Unknown implementation '{}', expected one of {}".format(name, list(self.implementations))
+    self._workdir = workdir
+    self._names = names
+    self._timeout = timeout # Runs taking longer than this many seconds are killed
+    self._reference = reference
+    self._results = []
+
+  def getResults(self):
+    return self._results
+
+  def supports(self, name, weighted, gamma):
+    implementation = self.implementations[name]
+    if weighted and not implementation["weighted"]:
+      return False
+    if implementation["gamma"] == "one":
+      return gamma == 1
+    if implementation["gamma"] == "int":
+      return gamma == int(gamma)
+    return True
+
+  def command(self, name, infile, outdir, delta, gamma, weighted):
+    implementation = self.implementations[name]
+    command = [sys.executable, os.path.join(REPO, implementation["script"]), "-in", os.path.abspath(infile),
+               "-out", os.path.abspath(outdir), "-d", str(delta + implementation["delta_offset"])]
+    if implementation["gamma"] == "float":
+      command += ["-g", str(gamma)]
+    elif implementation["gamma"] == "int":
+      command += ["-g", str(int(gamma))]
+    if weighted:
+      command += ["-w", "True"]
+    return command
+
+  #############################################################################################
+  # Running functions
+  #############################################################################################
+
+  def runGrid(self, streams, deltas, gammas):
+    # Runs every implementation for every (named) stream and (delta,gamma) combination, where streams maps the name of
+    # each stream to its file and whether it is weighted
+    for (stream, (infile, weighted)) in streams.items():
+      for delta in deltas:
+        for gamma in gammas:
+          runs = {}
+          for name in self._names:
+            if self.supports(name, weighted, gamma):
+              runs[name] = self.run(name, stream, infile, delta, gamma, weighted)
+          self.checkAgreement(runs)
+          self._results += [result for (result, _) in runs.values()]
+    return self._results
+
+  def run(self, name, stream, infile, delta, gamma, weighted):
+    # Runs an implementation in its own directory (as each writes log files to its working directory), and returns the
+    # result record and the set of maximal cliques found (None if the run failed)
+    rundir = os.path.join(self._workdir, "{}-d{}-g{}-{}".format(stream, delta, gamma, name))
+    outdir = os.path.join(rundir, "output")
+    # The output of a previous run into the same work directory (possibly under another name) must not be read
+    shutil.rmtree(outdir, ignore_errors=True)
+    os.makedirs(outdir)
+    result = {"stream": stream, "implementation": name, "delta": delta, "gamma": gamma, "status": "ok",
+              "wall_time": None, "peak_rss_mb": None, "cliques": None, "agrees": None, "missing": None, "extra": None}
+
+    with open(os.path.join(rundir, "stdout.log"), 'w') as log:
+      start_time = timeit.default_timer()
+      process = subprocess.Popen(self.command(name, infile, outdir, delta, gamma, weighted), cwd=rundir, stdout=log,
+                                 stderr=subprocess.STDOUT)
+      # The run is marked as timed out by the timer itself, as a killed run may stop just before the timeout has passed
+      timed_out = threading.Event()
+      def kill():
+        timed_out.set()
+        process.kill()
+      timer = threading.Timer(self._timeout, kill)
+      timer.start()
+      # Unlike resource.getrusage(RUSAGE_CHILDREN), wait4 reports the peak memory use of this run only
+      (_, status, usage) = os.wait4(process.pid, 0)
+      stop_time = timeit.default_timer()
+      timer.cancel()
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    result["wall_time"] = stop_time - start_time
+    result["peak_rss_mb"] = usage.ru_maxrss / 1024
+    outputfiles = os.listdir(outdir)
+    if process.returncode != 0 or len(outputfiles) != 1:
+      result["status"] = "timeout" if timed_out.is_set() else "failed"
+      return result, None
+    cliques = self.readCliques(os.path.join(outdir, outputfiles[0]))
+    result["cliques"] = len(cliques)
+    return result, cliques
+
+  def checkAgreement(self, runs):
+    # Compares the cliques of each run to those of the reference implementation (or the first successful run)
+    successful = [name for name in runs if runs[name][1] is not None]
+    if len(successful) == 0:
+      return
+    reference = self._reference if self._reference in successful else successful[0]
+    expected = runs[reference][1]
+    for name in successful:
+      (result, cliques) = runs[name]
+      result["missing"] = len(expected - cliques)
+      result["extra"] = len(cliques - expected)
+      result["agrees"] = result["missing"] == 0 and result["extra"] == 0
+
+  def readCliques(self, cliquefile):
+    # Reads the maximal cliques as (nodes, tb, te), where the output formats differ per implementation:
+    #   '1,2,3 tb,te | tbMin,tbMax,teMin,teMax' (Boekhout), '1,2,3 tb,te' (Viard, Banerjee) and '{1,2,3} (tb,te)' (Himmel)
+    cliques = set()
+    with open(cliquefile) as inf:
+      for line in inf:
+        match = re.match(r"\{?([^\s}]+)\}?\s+\(?(-?\d+),(-?\d+)\)?", line.strip())
+        if match is not None:
+          cliques.add((frozenset(match.group(1).split(",")), int(match.group(2)), int(match.group(3))))
+    return cliques
+
+  #############################################################################################
+  # Writing functions
+  #############################################################################################
+
+  def write(self, resultfile):
+    # Writes the results as CSV, or as JSON if resultfile ends with .json
+    if resultfile.endswith(".json"):
+      with open(resultfile, 'w') as out:
+        json.dump(self._results, out, indent=2)
+      return
+    with open(resultfile, 'w', newline='') as out:
+      writer = csv.DictWriter(out, fieldnames=self.fields)
+      writer.writeheader()
+      writer.writerows(self._results)
@@ -0,0 +1,90 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+import math
+import random
+
+
+# Seeded generator of synthetic link streams ('<timestamp> <node> <node> <optional weight>', ordered by time), such
+# that benchmarks of the enumerators can be reproduced. A stream is defined by:
+#   num_nodes:          number of nodes (identified by 0 up to num_nodes)
+#   density:            fraction of all node pairs that are links
+#   instances:          mean number of link instances per link
+#   duration:           timestamps are drawn from 0 up to duration
+#   burstiness:         probability (in [0,1)) that a link instance continues the burst of the previous instance of the
+#                       same link (at most burst_gap later) rather than occurring at a uniformly drawn time
+#   weights:            distribution of the link instance weights, one of 'none' (no weight column), 'uniform' (integers
+#                       1 up to and including max_weight), 'exponential' or 'pareto' (rounded to two decimals)
+#   planted_cliques:    number of cliques of planted_size nodes planted in the stream, of which every link occurs every
+#                       planted_gap time units for planted_duration time units from a uniformly drawn start
+class LinkStreamGenerator:
+
+  weight_distributions = ["none", "uniform", "exponential", "pareto"]
+
+  def __init__(self, seed=0):
+    self._seed = seed
+
+  def getSeed(self):
+    return self._seed
+
+  def generate(self, num_nodes, density=0.1, instances=10, duration=1000, burstiness=0.0, burst_gap=2, weights="none",
+               max_weight=5, planted_cliques=0, planted_size=5, planted_duration=50, planted_gap=2):
+    assert num_nodes >= 2, "Error (1): A link stream requires at least 2 nodes"
+    assert 0 <= density <= 1, "Error (2): The density must be between 0 and 1"
+    assert 0 <= burstiness < 1, "Error (3): The burstiness must be at least 0 and smaller than 1"
+    assert weights in self.weight_distributions, "Error (4): Unknown weight distribution '{}', expected one of {}".format(weights, self.weight_distributions)
+    assert planted_cliques == 0 or 2 <= planted_size <= num_nodes, "Error (5): Planted cliques require 2 up to num_nodes nodes"
+    rng = random.Random(self._seed)
+
+    # Links are drawn without replacement from the indices of all node pairs
+    link_stream = []
+    num_pairs = num_nodes * (num_nodes - 1) // 2
+    for index in sorted(rng.sample(range(num_pairs), round(density * num_pairs))):
+      (u, v) = self.pairFromIndex(index)
+      t = rng.randrange(duration)
+      for _ in range(max(1, round(rng.expovariate(1 / instances)))):
+        if rng.random() >= burstiness:
+          t = rng.randrange(duration)
+        else:
+          t = min(duration - 1, t + rng.randint(0, burst_gap))
+        link_stream.append((t, u, v))
+
+    for _ in range(planted_cliques):
+      X = rng.sample(range(num_nodes), planted_size)
+      start = rng.randrange(max(1, duration - planted_duration))
+      for (i, u) in enumerate(X):
+        for v in X[i+1:]:
+          for t in range(start, min(duration, start + planted_duration), planted_gap):
+            link_stream.append((t, u, v))
+
+    link_stream.sort()
+    if weights == "none":
+      return link_stream
+    return [(t, u, v, self.drawWeight(rng, weights, max_weight)) for (t, u, v) in link_stream]
+
+  def pairFromIndex(self, index):
+    # Inverse of index = u * (u - 1) / 2 + v for the node pairs v < u
+    u = (1 + math.isqrt(1 + 8 * index)) // 2
+    return (u, index - u * (u - 1) // 2)
+
+  def drawWeight(self, rng, weights, max_weight):
+    if weights == "uniform":
+      return rng.randint(1, max_weight)
+    if weights == "exponential":
+      return round(rng.expovariate(1), 2)
+    return round(rng.paretovariate(2), 2)
+
+  def write(self, link_stream, outputfile):
+    with open(outputfile, 'w') as out:
+      for link in link_stream:
+        out.write(" ".join(map(str, link)) + "\n")
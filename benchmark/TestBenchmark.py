@@ -0,0 +1,112 @@
+"""
+  The test cases included in this file test the synthetic link stream generators and the agreement check of the
+  benchmark runner (on a small link stream, for the implementations that can be run without further dependencies).
+"""
+
+import unittest
+from LinkStreamGenerator import LinkStreamGenerator
+from BenchmarkRunner import BenchmarkRunner
+import tempfile
+import random
+import csv
+import os
+
+class TestBenchmark(unittest.TestCase):
+
+  def test_generator_reproducible(self):
+    generator = LinkStreamGenerator(7)
+    link_stream = generator.generate(30, 0.2, 5, 200, 0.5, weights="exponential", planted_cliques=2)
+    self.assertEqual(link_stream, LinkStreamGenerator(7).generate(30, 0.2, 5, 200, 0.5, weights="exponential", planted_cliques=2))
+    self.assertNotEqual(link_stream, LinkStreamGenerator(8).generate(30, 0.2, 5, 200, 0.5, weights="exponential", planted_cliques=2))
+    # Link instances are ordered by time, with valid nodes and weights
+    self.assertEqual([link[0] for link in link_stream], sorted(link[0] for link in link_stream))
+    for (t, u, v, w) in link_stream:
+      self.assertTrue(0 <= t < 200 and 0 <= u < 30 and 0 <= v < 30 and u != v)
+      self.assertGreaterEqual(w, 0)
+
+  def test_generator_parameters(self):
+    # The number of links follows from the density, and pairFromIndex enumerates all node pairs
+    generator = LinkStreamGenerator(1)
+    self.assertEqual([generator.pairFromIndex(i) for i in range(45)], [(u, v) for u in range(10) for v in range(u)])
+    links = set((u, v) for (t, u, v) in generator.generate(40, 0.25, 3, 100))
+    self.assertEqual(len(links), round(0.25 * 40 * 39 / 2))
+    # Every link of a planted clique occurs every planted_gap time units
+    link_stream = generator.generate(10, 0.0, 1, 100, planted_cliques=1, planted_size=4, planted_duration=20, planted_gap=2)
+    self.assertEqual(len(set(frozenset([u, v]) for (t, u, v) in link_stream)), 6)
+    self.assertEqual(len(link_stream), 6 * 10)
+
+  def test_runner_agreement(self):
+    generator = LinkStreamGenerator(3)
+    with tempfile.TemporaryDirectory() as workdir:
+      infile = os.path.join(workdir, "stream.txt")
+      generator.write(generator.generate(12, 0.4, 6, 150, 0.3, planted_cliques=1, planted_size=4), infile)
+      runner = BenchmarkRunner(workdir, ["boekhout", "himmel"], timeout=300)
+      results = runner.runGrid({"stream": (infile, False)}, [6, 10], [1.0, 2.0])
+      # Himmel et al. only supports a gamma of 1
+      self.assertEqual([(result["implementation"], result["delta"], result["gamma"]) for result in results],
+                       [("boekhout", 6, 1.0), ("himmel", 6, 1.0), ("boekhout", 6, 2.0), ("boekhout", 10, 1.0),
+                        ("himmel", 10, 1.0), ("boekhout", 10, 2.0)])
+      for result in results:
+        self.assertEqual(result["status"], "ok")
+        self.assertGreater(result["cliques"], 0)
+        self.assertTrue(result["agrees"])
+      resultfile = os.path.join(workdir, "results.csv")
+      runner.write(resultfile)
+      with open(resultfile) as inf:
+        self.assertEqual(len(list(csv.DictReader(inf))), len(results))
+
+  def test_runner_viard(self):
+    rng = random.Random(4)
+    with tempfile.TemporaryDirectory() as workdir:
+      runner = BenchmarkRunner(workdir, ["boekhout", "viard"], timeout=300)
+      # On a star (without 3-node cliques) the delta-cliques of Viard et al. equal the (delta,1)-cliques
+      infile = os.path.join(workdir, "star.txt")
+      with open(infile, 'w') as out:
+        for (t, v) in sorted((rng.randint(0, 200), rng.randint(1, 6)) for _ in range(150)):
+          out.write("{} 0 {}\n".format(t, v))
+      for result in runner.runGrid({"star": (infile, False)}, [2, 5], [1.0]):
+        self.assertEqual(result["status"], "ok")
+        self.assertGreater(result["cliques"], 0)
+        self.assertTrue(result["agrees"])
+      # Otherwise the borders of larger cliques differ, for which the missing and extra cliques are counted
+      infile = os.path.join(workdir, "stream.txt")
+      generator = LinkStreamGenerator(0)
+      generator.write(generator.generate(8, 0.4, 6, 150, 0.3, planted_cliques=1, planted_size=4), infile)
+      runs = {name: runner.run(name, "stream", infile, 5, 1.0, False) for name in ["boekhout", "viard"]}
+      runner.checkAgreement(runs)
+      ((result, cliques), (_, expected)) = (runs["viard"], runs["boekhout"])
+      self.assertEqual((result["missing"], result["extra"]), (len(expected - cliques), len(cliques - expected)))
+      self.assertFalse(result["agrees"])
+      self.assertTrue(all(len(X) > 2 for (X, tb, te) in cliques - expected))
+
+  def test_runner_rerun(self):
+    generator = LinkStreamGenerator(5)
+    with tempfile.TemporaryDirectory() as workdir:
+      infile = os.path.join(workdir, "stream.txt")
+      generator.write(generator.generate(8, 0.4, 6, 100, 0.3), infile)
+      # A rerun into the same work directory ignores the (differently named) output of a previous run
+      runner = BenchmarkRunner(workdir, ["boekhout"], timeout=300)
+      (result, cliques) = runner.run("boekhout", "stream", infile, 5, 1.0, False)
+      outdir = os.path.join(workdir, "stream-d5-g1.0-boekhout", "output")
+      with open(os.path.join(outdir, "previous.txt.gz"), 'w') as out:
+        out.write("")
+      (rerun_result, rerun_cliques) = runner.run("boekhout", "stream", infile, 5, 1.0, False)
+      self.assertEqual((result["status"], rerun_result["status"]), ("ok", "ok"))
+      self.assertEqual(rerun_cliques, cliques)
+      # A run killed at the timeout is reported as such, however long it took to stop
+      runner = BenchmarkRunner(workdir, ["boekhout"], timeout=0.01)
+      (result, cliques) = runner.run("boekhout", "stream", infile, 5, 1.0, False)
+      self.assertEqual(result["status"], "timeout")
+      self.assertIsNone(cliques)
+
+  def test_read_cliques(self):
+    with tempfile.TemporaryDirectory() as workdir:
+      cliquefile = os.path.join(workdir, "cliques.txt")
+      with open(cliquefile, 'w') as out:
+        out.write("1,2,3 4,10 | 1,4,10,13\n2,1 5,6\n{3,1} (7,9)\n\n")
+      self.assertEqual(BenchmarkRunner(workdir).readCliques(cliquefile),
+                       set([(frozenset(["1", "2", "3"]), 4, 10), (frozenset(["1", "2"]), 5, 6), (frozenset(["1", "3"]), 7, 9)]))
+
+
+if __name__ == '__main__':
+  unittest.main()
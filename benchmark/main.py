@@ -0,0 +1,107 @@
+"""
+MIT License
+
+Copyright (c) 2024 Hanjo Boekhout
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and associated documentation files (the "Software"), to deal in the Software without restriction, including without limitation the rights to use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE
+"""
+
+
+from LinkStreamGenerator import LinkStreamGenerator
+from BenchmarkRunner import BenchmarkRunner
+
+import itertools
+import argparse
+import os
+
+main_splitter = "================================="
+
+#############################################################################################
+# Argument type functions
+#############################################################################################
+
+def intList(value):
+  return [int(x) for x in value.split(",")]
+
+def floatList(value):
+  return [float(x) for x in value.split(",")]
+
+def strList(value):
+  return value.split(",")
+
+#############################################################################################
+# Input parser class functions
+#############################################################################################
+
+class InputParser(object):
+  def __init__(self):
+    self.parser = argparse.ArgumentParser(description="Benchmark the (delta,gamma)-maximal clique enumerators on synthetic link streams")
+    self.setArguments()
+
+  def setArguments(self):
+    self.parser.add_argument('-out', "--outdir", required=True, help="Location of directory in which the generated link streams, the output of every run and the results are stored")
+    self.parser.add_argument('-r', "--results", default=None, help="Location of the results file, written as JSON if it ends with .json and as CSV otherwise (default: results.csv in the output directory)")
+    self.parser.add_argument('-i', "--implementations", default=list(BenchmarkRunner.implementations), help="Comma separated list of the implementations to run, out of 'boekhout', 'viard', 'himmel' and 'banerjee'", type=strList)
+    self.parser.add_argument('-d', "--delta", default=[10], help="Comma separated list of deltas (as defined by Boekhout & Takes)", type=intList)
+    self.parser.add_argument('-g', "--gamma", default=[1.0], help="Comma separated list of gammas", type=floatList)
+    self.parser.add_argument('-n', "--nodes", default=[50], help="Comma separated list of the number of nodes of the generated link streams", type=intList)
+    self.parser.add_argument('-p', "--density", default=[0.1], help="Comma separated list of the fraction of node pairs that are links", type=floatList)
+    self.parser.add_argument('-k', "--instances", default=[10], help="Comma separated list of the mean number of instances per link", type=floatList)
+    self.parser.add_argument('-T', "--duration", default=1000, help="Timestamps are drawn from 0 up to this duration", type=int)
+    self.parser.add_argument('-b', "--burstiness", default=[0.0], help="Comma separated list of the probability that a link instance continues the burst of the previous instance of the same link", type=floatList)
+    self.parser.add_argument('-w', "--weights", default=["none"], help="Comma separated list of weight distributions, out of 'none', 'uniform', 'exponential' and 'pareto'", type=strList)
+    self.parser.add_argument('-c', "--planted", default=[0], help="Comma separated list of the number of cliques planted in the link streams", type=intList)
+    self.parser.add_argument('-cs', "--planted_size", default=5, help="Number of nodes of each planted clique", type=int)
+    self.parser.add_argument('-s', "--seeds", default=[0], help="Comma separated list of the seeds of the generated link streams", type=intList)
+    self.parser.add_argument('-t', "--timeout", default=3600, help="Runs taking longer than this many seconds are killed", type=int)
+
+  def getInputArgumentsAsDict(self):
+    return vars(self.parser.parse_args())
+
+  def printInput(self):
+    args = self.getInputArgumentsAsDict()
+    print(main_splitter)
+    for label in args.keys():
+      print("{}: {}".format(self.parser._option_string_actions["--" +label].help, args[label]))
+    print(main_splitter + "\n")
+
+
+#############################################################################################
+# Main function(s)
+#############################################################################################
+
+if __name__ == "__main__":
+  input_parser = InputParser()
+  args = input_parser.getInputArgumentsAsDict()
+  input_parser.printInput()
+  os.makedirs(args["outdir"], exist_ok=True)
+  resultfile = args["results"] if args["results"] is not None else os.path.join(args["outdir"], "results.csv")
+
+  # Generate the link streams of the parameter grid
+  streams = {}
+  for (nodes, density, instances, burstiness, weights, planted, seed) in itertools.product(args["nodes"], args["density"], args["instances"],
+                                                                                           args["burstiness"], args["weights"], args["planted"], args["seeds"]):
+    stream = "n{}-p{}-k{}-b{}-w{}-c{}-s{}".format(nodes, density, instances, burstiness, weights, planted, seed)
+    infile = os.path.join(args["outdir"], stream + ".txt")
+    generator = LinkStreamGenerator(seed)
+    generator.write(generator.generate(nodes, density, instances, args["duration"], burstiness, weights=weights, planted_cliques=planted,
+                                       planted_size=args["planted_size"]), infile)
+    streams[stream] = (infile, weights != "none")
+
+  runner = BenchmarkRunner(args["outdir"], args["implementations"], args["timeout"])
+  results = runner.runGrid(streams, args["delta"], args["gamma"])
+  runner.write(resultfile)
+
+  print("{:>40} {:>10} {:>6} {:>6} {:>8} {:>10} {:>10} {:>8} {:>7}".format("stream", "impl.", "delta", "gamma", "status", "time (s)", "RSS (MB)", "cliques", "agrees"))
+  for result in results:
+    print("{:>40} {:>10} {:>6} {:>6} {:>8} {:>10} {:>10} {:>8} {:>7}".format(result["stream"], result["implementation"], result["delta"], result["gamma"], result["status"],
+                                                                             "{:.2f}".format(result["wall_time"]), "{:.0f}".format(result["peak_rss_mb"]),
+                                                                             str(result["cliques"]), str(result["agrees"])))
+  print(main_splitter)
+  disagreements = [result for result in results if result["agrees"] is False]
+  print("Runs disagreeing with the reference: {}".format(len(disagreements)))
+  print("Results written to: {}".format(resultfile))